@@ -1,62 +1,100 @@
 from datetime import timedelta
 
 from django.contrib import admin
-from django.db.models import Count
-from django.db.models.functions import TruncDate
+from django.db.models import Sum
 from django.utils import timezone
 
-from .models import EventLog, PageView
+from config.admin_scaling import ScalableAdminMixin, cached_admin_value, month_list_filter
+
+from .models import EventLog, PageView, PageViewDailyRollup
+from .rollups import daily_totals, unique_visitors
+
+PATH_FILTER_LIMIT = 50
+
+
+class PathListFilter(admin.SimpleListFilter):
+    """Path choices taken from the daily rollups instead of DISTINCT over raw page views."""
+
+    title = "path"
+    parameter_name = "path__exact"
+
+    def lookups(self, request, model_admin):
+        def busiest_paths():
+            rows = (
+                PageViewDailyRollup.objects.values("path")
+                .annotate(total=Sum("pv"))
+                .order_by("-total", "path")[:PATH_FILTER_LIMIT]
+            )
+            return [row["path"] for row in rows]
+
+        paths = cached_admin_value("analytics.pageview:paths", busiest_paths)
+        return [(path, path) for path in paths]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(path=self.value())
+        return queryset
+
+
+class StatusClassFilter(admin.SimpleListFilter):
+    title = "status code"
+    parameter_name = "status_class"
+
+    def lookups(self, request, model_admin):
+        return [(str(hundred), f"{hundred}xx") for hundred in (2, 3, 4, 5)]
+
+    def queryset(self, request, queryset):
+        if self.value() in {"2", "3", "4", "5"}:
+            low = int(self.value()) * 100
+            return queryset.filter(status_code__gte=low, status_code__lt=low + 100)
+        return queryset
 
 
 @admin.register(EventLog)
-class EventLogAdmin(admin.ModelAdmin):
+class EventLogAdmin(ScalableAdminMixin, admin.ModelAdmin):
     list_display = ("event_type", "occurred_at", "session_id", "referrer")
-    list_filter = ("event_type", "occurred_at")
+    list_filter = ("event_type", "occurred_at", month_list_filter("occurred_at"))
     search_fields = ("session_id", "referrer", "user_agent")
-    date_hierarchy = "occurred_at"
+    ordering = ("-occurred_at",)
+    keyset_field = "occurred_at"
 
 
 @admin.register(PageView)
-class PageViewAdmin(admin.ModelAdmin):
+class PageViewAdmin(ScalableAdminMixin, admin.ModelAdmin):
     list_display = ("created_at", "path", "status_code", "session_id", "ip_hash")
-    list_filter = ("path", "status_code", "created_at")
+    list_filter = (PathListFilter, StatusClassFilter, "created_at", month_list_filter("created_at"))
     search_fields = ("referrer", "user_agent", "ip_hash", "session_id")
-    date_hierarchy = "created_at"
     ordering = ("-created_at",)
+    keyset_field = "created_at"
     change_list_template = "admin/analytics/pageview/change_list.html"
 
     def changelist_view(self, request, extra_context=None):
         response = super().changelist_view(request, extra_context=extra_context)
-        try:
-            cl = response.context_data["cl"]
-            queryset = cl.queryset
-        except (KeyError, AttributeError):
+        if not hasattr(response, "context_data") or "cl" not in (response.context_data or {}):
             return response
 
-        chart_context = self._chart_data(queryset)
+        path = request.GET.get("path__exact") or request.GET.get("path")
+        chart_context = self._chart_data([path] if path else None)
         response.context_data.update(chart_context)
         return response
 
-    def _chart_data(self, qs):
-        now = timezone.now()
-        start = now - timedelta(days=29)
-        daily = (
-            qs.filter(created_at__gte=start)
-            .annotate(day=TruncDate("created_at"))
-            .values("day")
-            .order_by("day")
-            .annotate(pv=Count("id"), uu=Count("ip_hash", distinct=True))
-        )
-        labels = [row["day"].strftime("%m/%d") if row["day"] else "" for row in daily]
+    def _chart_data(self, paths):
+        """Build the 30-day chart and today's summary from the daily rollups."""
+
+        today = timezone.localdate()
+        start = today - timedelta(days=29)
+        daily = daily_totals(start, today, paths)
+        labels = [row["day"].strftime("%m/%d") for row in daily]
         pv = [row["pv"] for row in daily]
         uu = [row["uu"] for row in daily]
 
-        last_24h = qs.filter(created_at__gte=now - timedelta(hours=24))
+        today_row = daily[-1] if daily and daily[-1]["day"] == today else {"pv": 0, "uu": 0}
         return {
             "chart_payload": {"labels": labels, "pv": pv, "uu": uu},
             "chart_labels": labels,
             "chart_pv": pv,
             "chart_uu": uu,
-            "summary_pv_24h": last_24h.count(),
-            "summary_uu_24h": last_24h.values_list("ip_hash", flat=True).distinct().count(),
+            "summary_pv_today": today_row["pv"],
+            "summary_uu_today": today_row["uu"],
+            "summary_uu_30d": unique_visitors(start, today, paths),
         }
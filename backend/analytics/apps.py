@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class AnalyticsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "analytics"
+
+    def ready(self) -> None:
+        from django.core.signals import request_finished
+
+        from .rollups import flush_pending_rollups
+
+        # Runs once the response has been sent, off the request's latency.
+        request_finished.connect(flush_pending_rollups, dispatch_uid="analytics.flush_pending_rollups")
@@ -0,0 +1,217 @@
+"""Per-worker write-behind buffer for analytics inserts.
+
+Page views and events are appended to a bounded in-memory queue and written
+with ``bulk_create`` by a background thread once ``ANALYTICS_BUFFER_FLUSH_SIZE``
+rows are waiting or ``ANALYTICS_BUFFER_FLUSH_INTERVAL_SECONDS`` have passed,
+which keeps the INSERT off the request path. Pending rows are flushed when the
+worker exits. When the queue is full the ``ANALYTICS_BUFFER_OVERFLOW`` policy
+either drops the row (and counts it) or blocks the request for up to
+``ANALYTICS_BUFFER_BLOCK_TIMEOUT_SECONDS``.
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from collections import defaultdict
+from typing import Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, models, transaction
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_DROP = "drop"
+OVERFLOW_BLOCK = "block"
+
+
+class WriteBehindBuffer:
+    def __init__(
+        self,
+        *,
+        max_size: int = 10000,
+        flush_size: int = 200,
+        flush_interval: float = 2.0,
+        overflow: str = OVERFLOW_DROP,
+        block_timeout: float = 0.5,
+    ):
+        if overflow not in {OVERFLOW_DROP, OVERFLOW_BLOCK}:
+            raise ValueError(f"Unknown overflow policy '{overflow}'.")
+        self.flush_size = max(1, flush_size)
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self._queue: queue.Queue = queue.Queue(maxsize=max_size)
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._counters = {
+            "enqueued": 0,
+            "flushed": 0,
+            "dropped": 0,
+            "failed": 0,
+            "flushes": 0,
+        }
+        self._last_flush_seconds = 0.0
+        self._max_flush_seconds = 0.0
+
+    def add(self, instance: models.Model) -> bool:
+        """Queue ``instance`` for insertion; return False when it was dropped."""
+
+        try:
+            if self.overflow == OVERFLOW_BLOCK:
+                self._queue.put(instance, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(instance)
+        except queue.Full:
+            self._counters["dropped"] += 1
+            return False
+
+        self._counters["enqueued"] += 1
+        if self._queue.qsize() >= self.flush_size:
+            self._wakeup.set()
+        return True
+
+    def flush(self) -> int:
+        """Write every queued row now and return how many were inserted."""
+
+        with self._flush_lock:
+            pending: list[models.Model] = []
+            while True:
+                try:
+                    pending.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not pending:
+                return 0
+
+            started = time.perf_counter()
+            grouped: dict[type, list[models.Model]] = defaultdict(list)
+            for instance in pending:
+                grouped[type(instance)].append(instance)
+
+            written = 0
+            for model, rows in grouped.items():
+                try:
+                    persist_rows(model, rows)
+                except Exception:
+                    self._counters["failed"] += len(rows)
+                    logger.exception("Failed to flush %d buffered %s rows", len(rows), model.__name__)
+                else:
+                    written += len(rows)
+
+            elapsed = time.perf_counter() - started
+            self._counters["flushed"] += written
+            self._counters["flushes"] += 1
+            self._last_flush_seconds = elapsed
+            self._max_flush_seconds = max(self._max_flush_seconds, elapsed)
+            return written
+
+    def ensure_started(self) -> None:
+        """Start the flusher thread in this process (again after a fork)."""
+
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="analytics-write-behind", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the flusher thread and write whatever is still queued."""
+
+        self._stopping.set()
+        self._wakeup.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=max(self.flush_interval, 1.0) * 2)
+        self.flush()
+
+    def metrics(self) -> dict:
+        return {
+            **self._counters,
+            "queue_depth": self._queue.qsize(),
+            "last_flush_seconds": self._last_flush_seconds,
+            "max_flush_seconds": self._max_flush_seconds,
+        }
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            close_old_connections()
+            try:
+                self.flush()
+            finally:
+                close_old_connections()
+
+
+def persist_rows(model: type, rows: list[models.Model]) -> None:
+    """Insert a batch of analytics rows in one statement, keeping page view rollups current."""
+
+    from analytics.models import PageView
+    from analytics.rollups import apply_page_views
+
+    if model is not PageView:
+        model.objects.bulk_create(rows)
+        return
+    with transaction.atomic():
+        apply_page_views(rows)
+        model.objects.bulk_create(rows)
+
+
+_buffer: Optional[WriteBehindBuffer] = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer() -> WriteBehindBuffer:
+    """Return this worker's buffer, creating it from settings on first use."""
+
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = WriteBehindBuffer(
+                    max_size=getattr(settings, "ANALYTICS_BUFFER_MAX_SIZE", 10000),
+                    flush_size=getattr(settings, "ANALYTICS_BUFFER_FLUSH_SIZE", 200),
+                    flush_interval=getattr(settings, "ANALYTICS_BUFFER_FLUSH_INTERVAL_SECONDS", 2.0),
+                    overflow=getattr(settings, "ANALYTICS_BUFFER_OVERFLOW", OVERFLOW_DROP),
+                    block_timeout=getattr(settings, "ANALYTICS_BUFFER_BLOCK_TIMEOUT_SECONDS", 0.5),
+                )
+                atexit.register(_buffer.stop)
+    return _buffer
+
+
+def record(instance: models.Model) -> None:
+    """Persist an analytics row, through the write-behind buffer when enabled."""
+
+    if not getattr(settings, "ANALYTICS_WRITE_BEHIND_ENABLED", False):
+        from analytics.models import PageView
+        from analytics.rollups import pending_rollups
+
+        type(instance).objects.bulk_create([instance])
+        if isinstance(instance, PageView):
+            # Rollups are written in batches after the response (see analytics.rollups).
+            transaction.on_commit(lambda: pending_rollups.add([instance]))
+        return
+
+    buffer = get_buffer()
+    buffer.ensure_started()
+    buffer.add(instance)
+
+
+async def arecord(instance: models.Model) -> None:
+    """``record`` for async code: only a dropping buffer put runs on the event loop."""
+
+    if getattr(settings, "ANALYTICS_WRITE_BEHIND_ENABLED", False) and get_buffer().overflow == OVERFLOW_DROP:
+        record(instance)
+        return
+    await sync_to_async(record)(instance)
@@ -0,0 +1,106 @@
+"""HyperLogLog sketches for mergeable unique-visitor counts.
+
+A sketch keeps ``2 ** PRECISION`` one-byte registers. With ``PRECISION = 12``
+(4096 registers) the relative standard error of an estimate is
+``1.04 / sqrt(4096)``, about 1.6%, so roughly 95% of estimates fall within
+±3.3% of the true count; small cardinalities (a few thousand visitors or
+fewer) are counted almost exactly through linear counting. Sketches merge by
+taking the register-wise maximum, so UU for any set of days and paths is the
+estimate of the merged sketch, something exact per-day counts cannot provide.
+
+Serialized sketches use a sparse ``(index, value)`` encoding while few
+registers are set and the dense register array otherwise, so quiet days cost
+a few bytes instead of 4 KiB.
+"""
+import hashlib
+import math
+import struct
+from typing import Iterable, Optional
+
+PRECISION = 12
+REGISTERS = 1 << PRECISION
+_HASH_BITS = 64
+_MASK = (1 << _HASH_BITS) - 1
+_MAX_RANK = _HASH_BITS - PRECISION + 1
+
+_MAGIC = b"H"
+_SPARSE = 0
+_DENSE = 1
+_SPARSE_ENTRY = struct.Struct(">HB")
+
+
+def _hash64(value: str) -> int:
+    # ip_hash values are already salted SHA-256 hex digests; reuse their bits.
+    if len(value) >= 16:
+        try:
+            return int(value[:16], 16)
+        except ValueError:
+            pass
+    return int.from_bytes(hashlib.sha256(value.encode("utf-8")).digest()[:8], "big")
+
+
+class HyperLogLog:
+    __slots__ = ("registers",)
+
+    def __init__(self, registers: Optional[bytearray] = None):
+        self.registers = registers if registers is not None else bytearray(REGISTERS)
+
+    def add(self, value: str) -> None:
+        hashed = _hash64(value)
+        index = hashed >> (_HASH_BITS - PRECISION)
+        remainder = (hashed << PRECISION) & _MASK
+        rank = min(_HASH_BITS - remainder.bit_length() + 1, _MAX_RANK)
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values: Iterable[str]) -> None:
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def estimate(self) -> int:
+        inverse_sum = 0.0
+        zeros = 0
+        for register in self.registers:
+            inverse_sum += 2.0 ** -register
+            if not register:
+                zeros += 1
+        alpha = 0.7213 / (1 + 1.079 / REGISTERS)
+        raw = alpha * REGISTERS * REGISTERS / inverse_sum
+        if raw <= 2.5 * REGISTERS and zeros:
+            return round(REGISTERS * math.log(REGISTERS / zeros))
+        return round(raw)
+
+    def to_bytes(self) -> bytes:
+        used = [(index, value) for index, value in enumerate(self.registers) if value]
+        if len(used) * _SPARSE_ENTRY.size < REGISTERS:
+            body = b"".join(_SPARSE_ENTRY.pack(index, value) for index, value in used)
+            return _MAGIC + bytes([PRECISION, _SPARSE]) + body
+        return _MAGIC + bytes([PRECISION, _DENSE]) + bytes(self.registers)
+
+    @classmethod
+    def from_bytes(cls, data: Optional[bytes]) -> "HyperLogLog":
+        if not data:
+            return cls()
+        data = bytes(data)
+        if data[:1] != _MAGIC or data[1] != PRECISION:
+            raise ValueError("Unsupported HyperLogLog sketch encoding.")
+        body = data[3:]
+        if data[2] == _DENSE:
+            return cls(bytearray(body))
+        registers = bytearray(REGISTERS)
+        for index, value in _SPARSE_ENTRY.iter_unpack(body):
+            registers[index] = value
+        return cls(registers)
+
+
+def merged(sketches: Iterable[Optional[bytes]]) -> HyperLogLog:
+    """Return the union of serialized sketches."""
+
+    result = HyperLogLog()
+    for data in sketches:
+        if data:
+            result.merge(HyperLogLog.from_bytes(data))
+    return result
@@ -0,0 +1,108 @@
+"""Management command to prepare upcoming partitions and enforce analytics retention."""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from analytics.partitions import (
+    PARTITIONED_MODELS,
+    count_default_before,
+    create_partition,
+    default_partition_name,
+    delete_before,
+    delete_default_before,
+    drop_partition,
+    existing_partitions,
+    expired_partitions,
+    is_partitioned,
+    upcoming_ranges,
+)
+from analytics.rollups import day_bounds
+
+
+class Command(BaseCommand):
+    help = (
+        "Create upcoming PageView/EventLog partitions and drop those past ANALYTICS_RETENTION_DAYS. "
+        "Without partitioning (e.g. SQLite) expired rows are deleted in chunks instead."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            help="Override ANALYTICS_RETENTION_DAYS (0 keeps everything).",
+        )
+        parser.add_argument(
+            "--premake",
+            type=int,
+            help="Number of future partitions to keep ready (defaults to ANALYTICS_PARTITION_PREMAKE).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            help="Rows per DELETE on the fallback path (defaults to ANALYTICS_RETENTION_CHUNK_SIZE).",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing.")
+
+    def handle(self, *args, **options):
+        retention_days = options["retention_days"]
+        if retention_days is None:
+            retention_days = getattr(settings, "ANALYTICS_RETENTION_DAYS", 0)
+        retention_days = max(0, int(retention_days))
+        premake = options["premake"]
+        if premake is None:
+            premake = getattr(settings, "ANALYTICS_PARTITION_PREMAKE", 3)
+        premake = max(0, int(premake))
+        chunk_size = max(1, int(options["chunk_size"] or getattr(settings, "ANALYTICS_RETENTION_CHUNK_SIZE", 5000)))
+        months = max(1, int(getattr(settings, "ANALYTICS_PARTITION_MONTHS", 1)))
+        dry_run = options["dry_run"]
+
+        today = timezone.localdate()
+        # Retention is applied on local day boundaries so partitions line up with it.
+        cutoff_day = today - timedelta(days=retention_days)
+        cutoff, _ = day_bounds(cutoff_day)
+
+        for model, column in PARTITIONED_MODELS:
+            table = model._meta.db_table
+            if is_partitioned(table):
+                created = 0
+                for partition in upcoming_ranges(today, premake, months):
+                    if not dry_run and create_partition(table, partition, column):
+                        created += 1
+                dropped = []
+                if retention_days:
+                    dropped = expired_partitions(table, cutoff_day, months)
+                    if not dry_run:
+                        for name in dropped:
+                            drop_partition(table, name)
+                            self.stdout.write(f"{table}: dropped partition {name}")
+                self.stdout.write(
+                    f"{table}: partitions created={created}, dropped={len(dropped)}"
+                    + (" (dry run)" if dry_run else "")
+                )
+                if not retention_days:
+                    continue
+                # Only rows that fell into the DEFAULT partition are removed row by row.
+                default = default_partition_name(table)
+                if default not in existing_partitions(table):
+                    continue
+                if dry_run:
+                    expired = count_default_before(table, column, cutoff)
+                    self.stdout.write(f"{default}: would delete {expired} row(s) older than {cutoff_day.isoformat()}")
+                    continue
+                deleted = delete_default_before(table, column, cutoff, chunk_size=chunk_size)
+                self.stdout.write(f"{default}: deleted {deleted} row(s) older than {cutoff_day.isoformat()}")
+                continue
+
+            if not retention_days:
+                self.stdout.write(f"{table}: retention disabled")
+                continue
+            if dry_run:
+                expired = model.objects.filter(**{f"{column}__lt": cutoff}).count()
+                self.stdout.write(f"{table}: would delete {expired} row(s) older than {cutoff_day.isoformat()}")
+                continue
+            deleted = delete_before(model, column, cutoff, chunk_size=chunk_size)
+            self.stdout.write(f"{table}: deleted {deleted} row(s) older than {cutoff_day.isoformat()}")
+
+        self.stdout.write(self.style.SUCCESS("Analytics partition maintenance finished."))
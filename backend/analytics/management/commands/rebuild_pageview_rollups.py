@@ -0,0 +1,32 @@
+"""Management command to backfill or repair the daily page view rollups."""
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from analytics.rollups import rebuild_day
+
+
+class Command(BaseCommand):
+    help = "Recompute daily PV/UU rollups from raw PageView rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=30, help="Number of most recent local days to rebuild.")
+        parser.add_argument("--since", type=date.fromisoformat, help="First day to rebuild (YYYY-MM-DD).")
+        parser.add_argument("--until", type=date.fromisoformat, help="Last day to rebuild (defaults to today).")
+
+    def handle(self, *args, **options):
+        until = options["until"] or timezone.localdate()
+        since = options["since"] or until - timedelta(days=max(1, options["days"]) - 1)
+        if since > until:
+            raise CommandError("--since must not be after --until.")
+
+        day = since
+        rebuilt = 0
+        while day <= until:
+            paths = rebuild_day(day)
+            rebuilt += 1
+            self.stdout.write(f"{day.isoformat()}: {paths} path(s)")
+            day += timedelta(days=1)
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt page view rollups for {rebuilt} day(s)."))
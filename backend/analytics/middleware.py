@@ -5,19 +5,27 @@ from typing import Optional
 
 from django.conf import settings
 
+from config.middleware import HybridMiddleware
+
 logger = logging.getLogger(__name__)
 
 
-class EnsureSessionIdMiddleware:
+class EnsureSessionIdMiddleware(HybridMiddleware):
     COOKIE_NAME = "anon_sid"
 
-    def __init__(self, get_response):
-        self.get_response = get_response
+    def handle(self, request):
+        self._assign_sid(request)
+        return self._persist_sid(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        self._assign_sid(request)
+        return self._persist_sid(request, await self.get_response(request))
 
-    def __call__(self, request):
-        if not request.COOKIES.get(self.COOKIE_NAME):
+    def _assign_sid(self, request):
+        if not session_id(request):
             request._set_new_sid = str(uuid.uuid4())
-        response = self.get_response(request)
+
+    def _persist_sid(self, request, response):
         if getattr(request, "_set_new_sid", None):
             # Persist for ~10 days with SameSite=Lax to keep analytics scoped to this site
             response.set_cookie(
@@ -31,53 +39,87 @@ class EnsureSessionIdMiddleware:
         return response
 
 
-class LogLandingPageViewMiddleware:
+class LogLandingPageViewMiddleware(HybridMiddleware):
     """Record landing page pageviews on the server side."""
 
     def __init__(self, get_response):
-        self.get_response = get_response
+        super().__init__(get_response)
         self.landing_paths = tuple(getattr(settings, "ANALYTICS_LP_PATHS", ("/",)))
         self.ip_salt = getattr(settings, "ANALYTICS_IP_HASH_SALT", settings.SECRET_KEY)
 
-    def __call__(self, request):
+    def handle(self, request):
+        from analytics.buffer import record
+
         response = self.get_response(request)
         try:
-            self._maybe_log(request, response)
+            page_view = self._page_view(request, response)
+            if page_view is not None:
+                record(page_view)
         except Exception:
             logger.exception("Failed to log page view")
         return response
 
-    def _maybe_log(self, request, response):
+    async def __acall__(self, request):
+        from analytics.buffer import arecord
+
+        response = await self.get_response(request)
+        try:
+            page_view = self._page_view(request, response)
+            if page_view is not None:
+                await arecord(page_view)
+        except Exception:
+            logger.exception("Failed to log page view")
+        return response
+
+    def _page_view(self, request, response):
         if request.method not in {"GET", "HEAD"}:
-            return
+            return None
 
         path = request.path
         if path not in self.landing_paths:
-            return
+            return None
 
         from analytics.models import PageView
 
-        PageView.objects.create(
+        return PageView(
             path=path,
             method=request.method,
             status_code=getattr(response, "status_code", 0) or 0,
             referrer=request.META.get("HTTP_REFERER", ""),
             user_agent=request.META.get("HTTP_USER_AGENT", ""),
-            ip_hash=self._hash_ip(self._client_ip(request)),
-            session_id=request.COOKIES.get(EnsureSessionIdMiddleware.COOKIE_NAME)
-            or getattr(request, "_set_new_sid", None),
+            ip_hash=hash_ip(client_ip(request), self.ip_salt),
+            session_id=session_id(request) or getattr(request, "_set_new_sid", None),
         )
 
-    def _client_ip(self, request):
-        forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
-        if forwarded_for:
-            parts = [part.strip() for part in forwarded_for.split(",") if part.strip()]
-            if parts:
-                return parts[0]
-        return request.META.get("REMOTE_ADDR", "")
-
-    def _hash_ip(self, ip: Optional[str]):
-        if not ip:
-            return ""
-        salt = self.ip_salt or ""
-        return hashlib.sha256(f"{salt}:{ip}".encode("utf-8")).hexdigest()
+
+def session_id(request) -> Optional[str]:
+    """The ``anon_sid`` cookie if it has the form this middleware issues, else ``None``."""
+    value = request.COOKIES.get(EnsureSessionIdMiddleware.COOKIE_NAME)
+    if not value or len(value) != 36:
+        return None
+    try:
+        parsed = uuid.UUID(value)
+    except ValueError:
+        return None
+    if parsed.version != 4 or str(parsed) != value:
+        return None
+    return value
+
+
+def forwarded_ips(request) -> list:
+    forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR") or ""
+    return [part.strip() for part in forwarded_for.split(",") if part.strip()]
+
+
+def client_ip(request) -> str:
+    """The originating client address as reported by ``X-Forwarded-For``."""
+    forwarded = forwarded_ips(request)
+    return forwarded[0] if forwarded else request.META.get("REMOTE_ADDR", "")
+
+
+def hash_ip(ip: Optional[str], salt: Optional[str] = None) -> str:
+    if not ip:
+        return ""
+    if salt is None:
+        salt = getattr(settings, "ANALYTICS_IP_HASH_SALT", settings.SECRET_KEY)
+    return hashlib.sha256(f"{salt or ''}:{ip}".encode("utf-8")).hexdigest()
@@ -0,0 +1,32 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0003_pageview"),
+    ]
+
+    operations = [
+        migrations.RenameIndex(
+            model_name="pageview",
+            new_name="analytics_p_created_4c2b45_idx",
+            old_name="analytics_page_creat_9329d9_idx",
+        ),
+        migrations.RenameIndex(
+            model_name="pageview",
+            new_name="analytics_p_path_53ae0e_idx",
+            old_name="analytics_page_path_c2b988_idx",
+        ),
+        migrations.AlterField(
+            model_name="eventlog",
+            name="occurred_at",
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+        migrations.AlterField(
+            model_name="pageview",
+            name="created_at",
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
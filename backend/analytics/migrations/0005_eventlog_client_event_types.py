@@ -0,0 +1,25 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0004_timestamps_default_now"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="eventlog",
+            name="event_type",
+            field=models.CharField(
+                choices=[
+                    ("cta_click", "CTA Click (to note)"),
+                    ("purchase_note", "Purchase (Note) - inferred"),
+                    ("survey_start", "Survey start"),
+                    ("item_progress", "Survey item progress"),
+                    ("result_view", "Result view"),
+                ],
+                max_length=32,
+            ),
+        ),
+    ]
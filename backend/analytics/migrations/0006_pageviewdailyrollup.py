@@ -0,0 +1,29 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0005_eventlog_client_event_types"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PageViewDailyRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("day", models.DateField()),
+                ("path", models.CharField(max_length=255)),
+                ("pv", models.PositiveIntegerField(default=0)),
+                ("uu", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "ordering": ["-day", "path"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="pageviewdailyrollup",
+            constraint=models.UniqueConstraint(fields=("day", "path"), name="analytics_rollup_day_path_uniq"),
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0006_pageviewdailyrollup"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pageviewdailyrollup",
+            name="uu_sketch",
+            field=models.BinaryField(default=b""),
+        ),
+    ]
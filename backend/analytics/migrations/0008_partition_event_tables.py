@@ -0,0 +1,100 @@
+"""Convert the page view and event log tables to range-partitioned tables.
+
+PostgreSQL only; other backends keep plain tables and rely on the chunked
+delete fallback in ``manage_analytics_partitions``. The primary key becomes
+``(id, <timestamp>)`` because a partitioned table's unique constraints must
+include the partition key; Django keeps treating ``id`` as the primary key.
+"""
+from datetime import date, datetime, time
+
+from django.conf import settings
+from django.db import migrations
+from django.utils import timezone
+
+TABLES = (
+    (
+        "analytics_pageview",
+        "created_at",
+        (
+            ("analytics_p_created_4c2b45_idx", "created_at"),
+            ("analytics_p_path_53ae0e_idx", "path, created_at"),
+        ),
+    ),
+    (
+        "analytics_eventlog",
+        "occurred_at",
+        (("analytics_e_event_t_b30595_idx", "event_type, occurred_at"),),
+    ),
+)
+
+
+def _month_start(day, months):
+    return date(day.year, (day.month - 1) // months * months + 1, 1)
+
+
+def _add_months(day, months):
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _aware(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def partition_tables(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+
+    months = max(1, getattr(settings, "ANALYTICS_PARTITION_MONTHS", 1))
+    ahead = max(0, getattr(settings, "ANALYTICS_PARTITION_PREMAKE", 3))
+    quote = connection.ops.quote_name
+    today = timezone.localdate()
+
+    with connection.cursor() as cursor:
+        for table, column, indexes in TABLES:
+            legacy = f"{table}_unpartitioned"
+            sequence = f"{table}_partitioned_id_seq"
+            cursor.execute(f"ALTER TABLE {quote(table)} RENAME TO {quote(legacy)}")
+            cursor.execute(
+                f"CREATE TABLE {quote(table)} (LIKE {quote(legacy)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+                f"PARTITION BY RANGE ({quote(column)})"
+            )
+            cursor.execute(f"CREATE SEQUENCE {quote(sequence)} OWNED BY {quote(table)}.{quote('id')}")
+            cursor.execute(
+                f"SELECT setval(%s, COALESCE((SELECT MAX(id) FROM {quote(legacy)}), 0) + 1, false)",
+                [sequence],
+            )
+            cursor.execute(f"ALTER TABLE {quote(table)} ALTER COLUMN id SET DEFAULT nextval(%s::regclass)", [sequence])
+            cursor.execute(f"ALTER TABLE {quote(table)} ADD PRIMARY KEY (id, {quote(column)})")
+
+            cursor.execute(f"SELECT MIN({quote(column)}) FROM {quote(legacy)}")
+            oldest = cursor.fetchone()[0]
+            first = _month_start(timezone.localdate(oldest) if oldest else today, months)
+            last = _add_months(_month_start(today, months), months * ahead)
+            start = first
+            while start <= last:
+                end = _add_months(start, months)
+                cursor.execute(
+                    f"CREATE TABLE {quote(f'{table}_p{start:%Y%m}')} PARTITION OF {quote(table)} "
+                    "FOR VALUES FROM (%s) TO (%s)",
+                    [_aware(start), _aware(end)],
+                )
+                start = end
+            cursor.execute(f"CREATE TABLE {quote(f'{table}_default')} PARTITION OF {quote(table)} DEFAULT")
+
+            cursor.execute(f"INSERT INTO {quote(table)} SELECT * FROM {quote(legacy)}")
+            cursor.execute(f"DROP TABLE {quote(legacy)}")
+            for name, columns in indexes:
+                cursor.execute(f"CREATE INDEX {quote(name)} ON {quote(table)} ({columns})")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0007_pageviewdailyrollup_uu_sketch"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_tables, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,14 @@
 from django.db import models
+from django.utils import timezone
 
 
 class EventLog(models.Model):
     EVENT_TYPES = [
         ("cta_click", "CTA Click (to note)"),
         ("purchase_note", "Purchase (Note) - inferred"),
+        ("survey_start", "Survey start"),
+        ("item_progress", "Survey item progress"),
+        ("result_view", "Result view"),
     ]
 
     event_type = models.CharField(max_length=32, choices=EVENT_TYPES)
@@ -13,7 +17,8 @@ class EventLog(models.Model):
     referrer = models.CharField(max_length=255, blank=True, null=True)
     user_agent = models.TextField(blank=True, null=True)
     extra_payload = models.JSONField(blank=True, null=True)
-    occurred_at = models.DateTimeField(auto_now_add=True)
+    # Set when the event is recorded, not when a buffered flush inserts it.
+    occurred_at = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
         indexes = [models.Index(fields=["event_type", "occurred_at"])]
@@ -32,7 +37,7 @@ class PageView(models.Model):
     user_agent = models.TextField(blank=True, null=True)
     ip_hash = models.CharField(max_length=64, blank=True, null=True)
     session_id = models.CharField(max_length=64, blank=True, null=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
         indexes = [
@@ -43,3 +48,27 @@ class PageView(models.Model):
 
     def __str__(self) -> str:
         return f"{self.path} @ {self.created_at:%Y-%m-%d %H:%M:%S}"
+
+
+class PageViewDailyRollup(models.Model):
+    """Daily PV/UU totals per path, kept current as page views are written.
+
+    ``uu_sketch`` is a serialized HyperLogLog sketch of the visitors' ip_hash
+    values and ``uu`` caches its estimate (see ``analytics.hll``).
+    """
+
+    day = models.DateField()
+    path = models.CharField(max_length=255)
+    pv = models.PositiveIntegerField(default=0)
+    uu = models.PositiveIntegerField(default=0)
+    uu_sketch = models.BinaryField(default=b"")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["day", "path"], name="analytics_rollup_day_path_uniq"),
+        ]
+        ordering = ["-day", "path"]
+
+    def __str__(self) -> str:
+        return f"{self.path} @ {self.day:%Y-%m-%d}: PV {self.pv} / UU {self.uu}"
@@ -0,0 +1,215 @@
+"""Time-based partitioning and retention for the append-only analytics tables.
+
+On PostgreSQL ``analytics_pageview`` and ``analytics_eventlog`` are range
+partitioned on their timestamp column (see migration 0008), one partition per
+``ANALYTICS_PARTITION_MONTHS`` local calendar months plus a DEFAULT partition
+that catches anything outside the prepared ranges. Expired data is removed by
+detaching and dropping whole partitions, which costs the same regardless of
+how many rows they hold; only rows that landed in the DEFAULT partition are
+deleted row by row. Other databases fall back to deleting expired rows in
+bounded primary-key chunks.
+
+Indexes are declared on the partitioned parent, so PostgreSQL creates the
+matching ``created_at``, ``(path, created_at)`` and ``(event_type,
+occurred_at)`` index on every partition.
+"""
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from typing import Optional
+
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from .models import EventLog, PageView
+
+PARTITIONED_MODELS: tuple[tuple[type[models.Model], str], ...] = (
+    (PageView, "created_at"),
+    (EventLog, "occurred_at"),
+)
+
+_PARTITION_SUFFIX = re.compile(r"_p(\d{4})(\d{2})$")
+
+
+@dataclass(frozen=True)
+class PartitionRange:
+    start: date
+    end: date
+
+    @property
+    def suffix(self) -> str:
+        return f"p{self.start:%Y%m}"
+
+    def bounds(self) -> tuple[datetime, datetime]:
+        """Aware datetimes of the range boundaries in the current time zone."""
+
+        return (
+            timezone.make_aware(datetime.combine(self.start, time.min)),
+            timezone.make_aware(datetime.combine(self.end, time.min)),
+        )
+
+
+def _add_months(day: date, months: int) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def range_containing(day: date, months: int = 1) -> PartitionRange:
+    """Return the partition range holding ``day``; ranges align to January."""
+
+    months = max(1, months)
+    first_month = (day.month - 1) // months * months + 1
+    start = date(day.year, first_month, 1)
+    return PartitionRange(start, _add_months(start, months))
+
+
+def ranges_between(first: date, last: date, months: int = 1) -> list[PartitionRange]:
+    ranges = []
+    current = range_containing(first, months)
+    while current.start <= last:
+        ranges.append(current)
+        current = PartitionRange(current.end, _add_months(current.end, max(1, months)))
+    return ranges
+
+
+def upcoming_ranges(today: date, ahead: int, months: int = 1) -> list[PartitionRange]:
+    """The range holding ``today`` followed by ``ahead`` future ranges."""
+
+    months = max(1, months)
+    current = range_containing(today, months)
+    return ranges_between(current.start, _add_months(current.start, months * max(0, ahead)), months)
+
+
+def partition_name(table: str, partition: PartitionRange) -> str:
+    return f"{table}_{partition.suffix}"
+
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+
+def is_partitioned(table: str) -> bool:
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+            "WHERE c.relname = %s AND pg_table_is_visible(c.oid)",
+            [table],
+        )
+        return cursor.fetchone() is not None
+
+
+def existing_partitions(table: str) -> dict[str, Optional[date]]:
+    """Map partition names to their start month (``None`` for unrecognised names)."""
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = %s AND pg_table_is_visible(p.oid)",
+            [table],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    partitions: dict[str, Optional[date]] = {}
+    for name in names:
+        match = _PARTITION_SUFFIX.search(name)
+        partitions[name] = date(int(match.group(1)), int(match.group(2)), 1) if match else None
+    return partitions
+
+
+def create_partition(table: str, partition: PartitionRange, column: str) -> bool:
+    """Create the partition for ``partition`` unless it already exists.
+
+    PostgreSQL refuses to create a partition while the DEFAULT partition holds
+    rows in its range, so those rows are moved into the new partition with the
+    DEFAULT partition detached, all in one transaction.
+    """
+
+    name = partition_name(table, partition)
+    partitions = existing_partitions(table)
+    if name in partitions:
+        return False
+    quote = connection.ops.quote_name
+    default = default_partition_name(table)
+    start, end = partition.bounds()
+    in_range = f"{quote(column)} >= %s AND {quote(column)} < %s"
+    create = f"CREATE TABLE {quote(name)} PARTITION OF {quote(table)} FOR VALUES FROM (%s) TO (%s)"
+    with transaction.atomic(), connection.cursor() as cursor:
+        stray = False
+        if default in partitions:
+            cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {quote(default)} WHERE {in_range})", [start, end])
+            stray = cursor.fetchone()[0]
+        if not stray:
+            cursor.execute(create, [start, end])
+            return True
+        cursor.execute(f"ALTER TABLE {quote(table)} DETACH PARTITION {quote(default)}")
+        cursor.execute(create, [start, end])
+        cursor.execute(f"INSERT INTO {quote(table)} SELECT * FROM {quote(default)} WHERE {in_range}", [start, end])
+        cursor.execute(f"DELETE FROM {quote(default)} WHERE {in_range}", [start, end])
+        cursor.execute(f"ALTER TABLE {quote(table)} ATTACH PARTITION {quote(default)} DEFAULT")
+    return True
+
+
+def drop_partition(table: str, name: str) -> None:
+    quote = connection.ops.quote_name
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {quote(table)} DETACH PARTITION {quote(name)}")
+        cursor.execute(f"DROP TABLE {quote(name)}")
+
+
+def expired_partitions(table: str, cutoff: date, months: int = 1) -> list[str]:
+    """Partitions whose whole range ends on or before ``cutoff``."""
+
+    expired = []
+    for name, start in sorted(existing_partitions(table).items()):
+        if start is not None and range_containing(start, months).end <= cutoff:
+            expired.append(name)
+    return expired
+
+
+def delete_default_before(table: str, column: str, cutoff: datetime, *, chunk_size: int = 5000) -> int:
+    """Delete rows older than ``cutoff`` from ``table``'s DEFAULT partition only.
+
+    Ranged partitions are only ever dropped whole, so retention never deletes
+    row by row from a live partition.
+    """
+
+    quote = connection.ops.quote_name
+    default = quote(default_partition_name(table))
+    deleted = 0
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {default} WHERE id IN "
+                f"(SELECT id FROM {default} WHERE {quote(column)} < %s ORDER BY id LIMIT %s)",
+                [cutoff, chunk_size],
+            )
+            count = cursor.rowcount
+        if not count:
+            return deleted
+        deleted += count
+
+
+def count_default_before(table: str, column: str, cutoff: datetime) -> int:
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT COUNT(*) FROM {quote(default_partition_name(table))} WHERE {quote(column)} < %s", [cutoff]
+        )
+        return cursor.fetchone()[0]
+
+
+def delete_before(model: type[models.Model], column: str, cutoff: datetime, *, chunk_size: int = 5000) -> int:
+    """Delete rows older than ``cutoff`` in primary-key chunks, one transaction each."""
+
+    deleted = 0
+    expired = model.objects.filter(**{f"{column}__lt": cutoff}).order_by("pk")
+    while True:
+        pks = list(expired.values_list("pk", flat=True)[:chunk_size])
+        if not pks:
+            return deleted
+        with transaction.atomic():
+            count, _ = model.objects.filter(pk__in=pks).delete()
+        deleted += count
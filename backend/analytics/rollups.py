@@ -0,0 +1,235 @@
+"""Incrementally maintained daily page view rollups.
+
+Rows are keyed by the local calendar day (``TIME_ZONE``) and path. The PV count
+is incremented for every page view and each visitor's ``ip_hash`` is folded
+into the row's HyperLogLog sketch, so UU for any range of days or set of paths
+is answered by merging sketches without touching raw ``PageView`` rows.
+``rebuild_pageview_rollups`` recomputes rollups from the raw rows.
+
+Batched writers (the write-behind flush) apply rollups with the insert. Page
+views recorded one at a time only update this worker's ``pending_rollups``
+in memory, so landing-page requests never wait on the rollup row lock. The
+deltas are written every ``ANALYTICS_ROLLUP_FLUSH_INTERVAL_SECONDS`` by a
+background thread (and after a response once that interval has passed), and
+whatever is still pending when the worker exits.
+"""
+import atexit
+import logging
+import os
+import threading
+import time as monotonic_time
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .hll import HyperLogLog, merged
+from .models import PageView, PageViewDailyRollup
+
+logger = logging.getLogger(__name__)
+
+
+def local_day(moment: datetime) -> date:
+    return timezone.localdate(moment)
+
+
+def day_bounds(day: date) -> tuple[datetime, datetime]:
+    """Return the aware [start, end) datetimes of ``day`` in the current time zone."""
+
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    end = timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min))
+    return start, end
+
+
+# (day, path) -> [page views, sketch of their ip hashes or None]
+RollupDeltas = dict[tuple[date, str], list]
+
+
+def _fold(deltas: RollupDeltas, rows: Iterable[PageView]) -> None:
+    for row in rows:
+        delta = deltas.setdefault((local_day(row.created_at or timezone.now()), row.path), [0, None])
+        delta[0] += 1
+        if row.ip_hash is not None:
+            if delta[1] is None:
+                delta[1] = HyperLogLog()
+            delta[1].add(row.ip_hash)
+
+
+def _write(deltas: RollupDeltas) -> None:
+    for (day, path), (pv, visitors) in deltas.items():
+        with transaction.atomic():
+            rollup, _ = PageViewDailyRollup.objects.select_for_update().get_or_create(day=day, path=path)
+            fields = ["pv"]
+            rollup.pv = F("pv") + pv
+            if visitors is not None:
+                sketch = HyperLogLog.from_bytes(rollup.uu_sketch)
+                sketch.merge(visitors)
+                rollup.uu_sketch = sketch.to_bytes()
+                rollup.uu = sketch.estimate()
+                fields += ["uu", "uu_sketch"]
+            rollup.save(update_fields=fields + ["updated_at"])
+
+
+def apply_page_views(rows: Iterable[PageView]) -> None:
+    """Fold a batch of page views into the rollups of their day and path."""
+
+    deltas: RollupDeltas = {}
+    _fold(deltas, rows)
+    _write(deltas)
+
+
+def _flush_interval() -> float:
+    return getattr(settings, "ANALYTICS_ROLLUP_FLUSH_INTERVAL_SECONDS", 10.0)
+
+
+class PendingRollups:
+    """Rollup deltas of this worker's page views that are not written yet."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._deltas: RollupDeltas = {}
+        self._last_flush = monotonic_time.monotonic()
+        self._start_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def add(self, rows: Iterable[PageView]) -> None:
+        with self._lock:
+            _fold(self._deltas, rows)
+        self.ensure_started()
+
+    def ensure_started(self) -> None:
+        """Start the flusher thread in this process (again after a fork)."""
+
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            if self._pid is None:
+                atexit.register(self.flush)
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="analytics-rollups", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        # Writes the deltas of a worker that stopped receiving requests.
+        while True:
+            monotonic_time.sleep(max(_flush_interval(), 1.0))
+            close_old_connections()
+            try:
+                self.flush_if_due()
+            finally:
+                close_old_connections()
+
+    def __len__(self) -> int:
+        return sum(pv for pv, _ in self._deltas.values())
+
+    def flush(self) -> int:
+        """Write the pending deltas and return how many page views they covered."""
+
+        with self._lock:
+            deltas, self._deltas = self._deltas, {}
+            self._last_flush = monotonic_time.monotonic()
+        if not deltas:
+            return 0
+        try:
+            _write(deltas)
+        except Exception:
+            # Keep the deltas for the next flush instead of losing them.
+            with self._lock:
+                for key, (pv, visitors) in deltas.items():
+                    pending = self._deltas.setdefault(key, [0, None])
+                    pending[0] += pv
+                    if visitors is not None:
+                        if pending[1] is None:
+                            pending[1] = HyperLogLog()
+                        pending[1].merge(visitors)
+            raise
+        return sum(pv for pv, _ in deltas.values())
+
+    def flush_if_due(self) -> None:
+        if self._deltas and monotonic_time.monotonic() - self._last_flush >= _flush_interval():
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Failed to write pending page view rollups")
+
+
+pending_rollups = PendingRollups()
+
+
+def flush_pending_rollups(**kwargs) -> None:
+    """``request_finished`` receiver: write this worker's rollups when due."""
+
+    pending_rollups.flush_if_due()
+
+
+def rebuild_day(day: date) -> int:
+    """Replace the rollups for ``day`` with counts and sketches from ``PageView``."""
+
+    start, end = day_bounds(day)
+    pv: dict[str, int] = defaultdict(int)
+    sketches: dict[str, HyperLogLog] = defaultdict(HyperLogLog)
+    rows = (
+        PageView.objects.filter(created_at__gte=start, created_at__lt=end)
+        .values_list("path", "ip_hash")
+        .iterator(chunk_size=5000)
+    )
+    for path, ip_hash in rows:
+        pv[path] += 1
+        if ip_hash is not None:
+            sketches[path].add(ip_hash)
+
+    rollups = []
+    for path, count in pv.items():
+        sketch = sketches.get(path)
+        rollups.append(
+            PageViewDailyRollup(
+                day=day,
+                path=path,
+                pv=count,
+                uu=sketch.estimate() if sketch else 0,
+                uu_sketch=sketch.to_bytes() if sketch else b"",
+            )
+        )
+    with transaction.atomic():
+        PageViewDailyRollup.objects.filter(day=day).delete()
+        PageViewDailyRollup.objects.bulk_create(rollups)
+    return len(rollups)
+
+
+def _rollups(start_day: date, end_day: date, paths: Optional[Iterable[str]]):
+    qs = PageViewDailyRollup.objects.filter(day__gte=start_day, day__lte=end_day)
+    if paths is not None:
+        qs = qs.filter(path__in=list(paths))
+    return qs
+
+
+def daily_totals(start_day: date, end_day: date, paths: Optional[Iterable[str]] = None) -> list[dict]:
+    """Return ``{"day", "pv", "uu"}`` rows for each day with traffic, oldest first.
+
+    UU is de-duplicated across paths by merging that day's sketches.
+    """
+
+    by_day: dict[date, list] = defaultdict(list)
+    for day, pv, uu, sketch in _rollups(start_day, end_day, paths).values_list("day", "pv", "uu", "uu_sketch"):
+        by_day[day].append((pv, uu, sketch))
+
+    totals = []
+    for day in sorted(by_day):
+        rows = by_day[day]
+        uu = rows[0][1] if len(rows) == 1 else merged(row[2] for row in rows).estimate()
+        totals.append({"day": day, "pv": sum(row[0] for row in rows), "uu": uu})
+    return totals
+
+
+def unique_visitors(start_day: date, end_day: date, paths: Optional[Iterable[str]] = None) -> int:
+    """Estimate distinct visitors across a date range and set of paths."""
+
+    sketches = _rollups(start_day, end_day, paths).values_list("uu_sketch", flat=True)
+    return merged(sketches).estimate()
@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from analytics import buffer as buffer_module
+from analytics.buffer import OVERFLOW_BLOCK, WriteBehindBuffer
+from analytics.models import EventLog, PageView
+
+
+def _page_view(**kwargs):
+    defaults = {"path": "/", "method": "GET", "status_code": 200}
+    defaults.update(kwargs)
+    return PageView(**defaults)
+
+
+class WriteBehindBufferTests(TestCase):
+    def test_flush_writes_rows_in_bulk_with_capture_time(self):
+        buf = WriteBehindBuffer(flush_size=10)
+        captured = timezone.now() - timedelta(seconds=30)
+        buf.add(_page_view(created_at=captured))
+        buf.add(_page_view(path="/lp/"))
+        buf.add(EventLog(event_type="cta_click"))
+
+        self.assertEqual(PageView.objects.count(), 0)
+        self.assertEqual(buf.flush(), 3)
+
+        self.assertEqual(PageView.objects.count(), 2)
+        self.assertEqual(EventLog.objects.count(), 1)
+        self.assertEqual(PageView.objects.get(path="/").created_at, captured)
+        metrics = buf.metrics()
+        self.assertEqual(metrics["flushed"], 3)
+        self.assertEqual(metrics["queue_depth"], 0)
+        self.assertEqual(metrics["flushes"], 1)
+
+    def test_drop_policy_counts_overflow(self):
+        buf = WriteBehindBuffer(max_size=2)
+        results = [buf.add(_page_view()) for _ in range(4)]
+
+        self.assertEqual(results, [True, True, False, False])
+        self.assertEqual(buf.metrics()["dropped"], 2)
+        self.assertEqual(buf.metrics()["queue_depth"], 2)
+
+    def test_block_policy_waits_then_drops(self):
+        buf = WriteBehindBuffer(max_size=1, overflow=OVERFLOW_BLOCK, block_timeout=0.01)
+        self.assertTrue(buf.add(_page_view()))
+        self.assertFalse(buf.add(_page_view()))
+        self.assertEqual(buf.metrics()["dropped"], 1)
+
+    def test_stop_flushes_pending_rows(self):
+        buf = WriteBehindBuffer()
+        buf.add(_page_view())
+        buf.stop()
+        self.assertEqual(PageView.objects.count(), 1)
+
+    def test_rejects_unknown_overflow_policy(self):
+        with self.assertRaises(ValueError):
+            WriteBehindBuffer(overflow="spill")
+
+    @override_settings(ANALYTICS_WRITE_BEHIND_ENABLED=True)
+    def test_landing_page_view_is_buffered_when_enabled(self):
+        buf = WriteBehindBuffer()
+        original = buffer_module._buffer
+        buffer_module._buffer = buf
+        buf.ensure_started = lambda: None
+        try:
+            self.client.get("/")
+            self.assertEqual(PageView.objects.count(), 0)
+            self.assertEqual(buf.metrics()["queue_depth"], 1)
+            buf.flush()
+        finally:
+            buffer_module._buffer = original
+        self.assertEqual(PageView.objects.count(), 1)
@@ -0,0 +1,46 @@
+import hashlib
+
+from django.test import SimpleTestCase
+
+from analytics.hll import REGISTERS, HyperLogLog, merged
+
+
+def _ip_hash(index):
+    return hashlib.sha256(f"salt:10.0.{index // 256}.{index % 256}".encode("utf-8")).hexdigest()
+
+
+class HyperLogLogTests(SimpleTestCase):
+    def test_small_counts_are_nearly_exact(self):
+        sketch = HyperLogLog()
+        sketch.update(_ip_hash(i) for i in range(100))
+        sketch.update(_ip_hash(i) for i in range(50))
+        self.assertAlmostEqual(sketch.estimate(), 100, delta=2)
+
+    def test_large_counts_stay_within_error_bound(self):
+        sketch = HyperLogLog()
+        sketch.update(_ip_hash(i) for i in range(50000))
+        # Four standard errors (1.04 / sqrt(4096) each).
+        self.assertLess(abs(sketch.estimate() - 50000) / 50000, 4 * 1.04 / REGISTERS ** 0.5)
+
+    def test_merge_counts_union(self):
+        first, second = HyperLogLog(), HyperLogLog()
+        first.update(_ip_hash(i) for i in range(0, 600))
+        second.update(_ip_hash(i) for i in range(400, 1000))
+        union = merged([first.to_bytes(), second.to_bytes(), b""])
+        self.assertAlmostEqual(union.estimate(), 1000, delta=20)
+
+    def test_serialization_round_trips_sparse_and_dense(self):
+        sparse = HyperLogLog()
+        sparse.update(_ip_hash(i) for i in range(10))
+        data = sparse.to_bytes()
+        self.assertLess(len(data), 40)
+        self.assertEqual(HyperLogLog.from_bytes(data).registers, sparse.registers)
+
+        dense = HyperLogLog()
+        dense.update(_ip_hash(i) for i in range(20000))
+        self.assertEqual(len(dense.to_bytes()), REGISTERS + 3)
+        self.assertEqual(HyperLogLog.from_bytes(dense.to_bytes()).registers, dense.registers)
+
+    def test_rejects_unknown_encoding(self):
+        with self.assertRaises(ValueError):
+            HyperLogLog.from_bytes(b"X\x0c\x00")
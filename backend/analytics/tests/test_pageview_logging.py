@@ -26,3 +26,11 @@ class PageViewLoggingTests(TestCase):
     def test_does_not_log_post_requests(self):
         self.client.post("/")
         self.assertEqual(PageView.objects.count(), 0)
+
+    async def test_logs_page_view_through_async_middleware(self):
+        response = await self.async_client.get("/", HTTP_X_FORWARDED_FOR="203.0.113.5")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("anon_sid", response.cookies)
+        pv = await PageView.objects.aget()
+        self.assertEqual((pv.path, pv.method, pv.status_code), ("/", "GET", 200))
@@ -0,0 +1,70 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from analytics.models import EventLog, PageView
+from analytics.partitions import delete_before, range_containing, ranges_between, upcoming_ranges
+
+
+class PartitionRangeTests(TestCase):
+    def test_monthly_ranges_cover_calendar_months(self):
+        partition = range_containing(date(2024, 2, 17))
+        self.assertEqual((partition.start, partition.end), (date(2024, 2, 1), date(2024, 3, 1)))
+        self.assertEqual(partition.suffix, "p202402")
+
+    def test_multi_month_ranges_align_to_january(self):
+        partition = range_containing(date(2024, 11, 3), months=3)
+        self.assertEqual((partition.start, partition.end), (date(2024, 10, 1), date(2025, 1, 1)))
+
+    def test_ranges_between_is_contiguous(self):
+        ranges = ranges_between(date(2023, 11, 20), date(2024, 2, 1))
+        self.assertEqual([r.suffix for r in ranges], ["p202311", "p202312", "p202401", "p202402"])
+        for previous, following in zip(ranges, ranges[1:]):
+            self.assertEqual(previous.end, following.start)
+
+    def test_upcoming_ranges_include_current_and_premade(self):
+        ranges = upcoming_ranges(date(2024, 12, 5), ahead=2)
+        self.assertEqual([r.suffix for r in ranges], ["p202412", "p202501", "p202502"])
+
+
+class RetentionFallbackTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.old = now - timedelta(days=120)
+        for index in range(7):
+            PageView.objects.create(path=f"/old/{index}", method="GET", status_code=200, created_at=self.old)
+        PageView.objects.create(path="/fresh", method="GET", status_code=200, created_at=now)
+        EventLog.objects.create(event_type="cta_click", occurred_at=self.old)
+        EventLog.objects.create(event_type="cta_click", occurred_at=now)
+
+    def test_delete_before_works_in_chunks(self):
+        deleted = delete_before(PageView, "created_at", timezone.now() - timedelta(days=90), chunk_size=3)
+
+        self.assertEqual(deleted, 7)
+        self.assertEqual(list(PageView.objects.values_list("path", flat=True)), ["/fresh"])
+
+    def test_command_deletes_expired_rows_without_partitions(self):
+        out = StringIO()
+        call_command("manage_analytics_partitions", retention_days=90, chunk_size=2, stdout=out)
+
+        self.assertEqual(PageView.objects.count(), 1)
+        self.assertEqual(EventLog.objects.count(), 1)
+        self.assertIn("analytics_pageview: deleted 7 row(s)", out.getvalue())
+
+    def test_dry_run_reports_without_deleting(self):
+        out = StringIO()
+        call_command("manage_analytics_partitions", retention_days=90, dry_run=True, stdout=out)
+
+        self.assertEqual(PageView.objects.count(), 8)
+        self.assertIn("analytics_pageview: would delete 7 row(s)", out.getvalue())
+
+    @override_settings(ANALYTICS_RETENTION_DAYS=0)
+    def test_retention_disabled_by_default(self):
+        out = StringIO()
+        call_command("manage_analytics_partitions", stdout=out)
+
+        self.assertEqual(PageView.objects.count(), 8)
+        self.assertIn("retention disabled", out.getvalue())
@@ -0,0 +1,132 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from analytics.buffer import persist_rows
+from analytics.models import PageView, PageViewDailyRollup
+from analytics.rollups import PendingRollups, daily_totals, pending_rollups, unique_visitors
+
+
+def _page_view(ip_hash, created_at=None, path="/"):
+    return PageView(
+        path=path,
+        method="GET",
+        status_code=200,
+        ip_hash=ip_hash,
+        created_at=created_at or timezone.now(),
+    )
+
+
+class PageViewRollupTests(TestCase):
+    def setUp(self):
+        pending_rollups.flush()
+
+    def test_landing_page_views_update_rollup_incrementally(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.get("/", HTTP_X_FORWARDED_FOR="203.0.113.5")
+            self.client.get("/", HTTP_X_FORWARDED_FOR="203.0.113.5")
+            self.client.get("/", HTTP_X_FORWARDED_FOR="198.51.100.7")
+        self.assertFalse(PageViewDailyRollup.objects.exists())
+
+        self.assertEqual(pending_rollups.flush(), 3)
+        rollup = PageViewDailyRollup.objects.get()
+        self.assertEqual(rollup.day, timezone.localdate())
+        self.assertEqual(rollup.path, "/")
+        self.assertEqual((rollup.pv, rollup.uu), (3, 2))
+
+    def test_landing_page_request_only_inserts_the_page_view(self):
+        self.client.get("/")  # warm the landing page cache; never committed, so not rolled up
+        with self.captureOnCommitCallbacks(execute=True), self.assertNumQueries(1):
+            self.client.get("/", HTTP_X_FORWARDED_FOR="203.0.113.5")
+
+        with self.settings(ANALYTICS_ROLLUP_FLUSH_INTERVAL_SECONDS=0):
+            self.client.get("/survey/")
+        self.assertEqual(PageViewDailyRollup.objects.get().pv, 1)
+
+    def test_idle_worker_writes_deltas_from_its_flusher_thread(self):
+        pending = PendingRollups()
+        with mock.patch("analytics.rollups.atexit.register") as register, mock.patch(
+            "analytics.rollups.threading.Thread"
+        ) as thread:
+            pending.add([_page_view("a"), _page_view("b")])
+        register.assert_called_once_with(pending.flush)
+        thread.return_value.start.assert_called_once_with()
+
+        class Stop(Exception):
+            pass
+
+        # One pass of the thread's loop, on this test's connection.
+        with self.settings(ANALYTICS_ROLLUP_FLUSH_INTERVAL_SECONDS=0), mock.patch(
+            "analytics.rollups.monotonic_time.sleep", side_effect=[None, Stop]
+        ), mock.patch("analytics.rollups.close_old_connections"), self.assertRaises(Stop):
+            pending._run()
+        self.assertEqual(PageViewDailyRollup.objects.get().pv, 2)
+        self.assertEqual(len(pending), 0)
+
+    def test_batches_count_repeat_visitors_once(self):
+        persist_rows(PageView, [_page_view("a"), _page_view("a"), _page_view("b")])
+        persist_rows(PageView, [_page_view("b"), _page_view("c")])
+
+        rollup = PageViewDailyRollup.objects.get()
+        self.assertEqual((rollup.pv, rollup.uu), (5, 3))
+
+    def test_unique_visitors_merge_across_paths_and_days(self):
+        yesterday = timezone.now() - timedelta(days=1)
+        persist_rows(PageView, [_page_view("a"), _page_view("b", path="/lp/")])
+        persist_rows(PageView, [_page_view("a", path="/lp/"), _page_view("c", created_at=yesterday)])
+
+        today = timezone.localdate()
+        self.assertEqual(daily_totals(today, today), [{"day": today, "pv": 3, "uu": 2}])
+        self.assertEqual(unique_visitors(today - timedelta(days=1), today), 3)
+        self.assertEqual(unique_visitors(today, today, ["/lp/"]), 2)
+
+    def test_day_boundary_follows_time_zone(self):
+        # 15:30 UTC is 00:30 on the next day in Asia/Tokyo.
+        moment = datetime(2024, 5, 1, 15, 30, tzinfo=dt_timezone.utc)
+        persist_rows(PageView, [_page_view("a", created_at=moment)])
+        self.assertEqual(PageViewDailyRollup.objects.get().day.isoformat(), "2024-05-02")
+
+    def test_rebuild_command_repairs_rollups(self):
+        persist_rows(PageView, [_page_view("a"), _page_view("b")])
+        PageViewDailyRollup.objects.update(pv=99, uu=99)
+        PageView.objects.create(path="/", method="GET", status_code=200, ip_hash="a")
+
+        call_command("rebuild_pageview_rollups", "--days", "2", stdout=StringIO())
+
+        rollup = PageViewDailyRollup.objects.get()
+        self.assertEqual((rollup.pv, rollup.uu), (3, 2))
+
+    def test_admin_chart_reads_rollups(self):
+        persist_rows(PageView, [_page_view("a"), _page_view("b", path="/lp/")])
+        user = get_user_model().objects.create_superuser("admin", "admin@example.com", "pass")
+        self.client.force_login(user)
+
+        response = self.client.get(reverse("admin:analytics_pageview_changelist"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["summary_pv_today"], 2)
+        self.assertEqual(response.context["chart_uu"], [2])
+
+        filtered = self.client.get(reverse("admin:analytics_pageview_changelist"), {"path__exact": "/lp/"})
+        self.assertEqual(filtered.context["summary_pv_today"], 1)
+
+    def test_admin_path_filter_choices_come_from_rollups(self):
+        cache.clear()
+        persist_rows(PageView, [_page_view("a"), _page_view("b", path="/lp/"), _page_view("c", path="/lp/")])
+        user = get_user_model().objects.create_superuser("admin", "admin@example.com", "pass")
+        self.client.force_login(user)
+
+        response = self.client.get(reverse("admin:analytics_pageview_changelist"))
+        path_filter = next(spec for spec in response.context["cl"].filter_specs if spec.parameter_name == "path__exact")
+        self.assertEqual([value for value, _ in path_filter.lookup_choices], ["/lp/", "/"])
+
+        filtered = self.client.get(
+            reverse("admin:analytics_pageview_changelist"), {"path__exact": "/lp/", "status_class": "2"}
+        )
+        self.assertEqual(len(filtered.context["cl"].result_list), 2)
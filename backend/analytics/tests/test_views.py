@@ -1,6 +1,13 @@
-from django.test import TestCase, override_settings
+import json
+import uuid
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import AsyncRequestFactory, TestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
 
+from analytics import views
 from analytics.middleware import EnsureSessionIdMiddleware
 from analytics.models import EventLog
 
@@ -8,7 +15,7 @@ from analytics.models import EventLog
 @override_settings(NOTE_DETAIL_URL="https://example.com/premium")
 class AnalyticsViewTests(TestCase):
     def test_go_note_detail_logs_event_and_redirects(self) -> None:
-        cookie_value = "test-session-id"
+        cookie_value = str(uuid.uuid4())
         self.client.cookies[EnsureSessionIdMiddleware.COOKIE_NAME] = cookie_value
 
         url = reverse("go_note_detail")
@@ -38,6 +45,19 @@ class AnalyticsViewTests(TestCase):
         # Middleware should attach a cookie when none was provided.
         self.assertIn(EnsureSessionIdMiddleware.COOKIE_NAME, response.cookies)
 
+    async def test_async_go_note_detail_logs_event_and_redirects(self) -> None:
+        request = AsyncRequestFactory().get("/go/note-detail/")
+        sid = str(uuid.uuid4())
+        request.COOKIES[EnsureSessionIdMiddleware.COOKIE_NAME] = sid
+
+        response = await views.ago_note_detail(request)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response["Location"], "https://example.com/premium")
+        event = await EventLog.objects.aget()
+        self.assertEqual((event.event_type, event.session_id), ("cta_click", sid))
+        self.assertEqual((await views.apurchased_note(AsyncRequestFactory().post("/purchased/note/"))).status_code, 405)
+
     def test_purchased_note_respects_internal_next_parameter(self) -> None:
         base_url = reverse("purchased_note")
         next_url = "/app/result/12345678-1234-1234-1234-1234567890ab"
@@ -59,3 +79,98 @@ class AnalyticsViewTests(TestCase):
 
         event = EventLog.objects.get()
         self.assertEqual(event.extra_payload, {"path": base_url})
+
+
+class EventBeaconTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.sid = str(uuid.uuid4())
+        self.client.cookies[EnsureSessionIdMiddleware.COOKIE_NAME] = self.sid
+
+    def _post(self, payload, content_type="text/plain;charset=UTF-8"):
+        body = payload if isinstance(payload, (str, bytes)) else json.dumps(payload)
+        return self.client.post(reverse("event_batch"), data=body, content_type=content_type)
+
+    def test_valid_events_are_inserted_in_one_query(self) -> None:
+        events = [
+            {"t": "survey_start", "d": {"path": "/app/survey"}},
+            {"t": "item_progress", "d": {"answered": 10}},
+            {"t": "result_view"},
+            {"t": "unknown_type"},
+            "garbage",
+        ]
+        with self.assertNumQueries(1):
+            response = self._post({"events": events})
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json(), {"accepted": 3, "rejected": 2})
+        progress = EventLog.objects.get(event_type="item_progress")
+        self.assertEqual(progress.session_id, self.sid)
+        self.assertEqual(progress.extra_payload, {"source": "beacon", "answered": 10})
+
+    def test_client_timestamp_is_used_when_plausible(self) -> None:
+        recent = timezone.now() - timedelta(minutes=5)
+        far_past = timezone.now() - timedelta(days=30)
+        self._post(
+            {
+                "events": [
+                    {"t": "survey_start", "ts": int(recent.timestamp() * 1000)},
+                    {"t": "result_view", "ts": int(far_past.timestamp() * 1000)},
+                ]
+            }
+        )
+        start = EventLog.objects.get(event_type="survey_start")
+        self.assertLess(abs((start.occurred_at - recent).total_seconds()), 1)
+        view = EventLog.objects.get(event_type="result_view")
+        self.assertLess((timezone.now() - view.occurred_at).total_seconds(), 60)
+
+    @override_settings(ANALYTICS_BEACON_MAX_EVENTS=2, ANALYTICS_BEACON_SESSION_MAX_EVENTS=3)
+    def test_request_and_session_caps(self) -> None:
+        events = [{"t": "item_progress"}] * 5
+        self.assertEqual(self._post({"events": events}).json()["accepted"], 2)
+        self.assertEqual(self._post({"events": events}).json()["accepted"], 1)
+        self.assertEqual(self._post({"events": events}).json()["accepted"], 0)
+        self.assertEqual(EventLog.objects.count(), 3)
+
+    @override_settings(ANALYTICS_BEACON_IP_MAX_EVENTS=5)
+    def test_cookieless_clients_share_an_ip_quota(self) -> None:
+        events = [{"t": "item_progress"}] * 5
+        accepted = []
+        for _ in range(4):
+            # Cross-site beacons never carry the SameSite=Lax cookie set in reply.
+            self.client.cookies.clear()
+            accepted.append(self._post({"events": events}).json()["accepted"])
+
+        self.assertEqual(accepted, [5, 0, 0, 0])
+        self.assertFalse(EventLog.objects.exclude(session_id=None).exists())
+
+    @override_settings(ANALYTICS_BEACON_SESSION_MAX_EVENTS=5, ANALYTICS_BEACON_IP_MAX_EVENTS=8)
+    def test_rotated_cookies_share_the_ip_quota(self) -> None:
+        events = [{"t": "item_progress"}] * 5
+        accepted = []
+        for _ in range(3):
+            self.client.cookies[EnsureSessionIdMiddleware.COOKIE_NAME] = str(uuid.uuid4())
+            accepted.append(self._post({"events": events}).json()["accepted"])
+
+        self.assertEqual(accepted, [5, 3, 0])
+        self.assertEqual(EventLog.objects.count(), 8)
+
+    def test_malformed_or_oversized_cookie_is_ignored(self) -> None:
+        for cookie in ("x" * 200, "beacon-session", str(uuid.uuid1())):
+            self.client.cookies[EnsureSessionIdMiddleware.COOKIE_NAME] = cookie
+            self.assertEqual(self._post({"events": [{"t": "result_view"}]}).json()["accepted"], 1)
+
+        self.assertFalse(EventLog.objects.exclude(session_id=None).exists())
+
+    def test_server_side_event_types_are_rejected(self) -> None:
+        response = self._post({"events": [{"t": "purchase_note"}, {"t": "cta_click"}, {"t": "result_view"}]})
+
+        self.assertEqual(response.json(), {"accepted": 1, "rejected": 2})
+        self.assertFalse(EventLog.objects.filter(event_type__in=["purchase_note", "cta_click"]).exists())
+
+    def test_rejects_malformed_and_oversized_bodies(self) -> None:
+        self.assertEqual(self._post("not json").status_code, 400)
+        self.assertEqual(self._post({"events": "nope"}).status_code, 400)
+        with override_settings(ANALYTICS_BEACON_MAX_BYTES=10):
+            self.assertEqual(self._post({"events": []}).status_code, 413)
+        self.assertEqual(self.client.get(reverse("event_batch")).status_code, 405)
@@ -1,8 +1,12 @@
+from django.conf import settings
 from django.urls import path
 
 from . import views
 
+ASYNC_VIEWS = getattr(settings, "ASYNC_VIEWS", False)
+
 urlpatterns = [
-    path("go/note-detail/", views.go_note_detail, name="go_note_detail"),
-    path("purchased/note/", views.purchased_note, name="purchased_note"),
+    path("go/note-detail/", views.ago_note_detail if ASYNC_VIEWS else views.go_note_detail, name="go_note_detail"),
+    path("purchased/note/", views.apurchased_note if ASYNC_VIEWS else views.purchased_note, name="purchased_note"),
+    path("api/events/batch", views.event_batch, name="event_batch"),
 ]
@@ -1,16 +1,25 @@
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
 from typing import Optional
 
 from django.conf import settings
-from django.http import HttpRequest, HttpResponse, HttpResponseRedirect
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse, HttpResponseNotAllowed, HttpResponseRedirect, JsonResponse
 from django.shortcuts import render
-from django.views.decorators.http import require_GET
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
 from django.utils.http import url_has_allowed_host_and_scheme
 
+from .buffer import arecord, persist_rows, record
+from .middleware import forwarded_ips, hash_ip, session_id
 from .models import EventLog
 
-
-def _sid(request: HttpRequest) -> Optional[str]:
-    return request.COOKIES.get("anon_sid")
+# Only events the SPA emits; CTA clicks and purchases are recorded server-side.
+CLIENT_EVENT_TYPES = frozenset({"survey_start", "item_progress", "result_view"})
+BEACON_MAX_DATA_BYTES = 1024
+BEACON_MAX_PAST = timedelta(days=1)
+BEACON_MAX_FUTURE = timedelta(minutes=1)
 
 
 def _next_url(request: HttpRequest) -> Optional[str]:
@@ -24,28 +33,164 @@ def _next_url(request: HttpRequest) -> Optional[str]:
     return None
 
 
-@require_GET
-def go_note_detail(request: HttpRequest) -> HttpResponse:
-    EventLog.objects.create(
+def _cta_click(request: HttpRequest) -> EventLog:
+    return EventLog(
         event_type="cta_click",
-        session_id=_sid(request),
+        session_id=session_id(request),
         referrer=request.META.get("HTTP_REFERER", ""),
         user_agent=request.META.get("HTTP_USER_AGENT", ""),
         extra_payload={"path": request.path},
     )
-    return HttpResponseRedirect(settings.NOTE_DETAIL_URL)
 
 
-@require_GET
-def purchased_note(request: HttpRequest) -> HttpResponse:
-    next_url = _next_url(request)
-    EventLog.objects.create(
+def _purchase(request: HttpRequest, next_url: Optional[str]) -> EventLog:
+    return EventLog(
         event_type="purchase_note",
-        session_id=_sid(request),
+        session_id=session_id(request),
         referrer=request.META.get("HTTP_REFERER", ""),
         user_agent=request.META.get("HTTP_USER_AGENT", ""),
         extra_payload={k: v for k, v in {"path": request.path, "next": next_url}.items() if v is not None},
     )
+
+
+def _purchased_response(request: HttpRequest, next_url: Optional[str]) -> HttpResponse:
     if next_url:
         return HttpResponseRedirect(next_url)
     return render(request, "analytics/purchased_thanks.html", {"next_url": next_url})
+
+
+@require_GET
+def go_note_detail(request: HttpRequest) -> HttpResponse:
+    record(_cta_click(request))
+    return HttpResponseRedirect(settings.NOTE_DETAIL_URL)
+
+
+@require_GET
+def purchased_note(request: HttpRequest) -> HttpResponse:
+    next_url = _next_url(request)
+    record(_purchase(request, next_url))
+    return _purchased_response(request, next_url)
+
+
+# Async variants for ASGI deployments (``ASYNC_VIEWS``). Django 4.2's
+# ``require_GET`` cannot wrap coroutines, so they check the method themselves.
+async def ago_note_detail(request: HttpRequest) -> HttpResponse:
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+    await arecord(_cta_click(request))
+    return HttpResponseRedirect(settings.NOTE_DETAIL_URL)
+
+
+async def apurchased_note(request: HttpRequest) -> HttpResponse:
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+    next_url = _next_url(request)
+    await arecord(_purchase(request, next_url))
+    return _purchased_response(request, next_url)
+
+
+@csrf_exempt
+@require_POST
+def event_batch(request: HttpRequest) -> HttpResponse:
+    """Accept a batch of client events sent with ``navigator.sendBeacon``.
+
+    The body is ``{"events": [{"t": <event type>, "ts": <epoch ms>, "d": {...}}]}``
+    and may arrive as ``text/plain``. Unknown or server-side types and malformed
+    events are skipped; accepted events are inserted with a single
+    ``bulk_create``. Events count against the ``anon_sid`` cookie's quota when
+    the request carries a well-formed one, and always against the hashed
+    client IP's quota, so rotating cookies does not lift the limit.
+    """
+
+    max_bytes = getattr(settings, "ANALYTICS_BEACON_MAX_BYTES", 16384)
+    try:
+        content_length = int(request.META.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        content_length = 0
+    if content_length > max_bytes or len(request.body) > max_bytes:
+        return JsonResponse({"detail": "payload too large"}, status=413)
+
+    try:
+        payload = json.loads(request.body or b"null")
+    except (ValueError, UnicodeDecodeError):
+        return JsonResponse({"detail": "invalid JSON"}, status=400)
+    events = payload.get("events") if isinstance(payload, dict) else None
+    if not isinstance(events, list):
+        return JsonResponse({"detail": "events must be a list"}, status=400)
+
+    # Only a cookie the client sent identifies it; a freshly minted sid would
+    # give every cookieless beacon (the SPA is cross-site) its own quota.
+    sid = session_id(request)
+    allowed = min(len(events), getattr(settings, "ANALYTICS_BEACON_MAX_EVENTS", 50))
+    if sid:
+        allowed = _reserve_quota(
+            f"sid:{sid}", allowed, getattr(settings, "ANALYTICS_BEACON_SESSION_MAX_EVENTS", 500)
+        )
+    allowed = _reserve_quota(_ip_quota_key(request), allowed, getattr(settings, "ANALYTICS_BEACON_IP_MAX_EVENTS", 2000))
+
+    now = timezone.now()
+    referrer = (request.META.get("HTTP_REFERER") or "")[:255]
+    user_agent = request.META.get("HTTP_USER_AGENT", "")
+    rows = []
+    for raw in events[:allowed]:
+        event = _beacon_event(raw, now=now)
+        if event is None:
+            continue
+        event.session_id = sid
+        event.referrer = referrer
+        event.user_agent = user_agent
+        rows.append(event)
+
+    if rows:
+        persist_rows(EventLog, rows)
+    return JsonResponse({"accepted": len(rows), "rejected": len(events) - len(rows)}, status=202)
+
+
+def _ip_quota_key(request: HttpRequest) -> str:
+    # The last X-Forwarded-For hop is added by our proxy; earlier ones are client-supplied.
+    forwarded = forwarded_ips(request)
+    return "ip:" + hash_ip(forwarded[-1] if forwarded else request.META.get("REMOTE_ADDR", ""))
+
+
+def _reserve_quota(client_key: str, wanted: int, limit: int) -> int:
+    """Count ``wanted`` events against the client's window and return how many fit."""
+
+    if wanted <= 0:
+        return 0
+    window = getattr(settings, "ANALYTICS_BEACON_SESSION_WINDOW_SECONDS", 3600)
+    key = f"analytics:beacon:{client_key}"
+    cache.add(key, 0, timeout=window)
+    try:
+        used = cache.incr(key, wanted)
+    except ValueError:
+        cache.set(key, wanted, timeout=window)
+        used = wanted
+    return max(0, min(wanted, limit - (used - wanted)))
+
+
+def _beacon_event(raw, *, now: datetime) -> Optional[EventLog]:
+    if not isinstance(raw, dict) or raw.get("t") not in CLIENT_EVENT_TYPES:
+        return None
+
+    data = raw.get("d")
+    if data is not None:
+        if not isinstance(data, dict):
+            return None
+        if len(json.dumps(data, ensure_ascii=False).encode("utf-8")) > BEACON_MAX_DATA_BYTES:
+            return None
+
+    occurred_at = now
+    timestamp = raw.get("ts")
+    if isinstance(timestamp, (int, float)) and not isinstance(timestamp, bool):
+        try:
+            candidate = datetime.fromtimestamp(timestamp / 1000, tz=dt_timezone.utc)
+        except (OverflowError, OSError, ValueError):
+            candidate = None
+        if candidate is not None and now - BEACON_MAX_PAST <= candidate <= now + BEACON_MAX_FUTURE:
+            occurred_at = candidate
+
+    return EventLog(
+        event_type=raw["t"],
+        extra_payload={"source": "beacon", **(data or {})},
+        occurred_at=occurred_at,
+    )
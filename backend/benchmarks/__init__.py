@@ -0,0 +1 @@
+"""Micro-benchmarks for hot paths; run from ``backend/`` with ``python -m benchmarks.<name>``."""
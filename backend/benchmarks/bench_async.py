@@ -0,0 +1,188 @@
+"""Compare one sync (WSGI) and one async (ASGI) worker while the database stalls.
+
+Usage (from ``backend/``; the project settings need the usual environment)::
+
+    DJANGO_SECRET_KEY=bench python -m benchmarks.bench_async --clients 32 --requests 600 --stall-ms 40
+
+Both stacks get one worker, the unit gunicorn multiplies: the sync worker
+serves one request at a time like a gunicorn sync worker, the async worker runs
+every request on one event loop like a uvicorn worker. ``--clients`` closed-loop
+clients send ``/api/results/<id>/`` requests through the full middleware stack;
+``--cold`` of them miss the result cache and query the database, where every
+statement sleeps ``--stall-ms``. The rest are result-cache hits. Latency
+includes the time a request waits for the worker.
+
+Django 4.2 runs async ORM queries on one thread per process, so cold requests
+still queue behind each other on the async worker; what changes is that cache
+hits no longer wait behind them.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import ModuleType
+from unittest import mock
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.db.backends import utils as db_utils  # noqa: E402
+from django.test import AsyncClient, Client, override_settings  # noqa: E402
+from django.urls import path  # noqa: E402
+
+from survey import result_cache  # noqa: E402
+from survey.api.async_views import AsyncSurveyResultDetailView  # noqa: E402
+from survey.api.views import SurveyResultDetailView  # noqa: E402
+from survey.models import SurveyResult  # noqa: E402
+from survey.tokens import signer  # noqa: E402
+
+
+def urlconf(name: str, view) -> ModuleType:
+    module = ModuleType(name)
+    module.urlpatterns = [path("api/results/<uuid:pk>/", view.as_view())]
+    return module
+
+
+SYNC_URLS = urlconf("bench_sync_urls", SurveyResultDetailView)
+ASYNC_URLS = urlconf("bench_async_urls", AsyncSurveyResultDetailView)
+
+
+def create_results(count: int) -> list[str]:
+    SurveyResult.objects.bulk_create(
+        SurveyResult(
+            raw_scores={},
+            **{f"sum_{trait}": 30 for trait in "OCEAN"},
+            **{f"scaled_{trait}": 50 for trait in "OCEAN"},
+        )
+        for _ in range(count)
+    )
+    return [str(pk) for pk in SurveyResult.objects.values_list("pk", flat=True)]
+
+
+def plan_requests(pks: list[str], count: int, cold: float) -> tuple[list[tuple[str, bool]], list[str]]:
+    """Return (pk, is_cold) per request and the pks to pre-warm; cold pks are never reused."""
+
+    warm = pks[:20]
+    cold_pool = iter(pks[20:])
+    rng = random.Random(1)
+    plan = [(next(cold_pool), True) if rng.random() < cold else (rng.choice(warm), False) for _ in range(count)]
+    return plan, warm
+
+
+def warm_up(client: Client, pks: list[str]) -> None:
+    result_cache.clear_result_cache()
+    for pk in pks:
+        client.get(f"/api/results/{pk}/", HTTP_X_RESULT_TOKEN=signer.sign(pk))
+
+
+def stalled(stall: float):
+    original = db_utils.CursorWrapper._execute
+
+    def execute(self, *args, **kwargs):
+        time.sleep(stall)
+        return original(self, *args, **kwargs)
+
+    return mock.patch.object(db_utils.CursorWrapper, "_execute", execute)
+
+
+async def drive(send, plan: list[tuple[str, bool]], clients: int) -> tuple[float, list[tuple[float, bool]]]:
+    queue = list(reversed(plan))
+    samples: list[tuple[float, bool]] = []
+
+    async def client() -> None:
+        while queue:
+            pk, cold = queue.pop()
+            started = time.perf_counter()
+            response = await send(pk)
+            samples.append((time.perf_counter() - started, cold))
+            assert response.status_code == 200, response.status_code
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return time.perf_counter() - started, samples
+
+
+def run_sync(plan, clients: int, stall: float):
+    worker = ThreadPoolExecutor(max_workers=1)
+    local = {}
+
+    def get(pk: str):
+        http = local.setdefault("client", Client())
+        return http.get(f"/api/results/{pk}/", HTTP_X_RESULT_TOKEN=signer.sign(pk))
+
+    async def send(pk: str):
+        return await asyncio.get_running_loop().run_in_executor(worker, get, pk)
+
+    with override_settings(ROOT_URLCONF=SYNC_URLS), stalled(stall):
+        try:
+            return asyncio.run(drive(send, plan, clients))
+        finally:
+            worker.shutdown()
+
+
+def run_async(plan, clients: int, stall: float):
+    http = AsyncClient()
+
+    async def send(pk: str):
+        return await http.get(f"/api/results/{pk}/", headers={"X-Result-Token": signer.sign(pk)})
+
+    with override_settings(ROOT_URLCONF=ASYNC_URLS), stalled(stall):
+        return asyncio.run(drive(send, plan, clients))
+
+
+def summarise(elapsed: float, samples: list[tuple[float, bool]]) -> dict[str, float]:
+    def p99(values: list[float]) -> float:
+        return statistics.quantiles(values, n=100)[98] * 1000 if len(values) > 1 else 0.0
+
+    latencies = [latency for latency, _ in samples]
+    return {
+        "rps": len(samples) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": p99(latencies),
+        "warm_p99_ms": p99([latency for latency, cold in samples if not cold]),
+    }
+
+
+def run(requests: int = 600, clients: int = 32, stall_ms: float = 40.0, cold: float = 0.1) -> dict[str, dict[str, float]]:
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        with override_settings(ALLOWED_HOSTS=["*"], SECURE_SSL_REDIRECT=False, ANALYTICS_LP_PATHS=()):
+            pks = create_results(int(requests * cold * 2) + 40)
+            plan, warm = plan_requests(pks, requests, cold)
+            with override_settings(ROOT_URLCONF=SYNC_URLS):
+                warm_up(Client(), warm)
+            sync = summarise(*run_sync(plan, clients, stall_ms / 1000))
+            with override_settings(ROOT_URLCONF=SYNC_URLS):
+                warm_up(Client(), warm)
+            async_ = summarise(*run_async(plan, clients, stall_ms / 1000))
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+    return {"sync": sync, "async": async_}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=600)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--stall-ms", type=float, default=40.0)
+    parser.add_argument("--cold", type=float, default=0.1, help="Share of requests that miss the result cache.")
+    args = parser.parse_args()
+
+    for stack, result in run(args.requests, args.clients, args.stall_ms, args.cold).items():
+        print(
+            f"{stack:5} rps={result['rps']:.0f} p50={result['p50_ms']:.1f}ms "
+            f"p99={result['p99_ms']:.1f}ms warm_p99={result['warm_p99_ms']:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Compare uncached and memoised insight serialization.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_insights --profiles 20000 --repeat-share 0.4
+
+The workload mixes a share of repeated "speeder" profiles (every answer 3,
+i.e. all sums 30) with uniformly random sum profiles, like real traffic.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from django.conf import settings
+
+if not settings.configured:
+    settings.configure()
+
+from survey.constants import MAX_SCORE, MIN_SCORE, TRAIT_ORDER  # noqa: E402
+from survey.insights import (  # noqa: E402
+    clear_insights_cache,
+    insights_cache_stats,
+    serialize_highlights,
+    serialize_insights,
+    serialize_trait_displays,
+)
+
+
+def build_workload(count: int, repeat_share: float, seed: int) -> list[dict[str, int]]:
+    rng = random.Random(seed)
+    speeder = {trait: 30 for trait in TRAIT_ORDER}
+    workload = []
+    for _ in range(count):
+        if rng.random() < repeat_share:
+            workload.append(speeder)
+        else:
+            workload.append({trait: rng.randint(MIN_SCORE, MAX_SCORE) for trait in TRAIT_ORDER})
+    return workload
+
+
+def uncached(trait_sums: dict[str, int]):
+    rows, highlights = serialize_trait_displays(trait_sums)
+    return rows, serialize_highlights(highlights)
+
+
+def measure(func, workload: list[dict[str, int]]) -> float:
+    started = time.perf_counter()
+    for trait_sums in workload:
+        func(trait_sums)
+    return time.perf_counter() - started
+
+
+def run(profiles: int = 20000, repeat_share: float = 0.4, seed: int = 1) -> dict[str, float]:
+    workload = build_workload(profiles, repeat_share, seed)
+    clear_insights_cache()
+    baseline = measure(uncached, workload)
+    memoised = measure(serialize_insights, workload)
+    return {
+        "profiles": profiles,
+        "uncached_us_per_call": baseline / profiles * 1e6,
+        "memoised_us_per_call": memoised / profiles * 1e6,
+        "speedup": baseline / memoised if memoised else float("inf"),
+        "hit_rate": insights_cache_stats()["hit_rate"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=20000)
+    parser.add_argument("--repeat-share", type=float, default=0.4)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    result = run(args.profiles, args.repeat_share, args.seed)
+    print(
+        f"profiles={result['profiles']} "
+        f"uncached={result['uncached_us_per_call']:.1f}us "
+        f"memoised={result['memoised_us_per_call']:.1f}us "
+        f"speedup={result['speedup']:.1f}x hit_rate={result['hit_rate']:.2f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
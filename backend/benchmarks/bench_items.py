@@ -0,0 +1,87 @@
+"""Measure /api/items/ throughput: DRF serializer per request vs prebuilt bytes.
+
+Usage (from ``backend/``; the project settings need the usual environment)::
+
+    DJANGO_SECRET_KEY=bench python -m benchmarks.bench_items --requests 5000
+
+Both views are driven through ``RequestFactory`` against an in-memory 50-item
+catalog, so the numbers isolate view and rendering cost from the database.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from unittest import mock
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.test import RequestFactory  # noqa: E402
+from rest_framework import generics, permissions  # noqa: E402
+
+from survey.api import views  # noqa: E402
+from survey.api.serializers import PersonalityItemSerializer  # noqa: E402
+from survey.catalog import CatalogItem, ItemCatalog  # noqa: E402
+from survey.constants import TRAIT_ORDER  # noqa: E402
+
+
+class SerializerItemListView(generics.ListAPIView):
+    """The pre-bytes implementation: serialize and render on every request."""
+
+    serializer_class = PersonalityItemSerializer
+    permission_classes = [permissions.AllowAny]
+
+    def get_queryset(self):
+        return list(views.get_catalog().items)
+
+
+def build_catalog() -> ItemCatalog:
+    items = tuple(
+        CatalogItem(f"{trait}{index}", f"{trait} の設問テキスト {index}" * 2, trait, index % 2 == 0, order)
+        for order, (trait, index) in enumerate(((t, i) for t in TRAIT_ORDER for i in range(1, 11)), start=1)
+    )
+    return ItemCatalog(items=items, version=1, fingerprint="bench", loaded_at=time.monotonic())
+
+
+def measure(view, requests) -> float:
+    started = time.perf_counter()
+    for request in requests:
+        response = view(request)
+        if hasattr(response, "render"):
+            response.render()
+    return time.perf_counter() - started
+
+
+def run(count: int = 5000, encoding: str = "gzip, br") -> dict[str, float]:
+    factory = RequestFactory()
+    requests = [factory.get("/api/items/", HTTP_ACCEPT_ENCODING=encoding) for _ in range(count)]
+    with mock.patch.object(views, "get_catalog", return_value=build_catalog()):
+        legacy = measure(SerializerItemListView.as_view(), requests)
+        prebuilt = measure(views.PersonalityItemListView.as_view(), requests)
+    return {
+        "requests": count,
+        "serializer_rps": count / legacy,
+        "bytes_rps": count / prebuilt,
+        "speedup": legacy / prebuilt,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--accept-encoding", default="gzip, br")
+    args = parser.parse_args()
+
+    result = run(args.requests, args.accept_encoding)
+    print(
+        f"requests={result['requests']} serializer={result['serializer_rps']:.0f} req/s "
+        f"bytes={result['bytes_rps']:.0f} req/s speedup={result['speedup']:.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
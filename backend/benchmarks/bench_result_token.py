@@ -0,0 +1,96 @@
+"""Measure queries and latency of /api/results/<id>/ with legacy vs compact tokens.
+
+Usage (from ``backend/``; the project settings need the usual environment)::
+
+    DJANGO_SECRET_KEY=bench python -m benchmarks.bench_result_token --results 500
+
+Every lookup simulates a worker whose result cache is cold, the case the
+compact token is meant for. A throwaway test database is created and dropped.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test import RequestFactory, override_settings  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+from survey import result_cache  # noqa: E402
+from survey.api.views import SurveyResultDetailView  # noqa: E402
+from survey.catalog import get_catalog  # noqa: E402
+from survey.models import SurveyResult  # noqa: E402
+from survey.tokens import issue_token  # noqa: E402
+
+
+def create_results(count: int) -> list[SurveyResult]:
+    results = [
+        SurveyResult(
+            raw_scores={},
+            **{f"sum_{trait}": 10 + (index * 7 + offset) % 41 for offset, trait in enumerate("OCEAN")},
+            **{f"scaled_{trait}": 50 for trait in "OCEAN"},
+        )
+        for index in range(count)
+    ]
+    SurveyResult.objects.bulk_create(results)
+    return list(SurveyResult.objects.all())
+
+
+def measure(results: list[SurveyResult], compact: bool) -> tuple[float, int]:
+    factory = RequestFactory()
+    view = SurveyResultDetailView.as_view()
+    with override_settings(SURVEY_RESULT_COMPACT_TOKENS=compact):
+        requests = [
+            (factory.get(f"/api/results/{result.pk}/", HTTP_X_RESULT_TOKEN=issue_token(result)), result.pk)
+            for result in results
+        ]
+        get_catalog()
+        elapsed = 0.0
+        with CaptureQueriesContext(connection) as queries:
+            for request, pk in requests:
+                result_cache.clear_result_cache()
+                started = time.perf_counter()
+                view(request, pk=pk).render()
+                elapsed += time.perf_counter() - started
+    return elapsed, len(queries)
+
+
+def run(count: int = 500) -> dict[str, float]:
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        results = create_results(count)
+        legacy_seconds, legacy_queries = measure(results, compact=False)
+        compact_seconds, compact_queries = measure(results, compact=True)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+    return {
+        "requests": count,
+        "legacy_queries_per_request": legacy_queries / count,
+        "compact_queries_per_request": compact_queries / count,
+        "legacy_ms": legacy_seconds / count * 1000,
+        "compact_ms": compact_seconds / count * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--results", type=int, default=500)
+    args = parser.parse_args()
+
+    result = run(args.results)
+    print(
+        f"requests={result['requests']} "
+        f"legacy={result['legacy_queries_per_request']:.2f} queries {result['legacy_ms']:.3f} ms/req "
+        f"compact={result['compact_queries_per_request']:.2f} queries {result['compact_ms']:.3f} ms/req"
+    )
+
+
+if __name__ == "__main__":
+    main()
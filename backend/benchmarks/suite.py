@@ -0,0 +1,255 @@
+"""Benchmark the scoring hot paths and API endpoints against a recorded baseline.
+
+Usage (from ``backend/``; the project settings need the usual environment)::
+
+    DJANGO_SECRET_KEY=bench python -m benchmarks.suite --update        # record
+    DJANGO_SECRET_KEY=bench python -m benchmarks.suite                 # compare
+    DJANGO_SECRET_KEY=bench python -m benchmarks.suite --threshold 0.1 --max-extra-queries 0
+
+Every case records ops/sec (best of ``--repeat`` timed rounds) and the number
+of database queries one call makes. A comparison fails, exiting with status 1,
+when a case runs more than ``--threshold`` slower than its baseline or makes
+more than ``--max-extra-queries`` additional queries.
+
+Throughput only compares on the same machine, so no baseline is committed
+(``benchmarks/baseline.json`` is git-ignored): record one with ``--update`` on
+a clean checkout, e.g. the main branch, then switch to the change and compare.
+
+The endpoint cases go through the Django test client and the full middleware
+stack against a throwaway test database seeded with the item fixture:
+``/api/items/`` with a warm catalog, ``/api/score/`` creating a result per
+call and ``/api/results/<uuid>/`` with an empty result cache.
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+
+from survey import result_cache  # noqa: E402
+from survey.api.serializers import SurveyScoreRequestSerializer, serialize_result_payload  # noqa: E402
+from survey.catalog import get_catalog, invalidate_catalog  # noqa: E402
+from survey.constants import MAX_SCORE, MIN_SCORE, TRAIT_ORDER  # noqa: E402
+from survey.insights import compute_highlights, compute_trait_displays  # noqa: E402
+from survey.models import SurveyResult  # noqa: E402
+from survey.services import compute_trait_scores, scale_score  # noqa: E402
+from survey.tokens import issue_token  # noqa: E402
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+# name -> (calls per timed round, factory returning the operation to time)
+Case = tuple[int, Callable[[], Callable[[], object]]]
+
+
+def _responses(rng: random.Random) -> dict[str, int]:
+    return {item.code: rng.randint(1, 5) for item in get_catalog().items}
+
+
+def _profiles(rng: random.Random, count: int = 64) -> list[dict[str, int]]:
+    return [{trait: rng.randint(MIN_SCORE, MAX_SCORE) for trait in TRAIT_ORDER} for _ in range(count)]
+
+
+def _cycle(values) -> Callable[[], object]:
+    return itertools.cycle(values).__next__
+
+
+def scoring_case() -> Callable[[], object]:
+    items = get_catalog().items
+    responses = _cycle([_responses(random.Random(seed)) for seed in range(16)])
+    return lambda: compute_trait_scores(items, responses())
+
+
+def scale_case() -> Callable[[], object]:
+    totals = range(MIN_SCORE, MAX_SCORE + 1)
+    return lambda: [scale_score(total) for total in totals]
+
+
+def displays_case() -> Callable[[], object]:
+    profiles = _cycle(_profiles(random.Random(1)))
+    return lambda: compute_trait_displays(profiles())
+
+
+def highlights_case() -> Callable[[], object]:
+    displays = _cycle([compute_trait_displays(profile) for profile in _profiles(random.Random(2))])
+    return lambda: compute_highlights(displays())
+
+
+def payload_case() -> Callable[[], object]:
+    results = _cycle(list(SurveyResult.objects.all()[:64]))
+    return lambda: serialize_result_payload(results())
+
+
+def validation_case() -> Callable[[], object]:
+    items = get_catalog()
+    payloads = _cycle([{"responses": _responses(random.Random(seed))} for seed in range(16)])
+
+    def validate():
+        serializer = SurveyScoreRequestSerializer(data=payloads(), context={"items": items})
+        assert serializer.is_valid(), serializer.errors
+
+    return validate
+
+
+def _expect(response, status_code: int):
+    assert response.status_code == status_code, (response.status_code, response.content[:200])
+    return response
+
+
+def items_endpoint_case() -> Callable[[], object]:
+    client = Client()
+    return lambda: _expect(client.get("/api/items/"), 200)
+
+
+def score_endpoint_case() -> Callable[[], object]:
+    client = Client()
+    bodies = _cycle([json.dumps({"responses": _responses(random.Random(seed))}) for seed in range(16)])
+    return lambda: _expect(client.post("/api/score/", bodies(), content_type="application/json"), 201)
+
+
+def detail_endpoint_case() -> Callable[[], object]:
+    client = Client()
+    requests = _cycle(
+        [(f"/api/results/{result.pk}/", issue_token(result)) for result in SurveyResult.objects.all()[:64]]
+    )
+
+    def fetch():
+        url, token = requests()
+        result_cache.clear_result_cache()
+        return _expect(client.get(url, HTTP_X_RESULT_TOKEN=token), 200)
+
+    return fetch
+
+
+CASES: dict[str, Case] = {
+    "compute_trait_scores": (2000, scoring_case),
+    "scale_score_x41": (2000, scale_case),
+    "compute_trait_displays": (2000, displays_case),
+    "compute_highlights": (5000, highlights_case),
+    "serialize_result_payload": (5000, payload_case),
+    "score_serializer_is_valid": (500, validation_case),
+    "GET /api/items/": (500, items_endpoint_case),
+    "POST /api/score/": (200, score_endpoint_case),
+    "GET /api/results/<uuid>/": (300, detail_endpoint_case),
+}
+
+
+def count_queries(operation: Callable[[], object]) -> int:
+    # The test client resets ``connection.queries`` on every request, so count
+    # executions directly instead of using ``CaptureQueriesContext``.
+    executed = []
+
+    def wrapper(execute, sql, params, many, context):
+        executed.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(wrapper):
+        operation()
+    return len(executed)
+
+
+def measure(operation: Callable[[], object], calls: int, repeat: int) -> dict[str, float]:
+    operation()
+    queries = count_queries(operation)
+    best = 0.0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(calls):
+            operation()
+        best = max(best, calls / (time.perf_counter() - started))
+    return {"ops_per_sec": round(best, 1), "queries": queries}
+
+
+def seed_database(results: int = 64) -> None:
+    call_command("loaddata", "items", verbosity=0)
+    invalidate_catalog()
+    client = Client()
+    for seed in range(results):
+        body = json.dumps({"responses": _responses(random.Random(1000 + seed))})
+        _expect(client.post("/api/score/", body, content_type="application/json"), 201)
+
+
+def run(scale: float = 1.0, repeat: int = 5) -> dict[str, dict[str, float]]:
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        with override_settings(ALLOWED_HOSTS=["*"], SECURE_SSL_REDIRECT=False, ANALYTICS_LP_PATHS=()):
+            seed_database()
+            return {
+                name: measure(factory(), max(1, int(calls * scale)), repeat)
+                for name, (calls, factory) in CASES.items()
+            }
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def compare(
+    current: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+    max_extra_queries: int,
+) -> list[str]:
+    """Return a message per case that regressed beyond the allowed budget."""
+
+    regressions = []
+    for name, result in current.items():
+        recorded = baseline.get(name)
+        if recorded is None:
+            continue
+        floor = recorded["ops_per_sec"] * (1 - threshold)
+        if result["ops_per_sec"] < floor:
+            regressions.append(
+                f"{name}: {result['ops_per_sec']:.0f} ops/s is below {floor:.0f} "
+                f"(baseline {recorded['ops_per_sec']:.0f}, threshold {threshold:.0%})"
+            )
+        if result["queries"] > recorded["queries"] + max_extra_queries:
+            regressions.append(f"{name}: {result['queries']} queries per call, baseline {recorded['queries']}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--update", action="store_true", help="Write the results as the new baseline.")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed ops/sec drop, as a fraction.")
+    parser.add_argument("--max-extra-queries", type=int, default=0)
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply the calls per timed round.")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    current = run(args.scale, args.repeat)
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    for name, result in current.items():
+        recorded = baseline.get(name)
+        change = f" ({result['ops_per_sec'] / recorded['ops_per_sec'] - 1:+.0%})" if recorded else ""
+        print(f"{name:28} {result['ops_per_sec']:>10.0f} ops/s{change:8} queries={result['queries']}")
+
+    if args.update:
+        args.baseline.write_text(json.dumps(current, indent=2, sort_keys=True) + "\n")
+        print(f"baseline written to {args.baseline}")
+        return
+    if not baseline:
+        sys.exit(f"no baseline at {args.baseline}; record one on this machine with --update first")
+    regressions = compare(current, baseline, args.threshold, args.max_extra_queries)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
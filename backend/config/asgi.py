@@ -1,4 +1,16 @@
-"""ASGI config for the Big-Five survey project."""
+"""ASGI config for the Big-Five survey project.
+
+The default deployment runs sync gunicorn workers on ``config.wsgi``. The
+async mode runs the same number of gunicorn processes with uvicorn workers::
+
+    ASYNC_VIEWS=1 gunicorn config.asgi:application -k uvicorn.workers.UvicornWorker \\
+        --bind 0.0.0.0:$PORT --log-file -
+
+``ASYNC_VIEWS`` routes the item, score and result endpoints and the analytics
+redirects to native async views, and all project middleware runs natively in
+both modes, so a stalled query no longer blocks the other requests of the
+worker. ``python -m benchmarks.bench_async`` compares the two stacks.
+"""
 from __future__ import annotations
 
 import os
@@ -0,0 +1,186 @@
+"""Namespaced access to the shared Django cache with per-namespace metrics.
+
+Every namespace keeps a version number in the cache itself. Keys are built
+as ``<namespace>:<version>:<key>``, so ``invalidate()`` drops a whole
+namespace on every worker by bumping the version. Each process remembers the
+version for ``CACHE_VERSION_TTL_SECONDS`` so a lookup costs one cache round
+trip, not two; an invalidation made by another worker is therefore seen up to
+that long afterwards (immediately in the invalidating process). Hit/miss counts and
+lookup latency are tracked per namespace in this process and returned by
+``cache_metrics()``. ``aget``/``aset``/``aget_or_set`` use the backend's async
+API for callers on the event loop.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+_ABSENT = object()
+_metrics_lock = threading.Lock()
+_metrics: dict[str, dict[str, float]] = {}
+# (alias, namespace) -> (version, monotonic expiry), shared by every instance in the process.
+_local_versions: dict[tuple[str, str], tuple[int, float]] = {}
+
+
+def _counters(namespace: str) -> dict[str, float]:
+    counters = _metrics.get(namespace)
+    if counters is None:
+        with _metrics_lock:
+            counters = _metrics.setdefault(
+                namespace,
+                {"hits": 0, "misses": 0, "sets": 0, "deletes": 0, "invalidations": 0, "get_seconds": 0.0},
+            )
+    return counters
+
+
+def _fresh_version() -> int:
+    # Time based, so a version key lost to eviction never reuses an old number.
+    return int(time.time() * 1000)
+
+
+def _version_ttl() -> float:
+    return getattr(settings, "CACHE_VERSION_TTL_SECONDS", 5.0)
+
+
+class NamespacedCache:
+    """Key prefixing, versioned invalidation and metrics over one cache alias."""
+
+    def __init__(self, namespace: str, *, alias: str = DEFAULT_CACHE_ALIAS, timeout: Any = DEFAULT_TIMEOUT) -> None:
+        self.namespace = namespace
+        self.alias = alias
+        self.timeout = timeout
+        self._version_key = f"{namespace}:__version__"
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    def _local_version(self) -> int | None:
+        local = _local_versions.get((self.alias, self.namespace))
+        if local is not None and time.monotonic() < local[1]:
+            return local[0]
+        return None
+
+    def _version(self) -> int:
+        version = self._local_version()
+        if version is not None:
+            return version
+        version = self.backend.get(self._version_key)
+        if version is None:
+            self.backend.add(self._version_key, _fresh_version(), timeout=None)
+            version = self.backend.get(self._version_key) or _fresh_version()
+        self._remember(version)
+        return version
+
+    async def _aversion(self) -> int:
+        version = self._local_version()
+        if version is not None:
+            return version
+        version = await self.backend.aget(self._version_key)
+        if version is None:
+            await self.backend.aadd(self._version_key, _fresh_version(), timeout=None)
+            version = await self.backend.aget(self._version_key) or _fresh_version()
+        self._remember(version)
+        return version
+
+    def _remember(self, version: int) -> None:
+        _local_versions[(self.alias, self.namespace)] = (version, time.monotonic() + _version_ttl())
+
+    def make_key(self, key: object) -> str:
+        return f"{self.namespace}:{self._version()}:{key}"
+
+    async def amake_key(self, key: object) -> str:
+        return f"{self.namespace}:{await self._aversion()}:{key}"
+
+    def _count_get(self, value: Any, started: float, default: Any) -> Any:
+        counters = _counters(self.namespace)
+        counters["get_seconds"] += time.perf_counter() - started
+        if value is _ABSENT:
+            counters["misses"] += 1
+            return default
+        counters["hits"] += 1
+        return value
+
+    def get(self, key: object, default: Any = None) -> Any:
+        started = time.perf_counter()
+        return self._count_get(self.backend.get(self.make_key(key), _ABSENT), started, default)
+
+    async def aget(self, key: object, default: Any = None) -> Any:
+        started = time.perf_counter()
+        return self._count_get(await self.backend.aget(await self.amake_key(key), _ABSENT), started, default)
+
+    def set(self, key: object, value: Any, timeout: Any = DEFAULT_TIMEOUT) -> None:
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.timeout
+        self.backend.set(self.make_key(key), value, timeout=timeout)
+        _counters(self.namespace)["sets"] += 1
+
+    async def aset(self, key: object, value: Any, timeout: Any = DEFAULT_TIMEOUT) -> None:
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.timeout
+        await self.backend.aset(await self.amake_key(key), value, timeout=timeout)
+        _counters(self.namespace)["sets"] += 1
+
+    def get_or_set(self, key: object, compute: Callable[[], Any], timeout: Any = DEFAULT_TIMEOUT) -> Any:
+        value = self.get(key, _ABSENT)
+        if value is _ABSENT:
+            value = compute()
+            self.set(key, value, timeout)
+        return value
+
+    async def aget_or_set(self, key: object, compute: Callable[[], Any], timeout: Any = DEFAULT_TIMEOUT) -> Any:
+        value = await self.aget(key, _ABSENT)
+        if value is _ABSENT:
+            value = compute()
+            await self.aset(key, value, timeout)
+        return value
+
+    def delete(self, key: object) -> None:
+        self.backend.delete(self.make_key(key))
+        _counters(self.namespace)["deletes"] += 1
+
+    def delete_many(self, keys) -> None:
+        version = self._version()
+        keys = [f"{self.namespace}:{version}:{key}" for key in keys]
+        if keys:
+            self.backend.delete_many(keys)
+            _counters(self.namespace)["deletes"] += len(keys)
+
+    def invalidate(self) -> None:
+        """Make every key in the namespace unreachable; old entries age out."""
+
+        try:
+            version = self.backend.incr(self._version_key)
+        except ValueError:
+            version = _fresh_version()
+            self.backend.set(self._version_key, version, timeout=None)
+        self._remember(version)
+        _counters(self.namespace)["invalidations"] += 1
+
+    def stats(self) -> dict[str, float]:
+        return _summarise(_counters(self.namespace))
+
+
+def _summarise(counters: dict[str, float]) -> dict[str, float]:
+    lookups = counters["hits"] + counters["misses"]
+    return {
+        **counters,
+        "hit_rate": counters["hits"] / lookups if lookups else 0.0,
+        "avg_get_ms": counters["get_seconds"] / lookups * 1000 if lookups else 0.0,
+    }
+
+
+def cache_metrics() -> dict[str, dict[str, float]]:
+    """Return this process's counters for every namespace used so far."""
+
+    return {namespace: _summarise(counters) for namespace, counters in sorted(_metrics.items())}
+
+
+def reset_cache_metrics() -> None:
+    with _metrics_lock:
+        _metrics.clear()
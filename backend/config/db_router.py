@@ -0,0 +1,95 @@
+"""Optional read-replica routing with read-your-writes stickiness.
+
+Replicas come from ``DATABASE_REPLICA_URLS`` and are exposed as the database
+aliases ``replica_1``, ``replica_2``, ... Reads only go to a replica inside a
+``replica_reads()`` block, which the result detail view, the item catalog and
+the admin aggregates use; everything else, and every write, stays on
+``default``.
+
+A client that has just written is pinned to the primary for
+``DATABASE_REPLICA_PIN_SECONDS`` so replication lag never hides its own
+changes: views whose writes the client reads back call ``pin_after_write``,
+and ``ReplicaPinMiddleware`` then sets a short-lived signed cookie on their
+successful responses. Other writes (analytics beacons, admin edits) do not
+pin. Views holding other evidence of a recent write (a freshly issued result
+token) can pass ``pinned=True``.
+"""
+from __future__ import annotations
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_PREFIX = "replica_"
+
+_replica_reads: ContextVar[bool] = ContextVar("replica_reads", default=False)
+_pinned: ContextVar[bool] = ContextVar("primary_pinned", default=False)
+
+
+def replica_aliases() -> tuple[str, ...]:
+    return tuple(alias for alias in settings.DATABASES if alias.startswith(REPLICA_PREFIX))
+
+
+def pin_seconds() -> int:
+    return getattr(settings, "DATABASE_REPLICA_PIN_SECONDS", 15)
+
+
+@contextmanager
+def replica_reads(*, pinned: bool = False) -> Iterator[None]:
+    """Let reads in this block use a replica unless the client is pinned."""
+
+    token = _replica_reads.set(not pinned)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+@contextmanager
+def pin_to_primary(pinned: bool = True) -> Iterator[None]:
+    token = _pinned.set(pinned)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+def pin_after_write(request) -> None:
+    """Ask ``ReplicaPinMiddleware`` to pin this client if the response succeeds."""
+
+    # DRF views get a wrapper; the middleware sees the underlying HttpRequest.
+    getattr(request, "_request", request).pin_reads_to_primary = True
+
+
+def reads_use_replica() -> bool:
+    if not _replica_reads.get() or _pinned.get():
+        return False
+    # Reads inside a write transaction must see that transaction's rows.
+    return not connections[DEFAULT_DB_ALIAS].in_atomic_block
+
+
+class ReplicaRouter:
+    """Send opted-in reads to a random replica and everything else to ``default``."""
+
+    def db_for_read(self, model, **hints):
+        if hints.get("instance") is not None:
+            # Related lookups follow the database the instance was loaded from.
+            return hints["instance"]._state.db
+        replicas = replica_aliases()
+        if replicas and reads_use_replica():
+            return random.choice(replicas)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -1,15 +1,89 @@
-"""Project-level middleware utilities."""
+"""Project-level middleware utilities.
+
+Every middleware here runs natively under both WSGI and ASGI: a sync-only
+middleware in an ASGI stack makes Django hop to its single sync thread for
+each request, which serialises the async views behind it.
+"""
 from __future__ import annotations
 
+import time
+from abc import ABC, abstractmethod
 
-class AdminContentSecurityPolicyMiddleware:
-    """Add a conservative CSP for admin pages to enforce self-hosted assets."""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.signing import BadSignature, TimestampSigner
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from . import server_timing
+from .db_router import pin_seconds, pin_to_primary, replica_aliases
+
+
+class HybridMiddleware(ABC):
+    """Base for middleware with a sync ``handle`` and an async ``__acall__``.
+
+    ``__call__`` dispatches to whichever matches the rest of the stack.
+    """
+
+    sync_capable = True
+    async_capable = True
 
     def __init__(self, get_response):
         self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
 
     def __call__(self, request):
-        response = self.get_response(request)
+        if self.is_async:
+            return self.__acall__(request)
+        return self.handle(request)
+
+    @abstractmethod
+    def handle(self, request):
+        """Process ``request`` in a sync stack."""
+
+    @abstractmethod
+    async def __acall__(self, request):
+        """Process ``request`` in an async stack."""
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """``WhiteNoiseMiddleware`` that stays on the event loop under ASGI."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+
+class AdminContentSecurityPolicyMiddleware(HybridMiddleware):
+    """Add a conservative CSP for admin pages to enforce self-hosted assets."""
+
+    def handle(self, request):
+        return self._add_policy(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self._add_policy(request, await self.get_response(request))
+
+    def _add_policy(self, request, response):
         if request.path.startswith("/admin/"):
             csp = (
                 "default-src 'self'; "
@@ -22,3 +96,84 @@ class AdminContentSecurityPolicyMiddleware:
             )
             response.headers.setdefault("Content-Security-Policy", csp)
         return response
+
+
+class ReplicaPinMiddleware(HybridMiddleware):
+    """Pin a client's reads to the primary for a short while after it writes.
+
+    Only views that opt in with ``pin_after_write`` pin the client. Only active
+    when read replicas are configured (see ``config.db_router``).
+    """
+
+    COOKIE_NAME = "db_pin"
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.signer = TimestampSigner(salt="config.db_pin")
+
+    def handle(self, request):
+        if not replica_aliases():
+            return self.get_response(request)
+        with pin_to_primary(self._is_pinned(request)):
+            response = self.get_response(request)
+        return self._maybe_pin(request, response)
+
+    async def __acall__(self, request):
+        if not replica_aliases():
+            return await self.get_response(request)
+        with pin_to_primary(self._is_pinned(request)):
+            response = await self.get_response(request)
+        return self._maybe_pin(request, response)
+
+    def _maybe_pin(self, request, response):
+        if getattr(request, "pin_reads_to_primary", False) and response.status_code < 400:
+            response.set_cookie(
+                self.COOKIE_NAME,
+                self.signer.sign("1"),
+                max_age=pin_seconds(),
+                samesite="Lax",
+                secure=not settings.DEBUG,
+                httponly=True,
+            )
+        return response
+
+    def _is_pinned(self, request) -> bool:
+        cookie = request.COOKIES.get(self.COOKIE_NAME)
+        if not cookie:
+            return False
+        try:
+            self.signer.unsign(cookie, max_age=pin_seconds())
+        except BadSignature:
+            return False
+        return True
+
+
+class ServerTimingMiddleware(HybridMiddleware):
+    """Send a ``Server-Timing`` breakdown for a sample of requests.
+
+    See ``config.server_timing``; rendering of template responses is timed
+    here as the ``render`` phase.
+    """
+
+    def handle(self, request):
+        if not server_timing.should_sample():
+            return self.get_response(request)
+        server_timing.track_queries()
+        with server_timing.timing_request() as timings:
+            response = self.get_response(request)
+        return server_timing.report(request, response, timings)
+
+    async def __acall__(self, request):
+        if not server_timing.should_sample():
+            return await self.get_response(request)
+        await sync_to_async(server_timing.track_queries)()
+        with server_timing.timing_request() as timings:
+            response = await self.get_response(request)
+        return server_timing.report(request, response, timings)
+
+    def process_template_response(self, request, response):
+        timings = server_timing.current()
+        if timings is not None:
+            started = time.perf_counter()
+            response.add_post_render_callback(lambda _: timings.add("render", time.perf_counter() - started))
+        return response
@@ -0,0 +1,132 @@
+"""Per-request phase timings for the ``Server-Timing`` header.
+
+``ServerTimingMiddleware`` samples ``SERVER_TIMING_SAMPLE_RATE`` of requests
+(0 disables it, 1 times every request). For a sampled request, code wrapped in
+``phase("name")`` adds its duration to the breakdown and every database query
+is counted and timed; the result is sent as a ``Server-Timing`` header and
+logged as one JSON line on the ``config.server_timing`` logger. Outside a
+sampled request ``phase`` does nothing but read a context variable, so the
+hooks can stay in hot code.
+
+The header exposes internal timings to clients, so keep the sample rate at 0
+in production unless the numbers are needed.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar[RequestTimings | None] = ContextVar("server_timing", default=None)
+
+
+class RequestTimings:
+    """Accumulated phase durations and query statistics for one request."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.phases: dict[str, float] = {}
+        self.queries = 0
+        self.query_seconds = 0.0
+
+    def add(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def total(self) -> float:
+        return time.perf_counter() - self.started
+
+    def header(self, total: float) -> str:
+        metrics = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.phases.items()]
+        metrics.append(f'db;dur={self.query_seconds * 1000:.1f};desc="{self.queries} queries"')
+        metrics.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(metrics)
+
+    def log_record(self, request, response, total: float) -> dict[str, object]:
+        return {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "total_ms": round(total * 1000, 2),
+            "phases_ms": {name: round(seconds * 1000, 2) for name, seconds in self.phases.items()},
+            "db_queries": self.queries,
+            "db_ms": round(self.query_seconds * 1000, 2),
+        }
+
+
+def sample_rate() -> float:
+    return getattr(settings, "SERVER_TIMING_SAMPLE_RATE", 0.0)
+
+
+def should_sample() -> bool:
+    rate = sample_rate()
+    return rate > 0 and (rate >= 1 or random.random() < rate)
+
+
+def current() -> RequestTimings | None:
+    return _current.get()
+
+
+@contextmanager
+def timing_request() -> Iterator[RequestTimings]:
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Add the time spent in this block to the current request's ``name`` phase."""
+
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started)
+
+
+def record_query(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.queries += 1
+        timings.query_seconds += time.perf_counter() - started
+
+
+def track_queries() -> None:
+    """Install ``record_query`` on this thread's connections.
+
+    Like ``connection.execute_wrapper`` but left in place, because under ASGI
+    the queries run on Django's sync thread rather than in the request's
+    context; the wrapper only records while a sampled request is current.
+    """
+
+    for connection in connections.all():
+        if record_query not in connection.execute_wrappers:
+            connection.execute_wrappers.append(record_query)
+
+
+def report(request, response, timings: RequestTimings):
+    total = timings.total()
+    response["Server-Timing"] = timings.header(total)
+    logger.info("server_timing %s", json.dumps(timings.log_record(request, response, total), sort_keys=True))
+    return response
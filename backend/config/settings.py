@@ -130,9 +130,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "config.middleware.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "config.middleware.AsyncWhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -141,6 +142,7 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "config.middleware.AdminContentSecurityPolicyMiddleware",
+    "config.middleware.ReplicaPinMiddleware",
     "analytics.middleware.EnsureSessionIdMiddleware",
     "analytics.middleware.LogLandingPageViewMiddleware",
 ]
@@ -185,10 +187,13 @@ def _absolute_sqlite_path(parsed_url) -> str:
     return os.path.abspath(os.path.join("/", path.lstrip("/")))
 
 
-def database_config_from_env() -> dict:
-    """Return Django DATABASES['default'] configuration from env vars."""
+def database_config_from_env(url: str | None = None) -> dict:
+    """Return Django DATABASES['default'] configuration from env vars.
 
-    url = os.environ.get("DATABASE_URL") or os.environ.get("DJANGO_DATABASE_URL")
+    ``url`` overrides ``DATABASE_URL`` (used for the read replicas).
+    """
+
+    url = url or os.environ.get("DATABASE_URL") or os.environ.get("DJANGO_DATABASE_URL")
     conn_max_age = int(os.environ.get("DJANGO_DB_CONN_MAX_AGE", "600") or "600")
     ssl_required = env_bool("DJANGO_DB_SSL_REQUIRED", default=not DEBUG)
 
@@ -202,8 +207,8 @@ def database_config_from_env() -> dict:
         }
 
     if dj_database_url is not None:
-        parsed_config = dj_database_url.config(
-            default=url or default_sqlite,
+        parsed_config = dj_database_url.parse(
+            url or default_sqlite,
             conn_max_age=conn_max_age,
             ssl_require=ssl_required,
         )
@@ -258,7 +263,62 @@ def database_config_from_env() -> dict:
     return config
 
 
-DATABASES = {"default": database_config_from_env()}
+def replica_configs_from_env() -> dict:
+    """Return ``replica_N`` DATABASES entries for ``DATABASE_REPLICA_URLS``.
+
+    The URLs are comma separated. Tests read replicas through the primary.
+    """
+
+    urls = [url.strip() for url in os.environ.get("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+    return {
+        f"replica_{index}": {**database_config_from_env(url), "TEST": {"MIRROR": "default"}}
+        for index, url in enumerate(urls, start=1)
+    }
+
+
+DATABASES = {"default": database_config_from_env(), **replica_configs_from_env()}
+DATABASE_ROUTERS = ["config.db_router.ReplicaRouter"]
+# How long a client that just wrote keeps reading from the primary.
+DATABASE_REPLICA_PIN_SECONDS = int(os.environ.get("DATABASE_REPLICA_PIN_SECONDS", "15"))
+
+
+def cache_config_from_env() -> dict:
+    """Return Django CACHES['default'] configuration from env vars.
+
+    ``CACHE_URL`` selects the backend: ``locmem://[name]`` (default),
+    ``file:///absolute/path``, ``redis://`` / ``rediss://`` (any Redis-compatible
+    server; needs the ``redis`` package) or ``dummy://``.
+    """
+
+    url = os.environ.get("CACHE_URL") or os.environ.get("DJANGO_CACHE_URL") or "locmem://"
+    timeout = int(os.environ.get("CACHE_DEFAULT_TIMEOUT", "300") or "300")
+    key_prefix = os.environ.get("CACHE_KEY_PREFIX", "bigfive")
+
+    parsed = urlparse(url)
+    scheme = parsed.scheme.lower()
+    config: dict[str, object] = {"TIMEOUT": timeout, "KEY_PREFIX": key_prefix}
+
+    if scheme == "locmem":
+        config["BACKEND"] = "django.core.cache.backends.locmem.LocMemCache"
+        config["LOCATION"] = parsed.netloc or "default"
+    elif scheme == "file":
+        location = unquote(parsed.path)
+        if not location:
+            raise ImproperlyConfigured("CACHE_URL file:// needs an absolute directory path.")
+        config["BACKEND"] = "django.core.cache.backends.filebased.FileBasedCache"
+        config["LOCATION"] = location
+    elif scheme in {"redis", "rediss"}:
+        config["BACKEND"] = "django.core.cache.backends.redis.RedisCache"
+        config["LOCATION"] = url
+    elif scheme == "dummy":
+        config["BACKEND"] = "django.core.cache.backends.dummy.DummyCache"
+    else:
+        raise ImproperlyConfigured(f"Unsupported cache scheme '{parsed.scheme}'.")
+
+    return config
+
+
+CACHES = {"default": cache_config_from_env()}
 
 
 # ---------------------------------------------------------------------------
@@ -345,15 +405,82 @@ X_FRAME_OPTIONS = os.environ.get("DJANGO_X_FRAME_OPTIONS", "DENY")
 # Application-specific constants
 # ---------------------------------------------------------------------------
 NOTE_DETAIL_URL = os.environ.get("NOTE_DETAIL_URL", "https://note.com/your_account/n/xxxxxxxx")
+# Route the hot API and redirect paths to native async views; enable under ASGI (see config/asgi.py).
+ASYNC_VIEWS = env_bool("ASYNC_VIEWS", default=False)
+# Share of requests that get a Server-Timing header and log line (0 = off; see config/server_timing.py).
+SERVER_TIMING_SAMPLE_RATE = float(os.environ.get("SERVER_TIMING_SAMPLE_RATE", "0"))
 
 SURVEY_RESULT_TOKEN_MAX_AGE_SECONDS = int(
     os.environ.get("SURVEY_RESULT_TOKEN_MAX_AGE_SECONDS", "600")
 )
+# Self-contained result tokens; revocations need a cache shared by all processes.
+SURVEY_RESULT_COMPACT_TOKENS = env_bool("SURVEY_RESULT_COMPACT_TOKENS", default=False)
 ANON_SID_MAX_AGE_SECONDS = int(
     os.environ.get("ANON_SID_MAX_AGE_SECONDS", str(60 * 60 * 24 * 10))
 )
+SURVEY_ITEM_CATALOG_TTL_SECONDS = int(os.environ.get("SURVEY_ITEM_CATALOG_TTL_SECONDS", "300"))
+SURVEY_ITEMS_CACHE_MAX_AGE_SECONDS = int(os.environ.get("SURVEY_ITEMS_CACHE_MAX_AGE_SECONDS", "300"))
+SURVEY_BATCH_MAX_SUBMISSIONS = int(os.environ.get("SURVEY_BATCH_MAX_SUBMISSIONS", "5000"))
+SURVEY_BATCH_CREATE_CHUNK_SIZE = int(os.environ.get("SURVEY_BATCH_CREATE_CHUNK_SIZE", "500"))
+# How long each process trusts its copy of a cache namespace version (see config/caching.py).
+CACHE_VERSION_TTL_SECONDS = float(os.environ.get("CACHE_VERSION_TTL_SECONDS", "5"))
+SURVEY_RESULT_CACHE_SIZE = int(os.environ.get("SURVEY_RESULT_CACHE_SIZE", "2048"))
+SURVEY_RESULT_CACHE_TTL_SECONDS = int(os.environ.get("SURVEY_RESULT_CACHE_TTL_SECONDS", "600"))
+SURVEY_RESULT_CACHE_NEGATIVE_TTL_SECONDS = int(
+    os.environ.get("SURVEY_RESULT_CACHE_NEGATIVE_TTL_SECONDS", "60")
+)
+SURVEY_RESULT_CACHE_SHARED = env_bool("SURVEY_RESULT_CACHE_SHARED", default=False)
 SURVEY_RESULT_RETENTION_DAYS = int(os.environ.get("SURVEY_RESULT_RETENTION_DAYS", "90"))
 SURVEY_RESULT_SCRUB_RAW_AFTER_DAYS = int(os.environ.get("SURVEY_RESULT_SCRUB_RAW_AFTER_DAYS", "30"))
+SURVEY_RESULT_PURGE_BATCH_SIZE = int(os.environ.get("SURVEY_RESULT_PURGE_BATCH_SIZE", "1000"))
+SURVEY_RESULT_PURGE_SLEEP_SECONDS = float(os.environ.get("SURVEY_RESULT_PURGE_SLEEP_SECONDS", "0.1"))
+SURVEY_NORMS_ENABLED = env_bool("SURVEY_NORMS_ENABLED", default=False)
+SURVEY_NORMS_MIN_SAMPLES = int(os.environ.get("SURVEY_NORMS_MIN_SAMPLES", "500"))
+# Rolling window in local days for the norms histograms; 0 uses every bucket.
+SURVEY_NORMS_WINDOW_DAYS = int(os.environ.get("SURVEY_NORMS_WINDOW_DAYS", "0"))
+SURVEY_NORMS_TTL_SECONDS = int(os.environ.get("SURVEY_NORMS_TTL_SECONDS", "600"))
+SURVEY_INSIGHTS_CACHE_SIZE = int(os.environ.get("SURVEY_INSIGHTS_CACHE_SIZE", "4096"))
+SURVEY_LEGAL_RELOAD_INTERVAL_SECONDS = int(os.environ.get("SURVEY_LEGAL_RELOAD_INTERVAL_SECONDS", "60"))
+SURVEY_LEGAL_CACHE_MAX_AGE_SECONDS = int(os.environ.get("SURVEY_LEGAL_CACHE_MAX_AGE_SECONDS", "3600"))
+# Rendered landing page bodies are cached per deploy; 0 disables the cache.
+SURVEY_HOME_CACHE_SECONDS = int(os.environ.get("SURVEY_HOME_CACHE_SECONDS", "300"))
+DEPLOY_VERSION = (
+    os.environ.get("DEPLOY_VERSION")
+    or os.environ.get("RENDER_GIT_COMMIT")
+    or os.environ.get("HEROKU_SLUG_COMMIT")
+    or ""
+)
+
+ANALYTICS_WRITE_BEHIND_ENABLED = env_bool("ANALYTICS_WRITE_BEHIND_ENABLED", default=False)
+ANALYTICS_BUFFER_MAX_SIZE = int(os.environ.get("ANALYTICS_BUFFER_MAX_SIZE", "10000"))
+ANALYTICS_BUFFER_FLUSH_SIZE = int(os.environ.get("ANALYTICS_BUFFER_FLUSH_SIZE", "200"))
+ANALYTICS_BUFFER_FLUSH_INTERVAL_SECONDS = float(
+    os.environ.get("ANALYTICS_BUFFER_FLUSH_INTERVAL_SECONDS", "2.0")
+)
+ANALYTICS_BUFFER_OVERFLOW = os.environ.get("ANALYTICS_BUFFER_OVERFLOW", "drop").strip().lower()
+ANALYTICS_BUFFER_BLOCK_TIMEOUT_SECONDS = float(
+    os.environ.get("ANALYTICS_BUFFER_BLOCK_TIMEOUT_SECONDS", "0.5")
+)
+# Page views recorded without write-behind update their daily rollups this often per worker.
+ANALYTICS_ROLLUP_FLUSH_INTERVAL_SECONDS = float(
+    os.environ.get("ANALYTICS_ROLLUP_FLUSH_INTERVAL_SECONDS", "10")
+)
+ANALYTICS_BEACON_MAX_BYTES = int(os.environ.get("ANALYTICS_BEACON_MAX_BYTES", "16384"))
+ANALYTICS_BEACON_MAX_EVENTS = int(os.environ.get("ANALYTICS_BEACON_MAX_EVENTS", "50"))
+ANALYTICS_BEACON_SESSION_MAX_EVENTS = int(os.environ.get("ANALYTICS_BEACON_SESSION_MAX_EVENTS", "500"))
+# Beacon events accepted per client IP and window, whatever anon_sid cookies it sends.
+ANALYTICS_BEACON_IP_MAX_EVENTS = int(os.environ.get("ANALYTICS_BEACON_IP_MAX_EVENTS", "2000"))
+ANALYTICS_BEACON_SESSION_WINDOW_SECONDS = int(
+    os.environ.get("ANALYTICS_BEACON_SESSION_WINDOW_SECONDS", "3600")
+)
+# Raw PageView/EventLog retention; 0 keeps rows forever. Daily rollups are not affected.
+ANALYTICS_RETENTION_DAYS = int(os.environ.get("ANALYTICS_RETENTION_DAYS", "0"))
+ANALYTICS_RETENTION_CHUNK_SIZE = int(os.environ.get("ANALYTICS_RETENTION_CHUNK_SIZE", "5000"))
+ANALYTICS_PARTITION_MONTHS = int(os.environ.get("ANALYTICS_PARTITION_MONTHS", "1"))
+ANALYTICS_PARTITION_PREMAKE = int(os.environ.get("ANALYTICS_PARTITION_PREMAKE", "3"))
+
+ADMIN_COUNT_ESTIMATE_THRESHOLD = int(os.environ.get("ADMIN_COUNT_ESTIMATE_THRESHOLD", "10000"))
+ADMIN_FILTER_CACHE_SECONDS = int(os.environ.get("ADMIN_FILTER_CACHE_SECONDS", "300"))
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -8,7 +8,10 @@ from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 from django.templatetags.static import static
 
+from config.admin_scaling import ScalableAdminMixin, month_list_filter, uuid_search_bounds
+
 from .models import PersonalityItem, SurveyResult
+from .result_cache import invalidate_results
 
 
 @admin.register(PersonalityItem)
@@ -20,7 +23,7 @@ class PersonalityItemAdmin(admin.ModelAdmin):
 
 
 @admin.register(SurveyResult)
-class SurveyResultAdmin(admin.ModelAdmin):
+class SurveyResultAdmin(ScalableAdminMixin, admin.ModelAdmin):
     list_display = (
         "uuid",
         "memo",
@@ -65,15 +68,36 @@ class SurveyResultAdmin(admin.ModelAdmin):
         "raw_scores",
     )
     ordering = ("-created_at",)
-    list_filter = ("created_at",)
-    search_fields = ("uuid", "memo")
+    keyset_field = "created_at"
+    list_filter = ("created_at", month_list_filter("created_at"))
+    search_fields = ("memo",)
+    search_help_text = "UUID（先頭8文字以上）またはメモで検索"
     actions = ("scrub_raw_scores",)
 
+    def get_search_results(self, request, queryset, search_term):
+        # UUIDs are matched as a primary-key range instead of icontains on a cast column.
+        bounds = uuid_search_bounds(search_term.strip())
+        if bounds is not None:
+            return queryset.filter(pk__gte=bounds[0], pk__lte=bounds[1]), False
+        return super().get_search_results(request, queryset, search_term)
+
     @admin.action(description="生回答（raw_scores）を削除する")
     def scrub_raw_scores(self, request, queryset):
-        updated = queryset.exclude(raw_scores={}).update(raw_scores={})
+        targets = queryset.with_answers()
+        pks = list(targets.values_list("pk", flat=True))
+        updated = targets.scrub_answers()
+        invalidate_results(pks)
         self.message_user(request, f"{updated}件の結果からraw_scoresを削除しました。")
 
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        invalidate_results([obj.pk])
+
+    def delete_queryset(self, request, queryset):
+        pks = list(queryset.values_list("pk", flat=True))
+        super().delete_queryset(request, queryset)
+        invalidate_results(pks)
+
     def radar_chart(self, obj: SurveyResult) -> str:
         """Render a small radar chart for scaled scores."""
 
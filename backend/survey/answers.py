@@ -0,0 +1,116 @@
+"""Compact storage of raw survey answers.
+
+Answers are stored as 3-bit slots packed into ``SurveyResult.packed_answers``
+(19 bytes for the 50-item bank instead of ~400 bytes of JSON). The slot order
+is an ``AnswerLayout`` row: the item codes of the catalog the result was
+scored against, in display order. ``0`` marks an unanswered slot, so one
+layout also covers partial submissions. A scrubbed result has an empty blob
+and no layout.
+
+Layout rows are immutable and cached per process once their transaction has
+committed, so packing and unpacking normally need no queries.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+from typing import Mapping, Sequence
+
+from django.db import transaction
+
+BITS = 3
+UNANSWERED = 0
+MAX_VALUE = (1 << BITS) - 1
+
+_lock = threading.Lock()
+_layout_ids: dict[tuple[str, ...], int] = {}
+_layout_codes: dict[int, tuple[str, ...]] = {}
+
+
+def pack(values: Sequence[int]) -> bytes:
+    """Pack answers (``0`` for unanswered) into ``BITS`` bits per slot."""
+
+    number = 0
+    for slot, value in enumerate(values):
+        if not UNANSWERED <= value <= MAX_VALUE:
+            raise ValueError(f"Answer {value!r} does not fit in {BITS} bits.")
+        number |= value << (slot * BITS)
+    return number.to_bytes((len(values) * BITS + 7) // 8, "little")
+
+
+def unpack(blob: bytes, count: int) -> list[int]:
+    """Return ``count`` slot values from a packed blob."""
+
+    number = int.from_bytes(bytes(blob), "little")
+    return [(number >> (slot * BITS)) & MAX_VALUE for slot in range(count)]
+
+
+def layout_fingerprint(codes: Sequence[str]) -> str:
+    return hashlib.sha256("\n".join(codes).encode("utf-8")).hexdigest()[:16]
+
+
+def _remember(layout_id: int, codes: tuple[str, ...]) -> None:
+    with _lock:
+        _layout_ids[codes] = layout_id
+        _layout_codes[layout_id] = codes
+
+
+def layout_id_for(codes: Sequence[str]) -> int:
+    """Return the ``AnswerLayout`` id for ``codes``, creating the row if needed."""
+
+    codes = tuple(codes)
+    layout_id = _layout_ids.get(codes)
+    if layout_id is not None:
+        return layout_id
+
+    from .models import AnswerLayout
+
+    layout, _ = AnswerLayout.objects.get_or_create(
+        fingerprint=layout_fingerprint(codes),
+        defaults={"codes": list(codes)},
+    )
+    # A layout created in a transaction that rolls back must not be cached.
+    transaction.on_commit(lambda: _remember(layout.pk, codes))
+    return layout.pk
+
+
+def layout_codes(layout_id: int) -> tuple[str, ...]:
+    codes = _layout_codes.get(layout_id)
+    if codes is not None:
+        return codes
+
+    from .models import AnswerLayout
+
+    codes = tuple(AnswerLayout.objects.values_list("codes", flat=True).get(pk=layout_id))
+    transaction.on_commit(lambda: _remember(layout_id, codes))
+    return codes
+
+
+def encode(answers: Mapping[str, int], codes: Sequence[str] | None = None) -> tuple[int | None, bytes]:
+    """Return ``(layout id, blob)`` for a code -> answer mapping.
+
+    ``codes`` fixes the slot order (normally the catalog's codes); it defaults
+    to the mapping's own order. An empty mapping encodes as scrubbed.
+    """
+
+    if not answers:
+        return None, b""
+    if codes is None or not set(answers) <= set(codes):
+        codes = tuple(answers)
+    values = [int(answers.get(code, UNANSWERED)) for code in codes]
+    return layout_id_for(codes), pack(values)
+
+
+def decode(layout_id: int | None, blob: bytes) -> dict[str, int]:
+    """Return the code -> answer mapping for stored answers."""
+
+    if layout_id is None or not blob:
+        return {}
+    codes = layout_codes(layout_id)
+    return {code: value for code, value in zip(codes, unpack(blob, len(codes))) if value != UNANSWERED}
+
+
+def clear_layout_cache() -> None:
+    with _lock:
+        _layout_ids.clear()
+        _layout_codes.clear()
@@ -0,0 +1,137 @@
+"""Native async versions of the hot API views, routed when ``ASYNC_VIEWS`` is on.
+
+Under ASGI a sync view runs on Django's single sync thread, so one stalled
+query holds up every other sync request in the worker. These views stay on
+the event loop: shared cache lookups use the async cache API, compact tokens
+never leave it, result reads go through the async ORM, and only result
+creation, which needs a transaction, runs in a thread via ``sync_to_async``. Responses are rendered with DRF's
+``JSONRenderer`` so clients get the same bytes as from the sync views.
+"""
+from __future__ import annotations
+
+import json
+
+from asgiref.sync import sync_to_async
+from django.db import DEFAULT_DB_ALIAS
+from django.http import HttpResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+from rest_framework.renderers import JSONRenderer
+
+from config import server_timing
+from config.db_router import pin_after_write, replica_aliases, replica_reads
+from survey import result_cache
+from survey.catalog import aget_catalog
+from survey.http import etag_matches, not_modified
+from survey.models import SurveyResult
+from survey.norms import aget_norms
+from survey.services import create_survey_result
+from survey.tokens import TokenClaims, ais_revoked, issue_token
+
+from .serializers import SurveyScoreRequestSerializer, build_result_payload
+from .views import (
+    RESULT_CACHE_CONTROL,
+    aitems_variants,
+    check_result_token,
+    items_response,
+    result_etag,
+    token_is_fresh,
+)
+
+
+def _json(data, status_code: int = status.HTTP_200_OK) -> HttpResponse:
+    return HttpResponse(JSONRenderer().render(data), status=status_code, content_type="application/json")
+
+
+class AsyncPersonalityItemListView(View):
+    """Async ``PersonalityItemListView``."""
+
+    async def get(self, request, *args, **kwargs):
+        catalog = await aget_catalog()
+        return items_response(request, catalog, await aitems_variants(catalog))
+
+
+# DRF views are CSRF exempt for anonymous clients; keep that contract.
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncSurveyScoreView(View):
+    """Async ``SurveyScoreView``."""
+
+    async def post(self, request, *args, **kwargs):
+        try:
+            data = json.loads(request.body or b"null")
+        except (ValueError, UnicodeDecodeError) as exc:
+            return _json({"detail": f"JSON parse error - {exc}"}, status.HTTP_400_BAD_REQUEST)
+
+        items = await aget_catalog()
+        serializer = SurveyScoreRequestSerializer(data=data, context={"items": items})
+        with server_timing.phase("validate"):
+            valid = serializer.is_valid()
+        if not valid:
+            return _json(serializer.errors, status.HTTP_400_BAD_REQUEST)
+
+        validated = serializer.validated_data
+        result = await sync_to_async(create_survey_result)(items, validated["responses"], computed=validated["scores"])
+        pin_after_write(request)
+        norms = await aget_norms()
+        payload = build_result_payload(result.pk, result.created_at, result.trait_sum_map, norms)
+        await result_cache.astore_payload(result.pk, payload, norms.version if norms is not None else "")
+        return _json({**payload, "token": issue_token(result)}, status.HTTP_201_CREATED)
+
+
+async def _apayload_without_query(pk, claims: TokenClaims, norms_stamp: str, norms):
+    """Async ``payload_without_query``."""
+
+    payload = await result_cache.aget_payload(pk, norms_stamp)
+    if payload is None and claims.is_compact and not await ais_revoked(pk):
+        payload = build_result_payload(claims.pk, claims.created_at, claims.trait_sums, norms)
+    return payload
+
+
+async def _aload_result(pk, claims: TokenClaims) -> SurveyResult | None:
+    fresh = token_is_fresh(claims)
+    try:
+        with replica_reads(pinned=fresh):
+            return await SurveyResult.objects.aget(pk=pk)
+    except SurveyResult.DoesNotExist:
+        if fresh or not replica_aliases():
+            return None
+    # A valid token means the row was written; the replica may lag behind.
+    try:
+        return await SurveyResult.objects.using(DEFAULT_DB_ALIAS).aget(pk=pk)
+    except SurveyResult.DoesNotExist:
+        return None
+
+
+class AsyncSurveyResultDetailView(View):
+    """Async ``SurveyResultDetailView``."""
+
+    async def get(self, request, pk, *args, **kwargs):
+        claims, refusal = check_result_token(request, pk)
+        if refusal is not None:
+            return _json({"detail": refusal}, status.HTTP_403_FORBIDDEN)
+
+        norms = await aget_norms()
+        version = norms.version if norms is not None else ""
+        etag = result_etag(pk, await aget_catalog(), version)
+        if etag_matches(request, etag):
+            return not_modified(etag, RESULT_CACHE_CONTROL)
+
+        payload = await _apayload_without_query(pk, claims, version, norms)
+        if payload is None:
+            result = await _aload_result(pk, claims)
+            if result is None:
+                result_cache.remember_missing(pk)
+                payload = result_cache.MISSING
+            else:
+                payload = build_result_payload(result.pk, result.created_at, result.trait_sum_map, norms)
+                await result_cache.astore_payload(pk, payload, version)
+
+        if payload is result_cache.MISSING:
+            return _json({"detail": NotFound.default_detail}, status.HTTP_404_NOT_FOUND)
+        response = _json(payload)
+        response["ETag"] = etag
+        response["Cache-Control"] = RESULT_CACHE_CONTROL
+        return response
@@ -1,15 +1,17 @@
 """Serializers for the survey REST API."""
 from __future__ import annotations
 
+from django.conf import settings
 from rest_framework import serializers
+from rest_framework.exceptions import ErrorDetail
 
+from config import server_timing
+from survey.catalog import get_catalog, scoring_plan_for
 from survey.constants import MAX_SCORE, MIN_SCORE
 from survey.models import PersonalityItem
-from survey.services import SurveyScoringError, compute_trait_scores
-from survey.insights import (
-    serialize_highlights,
-    serialize_trait_displays,
-)
+from survey.norms import get_norms
+from survey.services import MAX_ANSWER, MIN_ANSWER, SurveyResponseError, SurveyScoringError
+from survey.insights import serialize_insights
 
 
 class PersonalityItemSerializer(serializers.ModelSerializer):
@@ -22,50 +24,123 @@ class PersonalityItemSerializer(serializers.ModelSerializer):
         fields = ("code", "text", "trait", "is_reversed", "order")
 
 
+class ResponseMapField(serializers.DictField):
+    """Dict of item code to answer whose values are checked by the scoring plan.
+
+    Per-answer validation happens in ``ScoringPlan.score`` so the 50 answers are
+    coerced and scored in one pass instead of through 50 child fields.
+    """
+
+    answer_field = serializers.IntegerField(min_value=MIN_ANSWER, max_value=MAX_ANSWER)
+
+    def to_internal_value(self, data):
+        if not isinstance(data, dict):
+            self.fail("not_a_dict", input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail("empty")
+        return data
+
+    def answer_error(self, error_code: str) -> ErrorDetail:
+        message = str(self.answer_field.error_messages[error_code])
+        return ErrorDetail(message.format(min_value=MIN_ANSWER, max_value=MAX_ANSWER), code=error_code)
+
+
 class SurveyScoreRequestSerializer(serializers.Serializer):
-    """Validate the payload sent when scoring a survey."""
+    """Validate the payload sent when scoring a survey.
 
-    responses = serializers.DictField(
-        child=serializers.IntegerField(min_value=1, max_value=5),
-        allow_empty=False,
-    )
+    ``validated_data["scores"]`` carries the ``ComputedScores`` produced while
+    validating, ready to be persisted without scoring again.
+    """
+
+    responses = ResponseMapField(allow_empty=False)
 
     def validate(self, attrs: dict) -> dict:
         items = self.context.get("items")
         if items is None:
-            raise AssertionError("API misconfigured without items in context.")
+            items = get_catalog()
+
+        try:
+            with server_timing.phase("score"):
+                attrs["scores"] = scoring_plan_for(items).score(attrs["responses"])
+        except SurveyResponseError as exc:
+            raise serializers.ValidationError({"responses": _response_errors(exc)}) from exc
+        except SurveyScoringError as exc:
+            raise serializers.ValidationError({"responses": [str(exc)]}) from exc
+
+        attrs["responses"] = attrs["scores"].raw_scores
+        return attrs
+
+
+class SurveyBatchScoreRequestSerializer(serializers.Serializer):
+    """Validate a batch of response maps, collecting errors per row.
 
-        item_codes = [item.code for item in items]
-        responses = attrs["responses"]
+    Only the envelope can fail the whole request. ``validated_data["outcomes"]``
+    holds, for every submission, either its ``ComputedScores`` or the error
+    detail the single-submission endpoint would have returned.
+    """
 
-        missing = [code for code in item_codes if code not in responses]
-        if missing:
-            raise serializers.ValidationError(
-                {"responses": [f"回答が不足しています: {', '.join(missing)}"]}
-            )
+    submissions = serializers.ListField(allow_empty=False)
 
-        extra = sorted(set(responses.keys()) - set(item_codes))
-        if extra:
-            raise serializers.ValidationError(
-                {"responses": [f"不要な設問コードが含まれています: {', '.join(extra)}"]}
-            )
+    def validate_submissions(self, value: list) -> list:
+        limit = getattr(settings, "SURVEY_BATCH_MAX_SUBMISSIONS", 5000)
+        if len(value) > limit:
+            raise serializers.ValidationError(f"一度に送信できる回答は{limit}件までです。")
+        return value
 
+    def validate(self, attrs: dict) -> dict:
+        items = self.context.get("items")
+        if items is None:
+            items = get_catalog()
         try:
-            compute_trait_scores(items, responses)
+            plan = scoring_plan_for(items)
         except SurveyScoringError as exc:
-            raise serializers.ValidationError({"responses": [str(exc)]}) from exc
-
+            raise serializers.ValidationError({"submissions": [str(exc)]}) from exc
+
+        field = ResponseMapField(allow_empty=False)
+        outcomes: list[object] = []
+        candidates: list[dict] = []
+        positions: list[int] = []
+        for position, responses in enumerate(attrs["submissions"]):
+            try:
+                candidates.append(field.run_validation(responses))
+            except serializers.ValidationError as exc:
+                outcomes.append({"responses": exc.detail})
+            else:
+                outcomes.append(None)
+                positions.append(position)
+
+        for position, outcome in zip(positions, plan.score_many(candidates)):
+            if isinstance(outcome, SurveyResponseError):
+                outcome = {"responses": _response_errors(outcome)}
+            outcomes[position] = outcome
+
+        attrs["outcomes"] = outcomes
         return attrs
 
 
+def _response_errors(exc: SurveyResponseError):
+    if exc.invalid:
+        field = ResponseMapField()
+        return {code: [field.answer_error(error)] for code, error in exc.invalid.items()}
+    if exc.missing:
+        return [f"回答が不足しています: {', '.join(exc.missing)}"]
+    return [f"不要な設問コードが含まれています: {', '.join(exc.extra)}"]
+
+
 def serialize_result_payload(result) -> dict[str, object]:
     """Build the API payload shared by score and detail endpoints."""
-    rows, highlights = serialize_trait_displays(result.trait_sum_map)
+    return build_result_payload(result.pk, result.created_at, result.trait_sum_map, get_norms())
+
+
+def build_result_payload(pk, created_at, trait_sums: dict[str, int], norms) -> dict[str, object]:
+    """Build the result payload from the only fields it depends on."""
+    with server_timing.phase("insights"):
+        rows, highlights = serialize_insights(trait_sums, norms)
     return {
-        "id": str(result.pk),
-        "created_at": result.created_at.isoformat(),
+        "id": str(pk),
+        "created_at": created_at.isoformat(),
         "trait_scores": rows,
         "raw_range": {"min": MIN_SCORE, "max": MAX_SCORE},
         "scaled_range": {"min": 0, "max": 100},
-        "highlights": serialize_highlights(highlights),
+        "highlights": highlights,
     }
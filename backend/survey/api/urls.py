@@ -1,14 +1,29 @@
 """URL configuration for the survey REST API."""
 from __future__ import annotations
 
+from django.conf import settings
 from django.urls import path
 
-from .views import PersonalityItemListView, SurveyResultDetailView, SurveyScoreView
+from .async_views import AsyncPersonalityItemListView, AsyncSurveyResultDetailView, AsyncSurveyScoreView
+from .views import (
+    PersonalityItemListView,
+    SurveyBatchScoreView,
+    SurveyResultDetailView,
+    SurveyScoreView,
+)
 
 app_name = "survey_api"
 
+# Under ASGI the hot paths run as native async views (see ``async_views``).
+ASYNC_VIEWS = getattr(settings, "ASYNC_VIEWS", False)
+
 urlpatterns = [
-    path("items/", PersonalityItemListView.as_view(), name="items"),
-    path("score/", SurveyScoreView.as_view(), name="score"),
-    path("results/<uuid:pk>/", SurveyResultDetailView.as_view(), name="result-detail"),
+    path("items/", (AsyncPersonalityItemListView if ASYNC_VIEWS else PersonalityItemListView).as_view(), name="items"),
+    path("score/", (AsyncSurveyScoreView if ASYNC_VIEWS else SurveyScoreView).as_view(), name="score"),
+    path("score/batch/", SurveyBatchScoreView.as_view(), name="score-batch"),
+    path(
+        "results/<uuid:pk>/",
+        (AsyncSurveyResultDetailView if ASYNC_VIEWS else SurveyResultDetailView).as_view(),
+        name="result-detail",
+    ),
 ]
@@ -1,31 +1,108 @@
 """REST API views for the survey application."""
 from __future__ import annotations
 
+import time
+
 from django.conf import settings
-from django.core.signing import BadSignature, SignatureExpired, TimestampSigner
-from rest_framework import generics, permissions, status
+from django.core.signing import BadSignature, SignatureExpired
+from django.db import DEFAULT_DB_ALIAS
+from django.http import Http404
+from django.utils.cache import patch_vary_headers
+from django.views import View
+from rest_framework import permissions, status
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from survey.models import PersonalityItem, SurveyResult
-from survey.services import create_survey_result
+from config import server_timing
+from config.caching import NamespacedCache
+from config.db_router import pin_after_write, pin_seconds, replica_aliases, replica_reads
+
+from survey import result_cache
+from survey.catalog import ItemCatalog, get_catalog
+from survey.http import encode_variants, encoded_response, etag_matches, make_etag, negotiate_encoding, not_modified
+from survey.insights import INSIGHTS_VERSION
+from survey.models import SurveyResult
+from survey.norms import get_norms, norms_version
+from survey.services import ComputedScores, bulk_create_survey_results, create_survey_result
+from survey.tokens import TokenClaims, is_revoked, issue_token, read_token
 
 from .serializers import (
     PersonalityItemSerializer,
+    SurveyBatchScoreRequestSerializer,
     SurveyScoreRequestSerializer,
+    build_result_payload,
     serialize_result_payload,
 )
 
 
-class PersonalityItemListView(generics.ListAPIView):
-    """Return all registered personality items in display order."""
+def _items_cache_control() -> str:
+    return f"public, max-age={getattr(settings, 'SURVEY_ITEMS_CACHE_MAX_AGE_SECONDS', 300)}"
+
+
+# Results are served only with a valid token, so browsers must revalidate.
+RESULT_CACHE_CONTROL = "private, no-cache"
+
+
+# (catalog fingerprint, body keyed by content coding) for the items endpoint.
+_items_body: tuple[str, dict[str, bytes]] | None = None
+items_cache = NamespacedCache("items")
+
+
+def _render_items(catalog: ItemCatalog) -> dict[str, bytes]:
+    data = PersonalityItemSerializer(catalog.items, many=True).data
+    return encode_variants(JSONRenderer().render(data))
+
+
+def items_variants(catalog: ItemCatalog) -> dict[str, bytes]:
+    global _items_body
+
+    cached = _items_body
+    if cached is None or cached[0] != catalog.fingerprint:
+        # Other workers may already have rendered this catalog version.
+        variants = items_cache.get_or_set(catalog.fingerprint, lambda: _render_items(catalog), timeout=None)
+        cached = (catalog.fingerprint, variants)
+        _items_body = cached
+    return cached[1]
 
-    queryset = PersonalityItem.objects.order_by("order")
-    serializer_class = PersonalityItemSerializer
-    permission_classes = [permissions.AllowAny]
 
+async def aitems_variants(catalog: ItemCatalog) -> dict[str, bytes]:
+    global _items_body
 
-signer = TimestampSigner(salt="survey.result")
+    cached = _items_body
+    if cached is None or cached[0] != catalog.fingerprint:
+        variants = await items_cache.aget_or_set(catalog.fingerprint, lambda: _render_items(catalog), timeout=None)
+        cached = (catalog.fingerprint, variants)
+        _items_body = cached
+    return cached[1]
+
+
+def items_response(request, catalog: ItemCatalog, variants: dict[str, bytes]):
+    encoding = negotiate_encoding(request, variants)
+    etag = make_etag("items", catalog.fingerprint, encoding)
+    if etag_matches(request, etag):
+        response = not_modified(etag, _items_cache_control())
+        patch_vary_headers(response, ("Accept-Encoding",))
+        return response
+    return encoded_response(
+        variants,
+        encoding,
+        content_type="application/json",
+        etag=etag,
+        cache_control=_items_cache_control(),
+    )
+
+
+class PersonalityItemListView(View):
+    """Return all registered personality items in display order.
+
+    The JSON body and its compressed variants are rendered once per catalog
+    snapshot and then served as bytes, without DRF's request handling.
+    """
+
+    def get(self, request, *args, **kwargs):
+        catalog = get_catalog()
+        return items_response(request, catalog, items_variants(catalog))
 
 
 class SurveyScoreView(APIView):
@@ -34,52 +111,144 @@ class SurveyScoreView(APIView):
     permission_classes = [permissions.AllowAny]
 
     def post(self, request, *args, **kwargs):
-        items = list(PersonalityItem.objects.order_by("order"))
+        items = get_catalog()
         serializer = SurveyScoreRequestSerializer(
             data=request.data,
             context={"items": items},
         )
-        serializer.is_valid(raise_exception=True)
+        with server_timing.phase("validate"):
+            serializer.is_valid(raise_exception=True)
 
-        result = create_survey_result(items, serializer.validated_data["responses"])
+        validated = serializer.validated_data
+        result = create_survey_result(items, validated["responses"], computed=validated["scores"])
+        pin_after_write(request)
         payload = serialize_result_payload(result)
-        payload["token"] = signer.sign(str(result.pk))
+        result_cache.store_payload(result.pk, payload, norms_version())
+        payload = {**payload, "token": issue_token(result)}
         return Response(payload, status=status.HTTP_201_CREATED)
 
 
+class SurveyBatchScoreView(APIView):
+    """Score and persist many submissions at once (paper and kiosk imports).
+
+    Invalid rows are reported alongside the created ones instead of failing the
+    whole batch. Staff only: every row is stored and feeds the norms.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def post(self, request, *args, **kwargs):
+        serializer = SurveyBatchScoreRequestSerializer(
+            data=request.data,
+            context={"items": get_catalog()},
+        )
+        serializer.is_valid(raise_exception=True)
+        outcomes = serializer.validated_data["outcomes"]
+
+        scored = [(index, item) for index, item in enumerate(outcomes) if isinstance(item, ComputedScores)]
+        created = bulk_create_survey_results(
+            [scores for _, scores in scored],
+            chunk_size=getattr(settings, "SURVEY_BATCH_CREATE_CHUNK_SIZE", 500),
+        )
+        pin_after_write(request)
+
+        created_by_index = {index: result for (index, _), result in zip(scored, created)}
+        rows: list[dict[str, object]] = []
+        for index, outcome in enumerate(outcomes):
+            result = created_by_index.get(index)
+            if result is None:
+                rows.append({"index": index, "errors": outcome})
+            else:
+                rows.append({"index": index, "id": str(result.pk), "token": issue_token(result)})
+
+        payload = {"created": len(created), "failed": len(outcomes) - len(created), "results": rows}
+        response_status = status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST
+        return Response(payload, status=response_status)
+
+
+def check_result_token(request, pk) -> tuple[TokenClaims | None, str | None]:
+    """Return the claims of the request's result token, or the reason it is refused."""
+
+    token = request.headers.get("X-Result-Token")
+    if not token:
+        return None, "結果を表示するにはトークンが必要です。"
+    try:
+        claims = read_token(token)
+    except SignatureExpired:
+        return None, "この結果リンクの有効期限が切れています。"
+    except BadSignature:
+        return None, "無効なトークンです。"
+    if str(pk) != claims.pk:
+        return None, "トークンが結果IDと一致しません。"
+    return claims, None
+
+
+def result_etag(pk, catalog: ItemCatalog, norms_stamp: str) -> str:
+    return make_etag("result", pk, catalog.fingerprint, INSIGHTS_VERSION, norms_stamp)
+
+
+def payload_without_query(pk, claims: TokenClaims, norms_stamp: str, norms):
+    """Return the payload from the result cache or a compact token, ``MISSING`` or ``None``."""
+
+    payload = result_cache.get_payload(pk, norms_stamp)
+    if payload is None and claims.is_compact and not is_revoked(pk):
+        # Everything the payload shows is in the signed token.
+        payload = build_result_payload(claims.pk, claims.created_at, claims.trait_sums, norms)
+    return payload
+
+
+def token_is_fresh(claims: TokenClaims) -> bool:
+    """Whether the token was issued recently enough that replicas may lag behind it."""
+
+    return claims.issued_at is not None and time.time() - claims.issued_at < pin_seconds()
+
+
+def _load_result(pk, claims) -> SurveyResult | None:
+    """Read a result from a replica, or the primary for freshly issued tokens."""
+
+    fresh = token_is_fresh(claims)
+    try:
+        with replica_reads(pinned=fresh):
+            return SurveyResult.objects.get(pk=pk)
+    except SurveyResult.DoesNotExist:
+        if fresh or not replica_aliases():
+            return None
+    # A valid token means the row was written; the replica may lag behind.
+    try:
+        return SurveyResult.objects.using(DEFAULT_DB_ALIAS).get(pk=pk)
+    except SurveyResult.DoesNotExist:
+        return None
+
+
 class SurveyResultDetailView(APIView):
     """Return a previously computed survey result."""
 
     permission_classes = [permissions.AllowAny]
 
     def get(self, request, pk: str, *args, **kwargs):
-        # token = request.query_params.get("token")
-        token = request.headers.get("X-Result-Token")
-        if not token:
-            return Response(
-                {"detail": "結果を表示するにはトークンが必要です。"},
-                status=status.HTTP_403_FORBIDDEN,
-            )
-
-        try:
-            unsigned = signer.unsign(token, max_age=getattr(settings, "SURVEY_RESULT_TOKEN_MAX_AGE_SECONDS", 600))
-        except SignatureExpired:
-            return Response(
-                {"detail": "この結果リンクの有効期限が切れています。"},
-                status=status.HTTP_403_FORBIDDEN,
-            )
-        except BadSignature:
-            return Response(
-                {"detail": "無効なトークンです。"},
-                status=status.HTTP_403_FORBIDDEN,
-            )
-
-        if str(pk) != str(unsigned):
-            return Response(
-                {"detail": "トークンが結果IDと一致しません。"},
-                status=status.HTTP_403_FORBIDDEN,
-            )
-
-        result = generics.get_object_or_404(SurveyResult, pk=pk)
-        payload = serialize_result_payload(result)
-        return Response(payload, status=status.HTTP_200_OK)
\ No newline at end of file
+        claims, refusal = check_result_token(request, pk)
+        if refusal is not None:
+            return Response({"detail": refusal}, status=status.HTTP_403_FORBIDDEN)
+
+        norms = get_norms()
+        version = norms.version if norms is not None else ""
+        etag = result_etag(pk, get_catalog(), version)
+        if etag_matches(request, etag):
+            return not_modified(etag, RESULT_CACHE_CONTROL)
+
+        payload = payload_without_query(pk, claims, version, norms)
+        if payload is None:
+            result = _load_result(pk, claims)
+            if result is None:
+                result_cache.remember_missing(pk)
+                payload = result_cache.MISSING
+            else:
+                payload = build_result_payload(result.pk, result.created_at, result.trait_sum_map, norms)
+                result_cache.store_payload(pk, payload, version)
+
+        if payload is result_cache.MISSING:
+            raise Http404
+        response = Response(payload, status=status.HTTP_200_OK)
+        response["ETag"] = etag
+        response["Cache-Control"] = RESULT_CACHE_CONTROL
+        return response
\ No newline at end of file
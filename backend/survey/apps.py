@@ -5,3 +5,7 @@ class SurveyConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "survey"
     verbose_name = "パーソナリティ診断"
+
+    def ready(self) -> None:
+        # Connect the catalog invalidation signal receivers.
+        from . import catalog  # noqa: F401
@@ -0,0 +1,169 @@
+"""Per-worker cache of the personality item bank.
+
+The 50-item questionnaire almost never changes, so every worker keeps an
+immutable snapshot of it in memory instead of querying ``PersonalityItem`` on
+each request. Saving or deleting an item bumps a version stamp through model
+signals so the next read reloads the snapshot; a TTL bounds how long other
+workers may keep serving an outdated snapshot after an admin edit.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Iterable, Iterator, NamedTuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from config.db_router import replica_reads
+
+from .models import PersonalityItem
+from .services import ScoringPlan
+
+
+class CatalogItem(NamedTuple):
+    """Read-only snapshot of a single ``PersonalityItem`` row."""
+
+    code: str
+    text_ja: str
+    trait: str
+    is_reversed: bool
+    order: int
+
+
+@dataclass(frozen=True)
+class ItemCatalog:
+    """Immutable snapshot of the item bank in display order."""
+
+    items: tuple[CatalogItem, ...]
+    version: int
+    fingerprint: str
+    loaded_at: float
+
+    def __iter__(self) -> Iterator[CatalogItem]:
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @property
+    def codes(self) -> tuple[str, ...]:
+        return tuple(item.code for item in self.items)
+
+    @cached_property
+    def plan(self) -> ScoringPlan:
+        """Scoring plan compiled once per catalog snapshot."""
+        return ScoringPlan.compile(self.items)
+
+
+_lock = threading.Lock()
+_catalog: ItemCatalog | None = None
+_version = 0
+_stats = {"hits": 0, "misses": 0, "reloads": 0}
+
+
+def _ttl_seconds() -> float:
+    return float(getattr(settings, "SURVEY_ITEM_CATALOG_TTL_SECONDS", 300) or 0)
+
+
+def _fingerprint(items: tuple[CatalogItem, ...]) -> str:
+    digest = hashlib.sha256()
+    for item in items:
+        digest.update(repr(tuple(item)).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def _is_fresh(catalog: ItemCatalog | None) -> bool:
+    if catalog is None or catalog.version != _version:
+        return False
+    ttl = _ttl_seconds()
+    return not ttl or time.monotonic() - catalog.loaded_at < ttl
+
+
+def _load(version: int) -> ItemCatalog:
+    rows = PersonalityItem.objects.order_by("order").values_list(
+        "code", "text_ja", "trait", "is_reversed", "order"
+    )
+    items = tuple(CatalogItem(*row) for row in rows)
+    return ItemCatalog(
+        items=items,
+        version=version,
+        fingerprint=_fingerprint(items),
+        loaded_at=time.monotonic(),
+    )
+
+
+def get_catalog() -> ItemCatalog:
+    """Return the current item catalog, loading it on first use or after a change."""
+
+    global _catalog
+
+    catalog = _catalog
+    if _is_fresh(catalog):
+        _stats["hits"] += 1
+        return catalog
+
+    with _lock:
+        catalog = _catalog
+        if _is_fresh(catalog):
+            _stats["hits"] += 1
+            return catalog
+        _stats["misses" if catalog is None else "reloads"] += 1
+        # After an edit in this process read the primary; replicas may lag behind.
+        with replica_reads(pinned=catalog is not None and catalog.version != _version):
+            catalog = _load(_version)
+        _catalog = catalog
+        return catalog
+
+
+async def aget_catalog() -> ItemCatalog:
+    """``get_catalog`` for async views: only a reload leaves the event loop."""
+
+    catalog = _catalog
+    if _is_fresh(catalog):
+        _stats["hits"] += 1
+        return catalog
+    return await sync_to_async(get_catalog)()
+
+
+def scoring_plan_for(items: Iterable[PersonalityItem] | ItemCatalog) -> ScoringPlan:
+    """Return the compiled plan for ``items``, reusing the catalog's copy."""
+
+    if isinstance(items, ItemCatalog):
+        return items.plan
+    return ScoringPlan.compile(items)
+
+
+def invalidate_catalog() -> None:
+    """Force the next ``get_catalog`` call to reload from the database.
+
+    Model signals cover admin edits and fixtures, but ``bulk_create`` and
+    queryset ``update`` bypass them, so callers doing bulk writes must invalidate
+    explicitly.
+    """
+
+    global _version
+    with _lock:
+        _version += 1
+
+
+def catalog_stats() -> dict[str, int]:
+    """Return hit/miss/reload counters and the current version stamp."""
+
+    catalog = _catalog
+    return {
+        **_stats,
+        "version": _version,
+        "items": len(catalog) if catalog is not None else 0,
+    }
+
+
+@receiver(post_save, sender=PersonalityItem, dispatch_uid="survey.catalog.item_saved")
+@receiver(post_delete, sender=PersonalityItem, dispatch_uid="survey.catalog.item_deleted")
+def _bump_catalog_version(sender, **kwargs) -> None:
+    invalidate_catalog()
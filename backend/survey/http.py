@@ -0,0 +1,130 @@
+"""HTTP helpers for validator-based conditional and precompressed responses."""
+from __future__ import annotations
+
+import gzip
+import hashlib
+
+from django.http import HttpRequest, HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+# Bodies smaller than this gain nothing from compression.
+COMPRESS_MIN_BYTES = 256
+# Preferred first when the client accepts several codings with equal weight.
+_ENCODING_PREFERENCE = ("br", "gzip", "identity")
+
+
+def make_etag(*parts: object) -> str:
+    """Return a quoted strong ETag derived from ``parts``."""
+
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode("utf-8"))
+    return quote_etag(digest.hexdigest()[:32])
+
+
+def etag_matches(request: HttpRequest, etag: str) -> bool:
+    """Return True when the request's ``If-None-Match`` already names ``etag``."""
+
+    header = request.META.get("HTTP_IF_NONE_MATCH")
+    if not header:
+        return False
+    candidates = parse_etags(header)
+    if "*" in candidates:
+        return True
+    # If-None-Match uses weak comparison (RFC 9110 section 13.1.2).
+    bare = _strip_weak(etag)
+    return any(_strip_weak(candidate) == bare for candidate in candidates)
+
+
+def unmodified_since(request: HttpRequest, last_modified: float) -> bool:
+    """Return True when ``If-Modified-Since`` is at or after ``last_modified``.
+
+    Only consulted when the request has no ``If-None-Match``, which takes
+    precedence (RFC 9110 section 13.2.2).
+    """
+
+    if request.META.get("HTTP_IF_NONE_MATCH"):
+        return False
+    since = parse_http_date_safe(request.META.get("HTTP_IF_MODIFIED_SINCE", ""))
+    return since is not None and int(last_modified) <= since
+
+
+def last_modified_header(timestamp: float) -> str:
+    return http_date(int(timestamp))
+
+
+def not_modified(etag: str, cache_control: str) -> HttpResponseNotModified:
+    response = HttpResponseNotModified()
+    response["ETag"] = etag
+    response["Cache-Control"] = cache_control
+    return response
+
+
+def encode_variants(body: bytes) -> dict[str, bytes]:
+    """Return ``body`` keyed by content coding: identity, gzip and (if available) br."""
+
+    variants = {"identity": body}
+    if len(body) >= COMPRESS_MIN_BYTES:
+        variants["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+        if brotli is not None:
+            variants["br"] = brotli.compress(body, quality=11)
+    return variants
+
+
+def negotiate_encoding(request: HttpRequest, available) -> str:
+    """Pick the best coding in ``available`` allowed by ``Accept-Encoding``."""
+
+    header = request.META.get("HTTP_ACCEPT_ENCODING", "")
+    weights: dict[str, float] = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding] = weight
+
+    best = "identity"
+    best_weight = 0.0
+    for coding in _ENCODING_PREFERENCE:
+        if coding == "identity" or coding not in available:
+            continue
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def encoded_response(
+    variants: dict[str, bytes],
+    encoding: str,
+    *,
+    content_type: str,
+    etag: str,
+    cache_control: str,
+) -> HttpResponse:
+    """Build a response from a prebuilt body variant with validators attached."""
+
+    body = variants[encoding]
+    response = HttpResponse(body, content_type=content_type)
+    if encoding != "identity":
+        response["Content-Encoding"] = encoding
+    response["Content-Length"] = str(len(body))
+    response["ETag"] = etag
+    response["Cache-Control"] = cache_control
+    patch_vary_headers(response, ("Accept-Encoding",))
+    return response
+
+
+def _strip_weak(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
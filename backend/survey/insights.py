@@ -1,20 +1,33 @@
-"""Utilities for enriching survey results with display metrics."""
+"""Utilities for enriching survey results with display metrics.
+
+Inputs are just five raw sums in 10-50, so per-sum values come from tables
+built at import time, and ``serialize_insights`` memoises the serialized rows
+and highlights per sum profile (plus norms version) in a bounded LRU.
+"""
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass
-from typing import Iterable
+from typing import TYPE_CHECKING, Iterable, NamedTuple
+
+from django.conf import settings
 
+from .caching import LRUCache
 from .constants import MAX_SCORE, MIN_SCORE, TRAIT_LABELS, TRAIT_ORDER
 
+if TYPE_CHECKING:
+    from .norms import Norms
+
+# Bump whenever the display metrics change so result ETags are invalidated.
+INSIGHTS_VERSION = 2
+
 BOOST_FACTOR = 1.3
 RANGE_THRESHOLD = 1.0
 DISPLAY_SCALE = 12
 RAW_MEAN_DECIMALS = 2
 Z_DECIMALS = 4
+PERCENTILE_DECIMALS = 1
 
 
-@dataclass(frozen=True)
-class TraitDisplay:
+class TraitDisplay(NamedTuple):
     """Computed metrics for a single trait."""
 
     trait: str
@@ -24,6 +37,7 @@ class TraitDisplay:
     z_score: float
     z_boosted: float
     display_score: int
+    percentile: float | None = None
 
     @property
     def level(self) -> str:
@@ -34,15 +48,13 @@ class TraitDisplay:
         return "neutral"
 
 
-@dataclass(frozen=True)
-class HighlightCard:
+class HighlightCard(NamedTuple):
     trait: str
     label: str
     display_score: int
 
 
-@dataclass(frozen=True)
-class Highlights:
+class Highlights(NamedTuple):
     signature_strength: HighlightCard
     signature_caution: HighlightCard
     strong_candidates: tuple[HighlightCard, ...]
@@ -58,14 +70,41 @@ def _calculate_z_score(raw_mean: float) -> float:
     return (raw_mean - 50) / 10
 
 
-def compute_trait_displays(trait_sums: dict[str, int]) -> list[TraitDisplay]:
-    """Return display metrics for each Big Five trait."""
+# Indexed by ``total - MIN_SCORE``.
+_RAW_MEANS = tuple(_scale_to_percentage(total) for total in range(MIN_SCORE, MAX_SCORE + 1))
+_ROUNDED_RAW_MEANS = tuple(round(value, RAW_MEAN_DECIMALS) for value in _RAW_MEANS)
+_FIXED_Z_SCORES = tuple(_calculate_z_score(value) for value in _RAW_MEANS)
 
-    raw_means = {
-        trait: _scale_to_percentage(total)
-        for trait, total in trait_sums.items()
-    }
-    z_scores = {trait: _calculate_z_score(value) for trait, value in raw_means.items()}
+_cache = LRUCache(maxsize=getattr(settings, "SURVEY_INSIGHTS_CACHE_SIZE", 4096))
+
+
+def _raw_mean(total: int) -> tuple[float, float]:
+    """Return the unrounded and display-rounded raw mean for ``total``."""
+
+    index = total - MIN_SCORE
+    if 0 <= index < len(_RAW_MEANS):
+        return _RAW_MEANS[index], _ROUNDED_RAW_MEANS[index]
+    value = _scale_to_percentage(total)
+    return value, round(value, RAW_MEAN_DECIMALS)
+
+
+def compute_trait_displays(trait_sums: dict[str, int], norms: Norms | None = None) -> list[TraitDisplay]:
+    """Return display metrics for each Big Five trait.
+
+    With ``norms`` the z-scores and percentiles come from the empirical
+    distribution of stored results instead of the fixed reference.
+    """
+
+    raw_means = {trait: _raw_mean(total) for trait, total in trait_sums.items()}
+    if norms is not None:
+        z_scores = {trait: norms[trait].z_score(total) for trait, total in trait_sums.items()}
+    else:
+        z_scores = {
+            trait: _FIXED_Z_SCORES[total - MIN_SCORE]
+            if MIN_SCORE <= total <= MAX_SCORE
+            else _calculate_z_score(raw_means[trait][0])
+            for trait, total in trait_sums.items()
+        }
 
     values = list(z_scores.values())
     mean_z = sum(values) / len(values)
@@ -78,10 +117,13 @@ def compute_trait_displays(trait_sums: dict[str, int]) -> list[TraitDisplay]:
 
     displays: list[TraitDisplay] = []
     for trait in TRAIT_ORDER:
-        raw_mean = round(raw_means[trait], RAW_MEAN_DECIMALS)
+        raw_mean = raw_means[trait][1]
         z_value = z_scores[trait]
         z_boosted = boost(z_value)
         display = round(max(0, min(100, 50 + z_boosted * DISPLAY_SCALE)))
+        percentile = None
+        if norms is not None:
+            percentile = round(norms[trait].percentile(trait_sums[trait]), PERCENTILE_DECIMALS)
         displays.append(
             TraitDisplay(
                 trait=trait,
@@ -91,6 +133,7 @@ def compute_trait_displays(trait_sums: dict[str, int]) -> list[TraitDisplay]:
                 z_score=round(z_value, Z_DECIMALS),
                 z_boosted=round(z_boosted, Z_DECIMALS),
                 display_score=display,
+                percentile=percentile,
             )
         )
     return displays
@@ -150,10 +193,13 @@ def compute_highlights(displays: Iterable[TraitDisplay]) -> Highlights:
     )
 
 
-def serialize_trait_displays(trait_sums: dict[str, int]) -> tuple[list[dict[str, object]], Highlights]:
+def serialize_trait_displays(
+    trait_sums: dict[str, int],
+    norms: Norms | None = None,
+) -> tuple[list[dict[str, object]], Highlights]:
     """Convenience helper returning trait rows and highlight cards."""
 
-    displays = compute_trait_displays(trait_sums)
+    displays = compute_trait_displays(trait_sums, norms)
     highlights = compute_highlights(displays)
     return [
         {
@@ -165,15 +211,42 @@ def serialize_trait_displays(trait_sums: dict[str, int]) -> tuple[list[dict[str,
             "z": item.z_score,
             "z_boosted": item.z_boosted,
             "display_score": item.display_score,
+            "percentile": item.percentile,
         }
         for item in displays
     ], highlights
 
 def serialize_highlights(highlights: Highlights) -> dict[str, object]:
     return {
-        "signature_strength": asdict(highlights.signature_strength),
-        "signature_caution": asdict(highlights.signature_caution),
-        "strong_candidates": [asdict(card) for card in highlights.strong_candidates],
-        "weak_candidates": [asdict(card) for card in highlights.weak_candidates],
+        "signature_strength": highlights.signature_strength._asdict(),
+        "signature_caution": highlights.signature_caution._asdict(),
+        "strong_candidates": [card._asdict() for card in highlights.strong_candidates],
+        "weak_candidates": [card._asdict() for card in highlights.weak_candidates],
         "contrast_summary_locked": highlights.contrast_summary_locked,
     }
+
+
+def serialize_insights(
+    trait_sums: dict[str, int],
+    norms: Norms | None = None,
+) -> tuple[list[dict[str, object]], dict[str, object]]:
+    """Return serialized trait rows and highlights, memoised per sum profile.
+
+    The returned objects are shared between callers and must not be mutated.
+    """
+
+    key = (tuple(trait_sums[trait] for trait in TRAIT_ORDER), norms.version if norms is not None else "")
+    cached = _cache.get(key)
+    if cached is None:
+        rows, highlights = serialize_trait_displays(trait_sums, norms)
+        cached = (rows, serialize_highlights(highlights))
+        _cache.set(key, cached)
+    return cached
+
+
+def clear_insights_cache() -> None:
+    _cache.clear()
+
+
+def insights_cache_stats() -> dict[str, float]:
+    return _cache.stats()
@@ -0,0 +1,93 @@
+"""Per-worker in-memory copies of the static legal documents.
+
+Each document is read on first request together with its gzip/brotli
+variants and validators. Its file is stat()ed again at most once per
+``SURVEY_LEGAL_RELOAD_INTERVAL_SECONDS``, and only re-read when the mtime
+changed, so serving a page normally touches no filesystem at all.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.conf import settings
+
+from .http import encode_variants
+
+LEGAL_PAGE_FILES = {
+    "privacy": "privacy.html",
+    "terms": "terms.html",
+    "disclaimer": "disclaimer.html",
+    "tokushoho": "tokushoho.html",
+}
+
+LEGAL_PUBLIC_DIR = Path(settings.PROJECT_ROOT) / "frontend" / "public"
+
+
+@dataclass(frozen=True)
+class LegalDocument:
+    variants: dict[str, bytes]
+    digest: str
+    mtime: float
+
+
+_lock = threading.Lock()
+# page -> (document or None when missing, mtime seen, monotonic time of last stat)
+_documents: dict[str, tuple[LegalDocument | None, float | None, float]] = {}
+
+
+def _reload_interval() -> float:
+    return float(getattr(settings, "SURVEY_LEGAL_RELOAD_INTERVAL_SECONDS", 60) or 0)
+
+
+def _stat_mtime(path: Path) -> float | None:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+
+def _read(path: Path, mtime: float) -> LegalDocument | None:
+    try:
+        body = path.read_bytes()
+    except OSError:
+        return None
+    return LegalDocument(
+        variants=encode_variants(body),
+        digest=hashlib.sha256(body).hexdigest()[:16],
+        mtime=mtime,
+    )
+
+
+def get_document(page: str) -> LegalDocument | None:
+    """Return the cached document for ``page``, or ``None`` if it does not exist."""
+
+    filename = LEGAL_PAGE_FILES.get(page)
+    if not filename:
+        return None
+
+    entry = _documents.get(page)
+    now = time.monotonic()
+    if entry is not None and now - entry[2] < _reload_interval():
+        return entry[0]
+
+    with _lock:
+        entry = _documents.get(page)
+        if entry is not None and now - entry[2] < _reload_interval():
+            return entry[0]
+        path = LEGAL_PUBLIC_DIR / filename
+        mtime = _stat_mtime(path)
+        if entry is not None and mtime is not None and mtime == entry[1] and entry[0] is not None:
+            document = entry[0]
+        else:
+            document = _read(path, mtime) if mtime is not None else None
+        _documents[page] = (document, mtime, now)
+        return document
+
+
+def clear_legal_cache() -> None:
+    with _lock:
+        _documents.clear()
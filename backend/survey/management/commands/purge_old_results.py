@@ -1,38 +1,130 @@
 """Management command to scrub or delete old survey results based on retention policy."""
 from __future__ import annotations
 
+import time
 from datetime import timedelta
 
 from django.conf import settings
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import QuerySet
 from django.utils import timezone
 
 from survey.models import SurveyResult
+from survey.result_cache import invalidate_results
 
 
 class Command(BaseCommand):
-    help = "Scrub raw answers and delete survey results according to retention settings."
+    help = (
+        "Scrub raw answers and delete survey results according to retention settings. "
+        "Rows are processed in short batches, each committed on its own, so the command "
+        "can be interrupted and simply rerun."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Rows scrubbed or deleted per transaction (defaults to SURVEY_RESULT_PURGE_BATCH_SIZE).",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            help="Seconds to pause between full batches (defaults to SURVEY_RESULT_PURGE_SLEEP_SECONDS).",
+        )
+        parser.add_argument(
+            "--max-runtime",
+            type=float,
+            default=0,
+            help="Stop starting new batches after this many seconds (0 = no limit).",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Count matching rows without changing them.")
 
     def handle(self, *args, **options):
         now = timezone.now()
         scrub_days = max(0, int(getattr(settings, "SURVEY_RESULT_SCRUB_RAW_AFTER_DAYS", 0)))
         retention_days = max(0, int(getattr(settings, "SURVEY_RESULT_RETENTION_DAYS", 0)))
 
+        batch_size = options["batch_size"]
+        if batch_size is None:
+            batch_size = getattr(settings, "SURVEY_RESULT_PURGE_BATCH_SIZE", 1000)
+        if batch_size < 1:
+            raise CommandError("--batch-size must be positive.")
+        sleep = options["sleep"]
+        if sleep is None:
+            sleep = getattr(settings, "SURVEY_RESULT_PURGE_SLEEP_SECONDS", 0.1)
+        self.batch_size = batch_size
+        self.sleep = max(0.0, float(sleep))
+        self.dry_run = options["dry_run"]
+        self.started = time.monotonic()
+        self.deadline = self.started + options["max_runtime"] if options["max_runtime"] > 0 else None
+
         scrubbed = 0
         deleted = 0
+        complete = True
+        delete_cutoff = None
 
-        if scrub_days:
-            scrub_cutoff = now - timedelta(days=scrub_days)
-            scrub_qs = SurveyResult.objects.filter(created_at__lt=scrub_cutoff).exclude(raw_scores={})
-            scrubbed = scrub_qs.update(raw_scores={})
-
+        # Delete first so rows past retention are not scrubbed only to be removed.
         if retention_days:
             delete_cutoff = now - timedelta(days=retention_days)
-            deleted, _ = SurveyResult.objects.filter(created_at__lt=delete_cutoff).delete()
+            deleted, complete = self._run(
+                "delete",
+                SurveyResult.objects.filter(created_at__lt=delete_cutoff),
+                lambda pks: SurveyResult.objects.filter(pk__in=pks).delete()[0],
+            )
 
-        self.stdout.write(
-            self.style.SUCCESS(
-                f"Purged survey results: scrubbed={scrubbed}, deleted={deleted}, "
-                f"scrub_days={scrub_days}, retention_days={retention_days}"
+        if scrub_days and complete:
+            scrub_cutoff = now - timedelta(days=scrub_days)
+            scrub_qs = SurveyResult.objects.filter(created_at__lt=scrub_cutoff).with_answers()
+            if delete_cutoff is not None:
+                scrub_qs = scrub_qs.filter(created_at__gte=delete_cutoff)
+            scrubbed, complete = self._run(
+                "scrub",
+                scrub_qs,
+                lambda pks: SurveyResult.objects.filter(pk__in=pks).scrub_answers(),
             )
+
+        prefix = "Would purge" if self.dry_run else "Purged"
+        summary = (
+            f"{prefix} survey results: scrubbed={scrubbed}, deleted={deleted}, "
+            f"scrub_days={scrub_days}, retention_days={retention_days}"
         )
+        if complete:
+            self.stdout.write(self.style.SUCCESS(summary))
+        else:
+            self.stdout.write(self.style.WARNING(f"{summary} (stopped at --max-runtime; rerun to continue)"))
+
+    def _run(self, action: str, candidates: QuerySet, apply) -> tuple[int, bool]:
+        """Apply ``apply`` to ``candidates`` batch by batch; return (rows, finished).
+
+        Each batch re-queries the oldest remaining candidates, so progress lives in
+        the database itself and a rerun picks up where an interrupted run stopped.
+        """
+
+        if self.dry_run:
+            count = candidates.count()
+            self.stdout.write(f"{action}: {count} row(s) match")
+            return count, True
+
+        ordered = candidates.order_by("created_at", "pk")
+        total = 0
+        batches = 0
+        while True:
+            if self.deadline is not None and time.monotonic() >= self.deadline:
+                return total, False
+            pks = list(ordered.values_list("pk", flat=True)[: self.batch_size])
+            if not pks:
+                return total, True
+            with transaction.atomic():
+                affected = apply(pks)
+            invalidate_results(pks)
+            total += affected
+            batches += 1
+            elapsed = max(time.monotonic() - self.started, 1e-9)
+            self.stdout.write(
+                f"{action}: batch={batches} rows={affected} total={total} rate={total / elapsed:.0f}/s"
+            )
+            if len(pks) < self.batch_size:
+                return total, True
+            if self.sleep:
+                time.sleep(self.sleep)
@@ -0,0 +1,22 @@
+"""Management command to recompute the trait score histograms behind the norms."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from survey.norms import get_norms, rebuild_histograms
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-day trait score histograms from stored survey results."
+
+    def handle(self, *args, **options):
+        buckets = rebuild_histograms()
+        norms = get_norms()
+        if norms is None:
+            summary = "norms inactive (disabled or below SURVEY_NORMS_MIN_SAMPLES)"
+        else:
+            summary = ", ".join(
+                f"{trait}: mean={norm.mean:.2f} sd={norm.sd:.2f}" for trait, norm in norms.traits.items()
+            )
+            summary = f"samples={norms.samples}; {summary}"
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {buckets} histogram buckets ({summary})."))
@@ -0,0 +1,131 @@
+"""Management command to recompute stored trait scores against the current item bank."""
+from __future__ import annotations
+
+import time
+import uuid
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from survey import answers
+from survey.catalog import get_catalog, invalidate_catalog
+from survey.constants import TRAIT_ORDER
+from survey.models import SurveyResult
+from survey.norms import rebuild_histograms
+from survey.result_cache import invalidate_results
+from survey.services import MAX_ANSWER, MIN_ANSWER, SurveyScoringError
+
+SUM_FIELDS = [f"sum_{trait}" for trait in TRAIT_ORDER]
+SCALED_FIELDS = [f"scaled_{trait}" for trait in TRAIT_ORDER]
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute sum_*/scaled_* columns from the stored raw answers after items are re-keyed. "
+        "Rows are streamed in chunks and only changed rows are written back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Rows scored and written per chunk.")
+        parser.add_argument("--dry-run", action="store_true", help="Report differences without writing them.")
+        parser.add_argument(
+            "--start-after",
+            default=None,
+            help="Resume after this result UUID (printed with each progress line).",
+        )
+        parser.add_argument("--show", type=int, default=20, help="Maximum number of diffs printed in dry-run mode.")
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        if chunk_size < 1:
+            raise CommandError("--chunk-size must be positive.")
+        dry_run = options["dry_run"]
+        start_after = options["start_after"]
+        if start_after:
+            try:
+                start_after = uuid.UUID(str(start_after))
+            except ValueError as exc:
+                raise CommandError("--start-after must be a result UUID.") from exc
+
+        invalidate_catalog()
+        try:
+            plan = get_catalog().plan
+        except SurveyScoringError as exc:
+            raise CommandError(str(exc)) from exc
+
+        queryset = SurveyResult.objects.with_answers().order_by("pk")
+        if start_after:
+            queryset = queryset.filter(pk__gt=start_after)
+        rows = queryset.values_list("pk", "answer_layout", "packed_answers", *SUM_FIELDS, *SCALED_FIELDS).iterator(
+            chunk_size=chunk_size
+        )
+
+        started = time.monotonic()
+        processed = changed = skipped = shown = 0
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+
+            pks: list = []
+            stored: list[tuple[int, ...]] = []
+            matrix: list[list[int]] = []
+            for pk, layout_id, packed, *columns in chunk:
+                try:
+                    matrix.append(self._answers(plan, layout_id, packed))
+                except SurveyScoringError:
+                    skipped += 1
+                    continue
+                pks.append(pk)
+                stored.append(tuple(columns))
+
+            sums, scaled = plan.score_matrix(matrix)
+            updates: list[SurveyResult] = []
+            for pk, old, row_sums, row_scaled in zip(pks, stored, sums, scaled):
+                new = (*row_sums, *row_scaled)
+                if new == old:
+                    continue
+                if dry_run and shown < options["show"]:
+                    shown += 1
+                    self.stdout.write(f"{pk}: {self._describe_diff(old, new)}")
+                updates.append(SurveyResult(pk=pk, **dict(zip(SUM_FIELDS + SCALED_FIELDS, new))))
+
+            if updates and not dry_run:
+                with transaction.atomic():
+                    SurveyResult.objects.bulk_update(updates, SUM_FIELDS + SCALED_FIELDS, batch_size=chunk_size)
+                invalidate_results(result.pk for result in updates)
+
+            processed += len(chunk)
+            changed += len(updates)
+            elapsed = max(time.monotonic() - started, 1e-9)
+            self.stdout.write(
+                f"processed={processed} changed={changed} skipped={skipped} "
+                f"rate={processed / elapsed:.0f}/s last={chunk[-1][0]}"
+            )
+
+        if changed and not dry_run:
+            # Stored sums moved, so the norms histograms must follow.
+            buckets = rebuild_histograms()
+            self.stdout.write(f"Rebuilt norms histograms ({buckets} buckets)")
+
+        verb = "Would update" if dry_run else "Updated"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {changed} of {processed} survey results (skipped={skipped}, dry_run={dry_run})"
+            )
+        )
+
+    @staticmethod
+    def _answers(plan, layout_id: int, packed: bytes) -> list[int]:
+        # Rows packed against the current catalog unpack straight into slot order.
+        if answers.layout_codes(layout_id) == plan.codes:
+            values = answers.unpack(packed, len(plan.codes))
+            if MIN_ANSWER <= min(values) and max(values) <= MAX_ANSWER:
+                return values
+        return plan.coerce(answers.decode(layout_id, packed))
+
+    @staticmethod
+    def _describe_diff(old: tuple[int, ...], new: tuple[int, ...]) -> str:
+        names = SUM_FIELDS + SCALED_FIELDS
+        return ", ".join(f"{name} {before}->{after}" for name, before, after in zip(names, old, new) if before != after)
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("survey", "0002_surveyresult_memo"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="surveyresult",
+            index=models.Index(fields=["created_at"], name="survey_surv_created_b556d7_idx"),
+        ),
+    ]
@@ -0,0 +1,36 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("survey", "0003_surveyresult_created_at_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TraitScoreBucket",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("day", models.DateField()),
+                (
+                    "trait",
+                    models.CharField(
+                        choices=[("O", "O"), ("C", "C"), ("E", "E"), ("A", "A"), ("N", "N")],
+                        max_length=1,
+                    ),
+                ),
+                ("score", models.PositiveSmallIntegerField()),
+                ("count", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "ordering": ["-day", "trait", "score"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="traitscorebucket",
+            constraint=models.UniqueConstraint(
+                fields=("day", "trait", "score"), name="survey_bucket_day_trait_score_uniq"
+            ),
+        ),
+    ]
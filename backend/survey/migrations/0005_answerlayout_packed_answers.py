@@ -0,0 +1,38 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("survey", "0004_traitscorebucket"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AnswerLayout",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("fingerprint", models.CharField(max_length=16, unique=True)),
+                ("codes", models.JSONField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="surveyresult",
+            name="answer_layout",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Slot order of packed_answers; empty once the raw answers are scrubbed",
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="survey.answerlayout",
+            ),
+        ),
+        migrations.AddField(
+            model_name="surveyresult",
+            name="packed_answers",
+            field=models.BinaryField(blank=True, default=b"", help_text="Original 1-5 answers, 3 bits per item"),
+        ),
+    ]
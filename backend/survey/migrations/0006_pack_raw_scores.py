@@ -0,0 +1,100 @@
+import hashlib
+
+from django.db import migrations, transaction
+
+CHUNK_SIZE = 2000
+
+# Frozen copies of the survey.answers encoding as of this migration, so later
+# changes to that module cannot alter what this migration writes or reads.
+BITS = 3
+MAX_VALUE = (1 << BITS) - 1
+
+
+def pack(values):
+    number = 0
+    for slot, value in enumerate(values):
+        if not 0 <= value <= MAX_VALUE:
+            raise ValueError(f"Answer {value!r} does not fit in {BITS} bits.")
+        number |= value << (slot * BITS)
+    return number.to_bytes((len(values) * BITS + 7) // 8, "little")
+
+
+def unpack(blob, count):
+    number = int.from_bytes(bytes(blob), "little")
+    return [(number >> (slot * BITS)) & MAX_VALUE for slot in range(count)]
+
+
+def layout_fingerprint(codes):
+    return hashlib.sha256("\n".join(codes).encode("utf-8")).hexdigest()[:16]
+
+
+def _layout(AnswerLayout, codes, layouts):
+    layout = layouts.get(codes)
+    if layout is None:
+        layout, _ = AnswerLayout.objects.get_or_create(
+            fingerprint=layout_fingerprint(codes), defaults={"codes": list(codes)}
+        )
+        layouts[codes] = layout
+    return layout
+
+
+def pack_raw_scores(apps, schema_editor):
+    AnswerLayout = apps.get_model("survey", "AnswerLayout")
+    PersonalityItem = apps.get_model("survey", "PersonalityItem")
+    SurveyResult = apps.get_model("survey", "SurveyResult")
+
+    catalog = tuple(PersonalityItem.objects.order_by("order").values_list("code", flat=True))
+    layouts = {}
+    queryset = SurveyResult.objects.filter(answer_layout__isnull=True).exclude(raw_scores={}).order_by("pk")
+    last = None
+    while True:
+        page = queryset if last is None else queryset.filter(pk__gt=last)
+        rows = list(page.values_list("pk", "raw_scores")[:CHUNK_SIZE])
+        if not rows:
+            break
+        updates = []
+        for pk, raw_scores in rows:
+            if not isinstance(raw_scores, dict) or not raw_scores:
+                continue
+            codes = catalog
+            if not set(raw_scores) <= set(codes):
+                codes = catalog + tuple(sorted(set(raw_scores) - set(catalog)))
+            layout = _layout(AnswerLayout, codes, layouts)
+            values = [int(raw_scores.get(code, 0)) for code in codes]
+            updates.append(SurveyResult(pk=pk, answer_layout=layout, packed_answers=pack(values)))
+        with transaction.atomic():
+            SurveyResult.objects.bulk_update(updates, ["answer_layout", "packed_answers"])
+        last = rows[-1][0]
+
+
+def unpack_raw_scores(apps, schema_editor):
+    SurveyResult = apps.get_model("survey", "SurveyResult")
+
+    queryset = SurveyResult.objects.filter(answer_layout__isnull=False).select_related("answer_layout").order_by("pk")
+    last = None
+    while True:
+        page = queryset if last is None else queryset.filter(pk__gt=last)
+        rows = list(page[:CHUNK_SIZE])
+        if not rows:
+            break
+        for row in rows:
+            codes = row.answer_layout.codes
+            values = unpack(row.packed_answers, len(codes))
+            row.raw_scores = {code: value for code, value in zip(codes, values) if value}
+        with transaction.atomic():
+            SurveyResult.objects.bulk_update(rows, ["raw_scores"])
+        last = rows[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    # Each chunk commits on its own so large tables are not locked for the whole copy.
+    atomic = False
+
+    dependencies = [
+        ("survey", "0005_answerlayout_packed_answers"),
+    ]
+
+    operations = [
+        migrations.RunPython(pack_raw_scores, unpack_raw_scores),
+    ]
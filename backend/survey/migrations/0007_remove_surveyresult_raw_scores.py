@@ -0,0 +1,24 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("survey", "0006_pack_raw_scores"),
+    ]
+
+    operations = [
+        # A default lets the column be re-added over existing rows when migrating backwards.
+        migrations.AlterField(
+            model_name="surveyresult",
+            name="raw_scores",
+            field=models.JSONField(
+                default=dict,
+                help_text="Keyed by item code (E1, A1, ...) with the original 1-5 answers",
+            ),
+        ),
+        migrations.RemoveField(
+            model_name="surveyresult",
+            name="raw_scores",
+        ),
+    ]
@@ -5,6 +5,8 @@ from uuid import uuid4
 
 from django.db import models
 
+from . import answers
+
 
 class PersonalityItem(models.Model):
     """Represents a single IPIP Big Five item."""
@@ -29,13 +31,42 @@ class PersonalityItem(models.Model):
         return f"{self.code}: {self.text_ja[:40]}"
 
 
+class AnswerLayout(models.Model):
+    """Item codes, in slot order, used to pack ``SurveyResult`` answers."""
+
+    fingerprint = models.CharField(max_length=16, unique=True)
+    codes = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return f"AnswerLayout {self.fingerprint} ({len(self.codes)} items)"
+
+
+class SurveyResultQuerySet(models.QuerySet):
+    def with_answers(self):
+        """Results whose raw answers have not been scrubbed."""
+        return self.filter(answer_layout__isnull=False)
+
+    def scrub_answers(self) -> int:
+        """Drop the raw answers, keeping the scores; returns the row count."""
+        return self.update(answer_layout=None, packed_answers=b"")
+
+
 class SurveyResult(models.Model):
     """Stores aggregated scores for a single survey submission."""
 
     uuid = models.UUIDField(primary_key=True, default=uuid4, editable=False)
     memo = models.CharField(max_length=50, blank=True, default="", verbose_name="メモ", help_text="20文字程度のメモ")
     created_at = models.DateTimeField(auto_now_add=True)
-    raw_scores = models.JSONField(help_text="Keyed by item code (E1, A1, ...) with the original 1-5 answers")
+    answer_layout = models.ForeignKey(
+        AnswerLayout,
+        null=True,
+        blank=True,
+        on_delete=models.PROTECT,
+        related_name="+",
+        help_text="Slot order of packed_answers; empty once the raw answers are scrubbed",
+    )
+    packed_answers = models.BinaryField(default=b"", blank=True, help_text="Original 1-5 answers, 3 bits per item")
     sum_O = models.PositiveSmallIntegerField(verbose_name="開放性（合計）")
     sum_C = models.PositiveSmallIntegerField(verbose_name="誠実性（合計）")
     sum_E = models.PositiveSmallIntegerField(verbose_name="外向性（合計）")
@@ -47,12 +78,24 @@ class SurveyResult(models.Model):
     scaled_A = models.PositiveSmallIntegerField(verbose_name="協調性（スケール）")
     scaled_N = models.PositiveSmallIntegerField(verbose_name="神経症傾向（スケール）")
 
+    objects = SurveyResultQuerySet.as_manager()
+
     class Meta:
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["created_at"])]
 
     def __str__(self) -> str:
         return f"SurveyResult {self.uuid}"
 
+    @property
+    def raw_scores(self) -> dict[str, int]:
+        """Original answers keyed by item code (E1, A1, ...); ``{}`` once scrubbed."""
+        return answers.decode(self.answer_layout_id, self.packed_answers)
+
+    @raw_scores.setter
+    def raw_scores(self, value: dict[str, int]) -> None:
+        self.answer_layout_id, self.packed_answers = answers.encode(value)
+
     @property
     def trait_sum_map(self) -> dict[str, int]:
         return {
@@ -72,3 +115,25 @@ class SurveyResult(models.Model):
             "A": self.scaled_A,
             "N": self.scaled_N,
         }
+
+
+class TraitScoreBucket(models.Model):
+    """Number of results per local day with a given raw sum for one trait.
+
+    Summed over a window of days these rows form the 41-bin (10-50) histograms
+    behind the empirical norms in ``survey.norms``.
+    """
+
+    day = models.DateField()
+    trait = models.CharField(max_length=1, choices=PersonalityItem.Trait.choices)
+    score = models.PositiveSmallIntegerField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["day", "trait", "score"], name="survey_bucket_day_trait_score_uniq"),
+        ]
+        ordering = ["-day", "trait", "score"]
+
+    def __str__(self) -> str:
+        return f"{self.trait}={self.score} @ {self.day:%Y-%m-%d}: {self.count}"
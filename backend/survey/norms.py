@@ -0,0 +1,208 @@
+"""Empirical population norms built from per-day trait score histograms.
+
+Every saved result increments one ``TraitScoreBucket`` per trait, so the
+histogram of raw sums (10-50, 41 bins) for any window of days is a small
+aggregate query. Each worker keeps the cumulative table in memory for
+``SURVEY_NORMS_TTL_SECONDS`` and answers percentile and z-score lookups in
+constant time. Norms stay unused until ``SURVEY_NORMS_ENABLED`` is set and the
+window holds at least ``SURVEY_NORMS_MIN_SAMPLES`` results; until then insights
+fall back to the fixed mean 50 / SD 10 reference.
+"""
+from __future__ import annotations
+
+import hashlib
+import math
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Iterable
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .constants import MAX_SCORE, MIN_SCORE, TRAIT_ORDER
+from .models import SurveyResult, TraitScoreBucket
+
+BINS = MAX_SCORE - MIN_SCORE + 1
+
+
+@dataclass(frozen=True)
+class TraitNorm:
+    """Distribution of one trait's raw sums.
+
+    ``cumulative[i]`` is the number of results whose sum is below
+    ``MIN_SCORE + i``, so it has ``BINS + 1`` entries.
+    """
+
+    trait: str
+    total: int
+    mean: float
+    sd: float
+    cumulative: tuple[int, ...]
+
+    @classmethod
+    def from_counts(cls, trait: str, counts: list[int]) -> TraitNorm:
+        total = sum(counts)
+        cumulative = [0]
+        for count in counts:
+            cumulative.append(cumulative[-1] + count)
+        mean = sum((MIN_SCORE + index) * count for index, count in enumerate(counts)) / total
+        variance = sum(count * (MIN_SCORE + index - mean) ** 2 for index, count in enumerate(counts)) / total
+        return cls(trait=trait, total=total, mean=mean, sd=math.sqrt(variance), cumulative=tuple(cumulative))
+
+    def percentile(self, score: int) -> float:
+        """Mid-rank percentile of ``score``: below + half of the ties."""
+
+        index = min(max(score, MIN_SCORE), MAX_SCORE) - MIN_SCORE
+        below = self.cumulative[index]
+        ties = self.cumulative[index + 1] - below
+        return (below + ties / 2) / self.total * 100
+
+    def z_score(self, score: int) -> float:
+        return (score - self.mean) / self.sd if self.sd else 0.0
+
+
+@dataclass(frozen=True)
+class Norms:
+    traits: dict[str, TraitNorm]
+    version: str
+    samples: int
+
+    def __getitem__(self, trait: str) -> TraitNorm:
+        return self.traits[trait]
+
+
+_lock = threading.Lock()
+_state: tuple[Norms | None, float] | None = None
+
+
+def _window_start():
+    days = int(getattr(settings, "SURVEY_NORMS_WINDOW_DAYS", 0) or 0)
+    if days <= 0:
+        return None
+    return timezone.localdate() - timedelta(days=days - 1)
+
+
+def load_histograms() -> dict[str, list[int]]:
+    """Return per-trait bin counts summed over the configured window."""
+
+    buckets = TraitScoreBucket.objects.all()
+    start = _window_start()
+    if start is not None:
+        buckets = buckets.filter(day__gte=start)
+    histograms = {trait: [0] * BINS for trait in TRAIT_ORDER}
+    for trait, score, count in buckets.values_list("trait", "score").annotate(n=Sum("count")).order_by():
+        if trait in histograms and MIN_SCORE <= score <= MAX_SCORE:
+            histograms[trait][score - MIN_SCORE] += count
+    return histograms
+
+
+def _build(histograms: dict[str, list[int]]) -> Norms | None:
+    samples = min(sum(counts) for counts in histograms.values())
+    if not samples or samples < int(getattr(settings, "SURVEY_NORMS_MIN_SAMPLES", 500)):
+        return None
+    digest = hashlib.sha256(repr(sorted(histograms.items())).encode("ascii")).hexdigest()[:12]
+    return Norms(
+        traits={trait: TraitNorm.from_counts(trait, counts) for trait, counts in histograms.items()},
+        version=digest,
+        samples=samples,
+    )
+
+
+def get_norms() -> Norms | None:
+    """Return the current norms, or ``None`` when disabled or too few samples."""
+
+    global _state
+
+    if not getattr(settings, "SURVEY_NORMS_ENABLED", False):
+        return None
+    ttl = float(getattr(settings, "SURVEY_NORMS_TTL_SECONDS", 600) or 0)
+    state = _state
+    if state is not None and (not ttl or time.monotonic() - state[1] < ttl):
+        return state[0]
+    with _lock:
+        state = _state
+        if state is not None and (not ttl or time.monotonic() - state[1] < ttl):
+            return state[0]
+        norms = _build(load_histograms())
+        _state = (norms, time.monotonic())
+        return norms
+
+
+async def aget_norms() -> Norms | None:
+    """``get_norms`` for async views: only a rebuild leaves the event loop."""
+
+    if not getattr(settings, "SURVEY_NORMS_ENABLED", False):
+        return None
+    ttl = float(getattr(settings, "SURVEY_NORMS_TTL_SECONDS", 600) or 0)
+    state = _state
+    if state is not None and (not ttl or time.monotonic() - state[1] < ttl):
+        return state[0]
+    return await sync_to_async(get_norms)()
+
+
+def norms_version() -> str:
+    """Short stamp of the norms in use, folded into result ETags and cache keys."""
+
+    norms = get_norms()
+    return norms.version if norms is not None else ""
+
+
+def invalidate_norms() -> None:
+    global _state
+    with _lock:
+        _state = None
+
+
+def record_results(results: Iterable[SurveyResult]) -> None:
+    """Add saved results to their day's histogram buckets.
+
+    Call inside the transaction that inserted the results so counts and rows
+    commit together.
+    """
+
+    increments: Counter = Counter()
+    for result in results:
+        day = timezone.localdate(result.created_at)
+        for trait, total in result.trait_sum_map.items():
+            increments[(day, trait, total)] += 1
+
+    for (day, trait, score), count in increments.items():
+        bucket = TraitScoreBucket.objects.filter(day=day, trait=trait, score=score)
+        if bucket.update(count=F("count") + count):
+            continue
+        try:
+            with transaction.atomic():
+                TraitScoreBucket.objects.create(day=day, trait=trait, score=score, count=count)
+        except IntegrityError:
+            # Another request created the bucket first.
+            bucket.update(count=F("count") + count)
+
+
+def rebuild_histograms() -> int:
+    """Recompute every bucket from stored results; return the number of buckets."""
+
+    buckets: list[TraitScoreBucket] = []
+    for trait in TRAIT_ORDER:
+        column = f"sum_{trait}"
+        rows = (
+            SurveyResult.objects.annotate(day=TruncDate("created_at"))
+            .values_list("day", column)
+            .annotate(n=Count("pk"))
+            .order_by()
+        )
+        buckets.extend(
+            TraitScoreBucket(day=day, trait=trait, score=score, count=count) for day, score, count in rows
+        )
+
+    with transaction.atomic():
+        TraitScoreBucket.objects.all().delete()
+        TraitScoreBucket.objects.bulk_create(buckets, batch_size=1000)
+    invalidate_norms()
+    return len(buckets)
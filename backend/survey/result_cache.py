@@ -0,0 +1,122 @@
+"""Per-worker cache of finished result payloads keyed by result UUID.
+
+Results never change after creation except for memo edits (not part of the
+payload), raw answer scrubs, deletion and rescoring, and every one of those
+paths calls ``invalidate_results``. Unknown IDs are remembered briefly as
+negative entries so repeated lookups of random UUIDs never reach the database.
+Entries also expire after ``SURVEY_RESULT_CACHE_TTL_SECONDS``, which bounds how
+long another worker can keep serving a result changed elsewhere.
+
+With ``SURVEY_RESULT_CACHE_SHARED`` the payloads are also written to the
+shared ``results`` cache namespace, so a payload rendered by one worker is a
+cache hit on the others. Negative entries always stay per worker.
+Invalidation also revokes outstanding compact result tokens (see ``tokens``).
+"""
+from __future__ import annotations
+
+from typing import Iterable
+
+from django.conf import settings
+
+from config.caching import NamespacedCache
+
+from . import tokens
+from .caching import LRUCache
+
+MISSING = object()
+
+_cache = LRUCache(maxsize=getattr(settings, "SURVEY_RESULT_CACHE_SIZE", 2048))
+_shared = NamespacedCache("results")
+_negative_hits = 0
+
+
+def _shared_enabled() -> bool:
+    return getattr(settings, "SURVEY_RESULT_CACHE_SHARED", False)
+
+
+def _key(pk) -> str:
+    return str(pk)
+
+
+def get_payload(pk, version: str = ""):
+    """Return the cached payload, ``MISSING`` for a known-unknown ID, or ``None``.
+
+    Payloads stored under a different ``version`` (the norms stamp) are treated
+    as absent.
+    """
+
+    value = _local_payload(pk)
+    if value is None and _shared_enabled():
+        value = _remember_shared(pk, _shared.get(_key(pk)))
+    return _unwrap(value, version)
+
+
+async def aget_payload(pk, version: str = ""):
+    """``get_payload`` for callers on the event loop."""
+
+    value = _local_payload(pk)
+    if value is None and _shared_enabled():
+        value = _remember_shared(pk, await _shared.aget(_key(pk)))
+    return _unwrap(value, version)
+
+
+def _local_payload(pk):
+    global _negative_hits
+    value = _cache.get(_key(pk))
+    if value is MISSING:
+        _negative_hits += 1
+    return value
+
+
+def _remember_shared(pk, value):
+    if value is not None:
+        _cache.set(_key(pk), value, ttl=_ttl())
+    return value
+
+
+def _unwrap(value, version: str):
+    if value is MISSING:
+        return value
+    if value is None or value[0] != version:
+        return None
+    return value[1]
+
+
+def _ttl() -> int:
+    return getattr(settings, "SURVEY_RESULT_CACHE_TTL_SECONDS", 600)
+
+
+def store_payload(pk, payload: dict[str, object], version: str = "") -> None:
+    _cache.set(_key(pk), (version, payload), ttl=_ttl())
+    if _shared_enabled():
+        _shared.set(_key(pk), (version, payload), timeout=_ttl())
+
+
+async def astore_payload(pk, payload: dict[str, object], version: str = "") -> None:
+    _cache.set(_key(pk), (version, payload), ttl=_ttl())
+    if _shared_enabled():
+        await _shared.aset(_key(pk), (version, payload), timeout=_ttl())
+
+
+def remember_missing(pk) -> None:
+    _cache.set(_key(pk), MISSING, ttl=getattr(settings, "SURVEY_RESULT_CACHE_NEGATIVE_TTL_SECONDS", 60))
+
+
+def invalidate_results(pks: Iterable) -> None:
+    keys = [_key(pk) for pk in pks]
+    for key in keys:
+        _cache.pop(key)
+    if _shared_enabled():
+        _shared.delete_many(keys)
+    if tokens.compact_tokens_enabled():
+        tokens.revoke(keys)
+
+
+def clear_result_cache() -> None:
+    _cache.clear()
+    if _shared_enabled():
+        _shared.invalidate()
+
+
+def result_cache_stats() -> dict[str, float]:
+    return {**_cache.stats(), "negative_hits": _negative_hits}
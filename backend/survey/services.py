@@ -1,17 +1,65 @@
 """Domain services for scoring the Big Five survey."""
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterable, Mapping
+import re
+from dataclasses import dataclass, field
+from typing import Iterable, Mapping, Sequence
+
+from django.db import transaction
+
+from config import server_timing
 
 from .constants import MAX_SCORE, MIN_SCORE, TRAIT_ORDER
 from .models import PersonalityItem, SurveyResult
+from .norms import record_results
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - fallback when library missing locally
+    np = None
+
+MIN_ANSWER = 1
+MAX_ANSWER = 5
+# Mirrors DRF's IntegerField coercion so '4', 4.0 and '4.0' are all accepted.
+_MAX_STRING_LENGTH = 1000
+_DECIMAL_SUFFIX = re.compile(r"\.0*\s*$")
+_MISSING = object()
+# Below this many rows the NumPy setup costs more than the plain Python loop.
+VECTORIZE_MIN_ROWS = 32
 
 
 class SurveyScoringError(ValueError):
     """Raised when incoming responses cannot be scored."""
 
 
+class SurveyResponseError(SurveyScoringError):
+    """Raised by ``ScoringPlan`` with every problem found in a submission.
+
+    ``invalid`` maps item codes to the DRF ``IntegerField`` error code that
+    applies (``invalid``, ``null``, ``min_value``, ``max_value`` or
+    ``max_string_length``) so the API layer can render its usual messages.
+    """
+
+    def __init__(
+        self,
+        *,
+        invalid: dict[str, str] | None = None,
+        missing: list[str] | None = None,
+        extra: list[str] | None = None,
+    ) -> None:
+        self.invalid = invalid or {}
+        self.missing = missing or []
+        self.extra = extra or []
+        if self.invalid:
+            code = next(iter(self.invalid))
+            message = f"Invalid response for item {code}."
+        elif self.missing:
+            message = f"Missing response for item {self.missing[0]}."
+        else:
+            message = f"Unknown item codes: {', '.join(self.extra)}."
+        super().__init__(message)
+
+
 @dataclass(frozen=True)
 class ComputedScores:
     """Holds intermediate scoring results."""
@@ -52,17 +100,152 @@ def compute_trait_scores(
     return ComputedScores(raw_scores=raw_scores, trait_sums=trait_sums, scaled_scores=scaled_scores)
 
 
-def create_survey_result(
-    items: Iterable[PersonalityItem],
-    responses: Mapping[str, int | str],
-) -> SurveyResult:
-    """Persist a scored survey submission and return the saved model."""
+@dataclass(frozen=True)
+class ScoringPlan:
+    """Item bank compiled into flat arrays for single-pass validation and scoring.
+
+    ``codes`` holds the item codes in slot order, ``trait_index`` the position
+    of each slot's trait in ``TRAIT_ORDER`` and ``reversed_mask`` whether the
+    slot is reverse-keyed.
+    """
+
+    codes: tuple[str, ...]
+    trait_index: tuple[int, ...]
+    reversed_mask: tuple[bool, ...]
+    slot_of: dict[str, int] = field(compare=False, repr=False)
+
+    @classmethod
+    def compile(cls, items: Iterable[PersonalityItem]) -> ScoringPlan:
+        item_list = list(items)
+        if not item_list:
+            raise SurveyScoringError("No personality items are registered.")
+        codes = tuple(item.code for item in item_list)
+        return cls(
+            codes=codes,
+            trait_index=tuple(TRAIT_ORDER.index(item.trait) for item in item_list),
+            reversed_mask=tuple(bool(item.is_reversed) for item in item_list),
+            slot_of={code: slot for slot, code in enumerate(codes)},
+        )
+
+    def score(self, responses: Mapping[str, object]) -> ComputedScores:
+        """Validate, coerce and score ``responses`` in one pass over the slots.
+
+        Raises ``SurveyResponseError`` describing every invalid, missing or
+        unknown answer when the submission cannot be scored.
+        """
+
+        raw_scores: dict[str, int] = {}
+        sums = [0] * len(TRAIT_ORDER)
+        failed = False
+        for code, trait, is_reversed in zip(self.codes, self.trait_index, self.reversed_mask):
+            value = responses.get(code, _MISSING)
+            if type(value) is not int or value < MIN_ANSWER or value > MAX_ANSWER:
+                value, error = _coerce_response(value)
+                if error is not None:
+                    failed = True
+                    continue
+            raw_scores[code] = value
+            sums[trait] += 6 - value if is_reversed else value
+
+        if failed or len(responses) != len(raw_scores):
+            raise self._describe_errors(responses)
+
+        trait_sums = dict(zip(TRAIT_ORDER, sums))
+        return ComputedScores(
+            raw_scores=raw_scores,
+            trait_sums=trait_sums,
+            scaled_scores={trait: scale_score(total) for trait, total in trait_sums.items()},
+        )
+
+    def coerce(self, responses: Mapping[str, object]) -> list[int]:
+        """Return the answers in slot order or raise ``SurveyResponseError``."""
+
+        answers: list[int] = []
+        for code in self.codes:
+            value = responses.get(code, _MISSING)
+            if type(value) is not int or value < MIN_ANSWER or value > MAX_ANSWER:
+                value, error = _coerce_response(value)
+                if error is not None:
+                    raise self._describe_errors(responses)
+            answers.append(value)
+        if len(responses) != len(answers):
+            raise self._describe_errors(responses)
+        return answers
+
+    def score_matrix(self, matrix: Sequence[Sequence[int]]) -> tuple[list[list[int]], list[list[int]]]:
+        """Score many coerced answer rows at once.
+
+        Returns per-row trait sums and scaled scores in ``TRAIT_ORDER``. Large
+        batches are scored as one NumPy matrix product; small ones (or
+        environments without NumPy) fall back to a plain loop.
+        """
+
+        if not matrix:
+            return [], []
+        if np is None or len(matrix) < VECTORIZE_MIN_ROWS:
+            sums: list[list[int]] = []
+            for answers in matrix:
+                row = [0] * len(TRAIT_ORDER)
+                for value, trait, is_reversed in zip(answers, self.trait_index, self.reversed_mask):
+                    row[trait] += 6 - value if is_reversed else value
+                sums.append(row)
+            return sums, [[scale_score(total) for total in row] for row in sums]
+
+        answers = np.asarray(matrix, dtype=np.int64)
+        adjusted = np.where(np.asarray(self.reversed_mask), 6 - answers, answers)
+        membership = np.zeros((len(self.codes), len(TRAIT_ORDER)), dtype=np.int64)
+        membership[np.arange(len(self.codes)), np.asarray(self.trait_index)] = 1
+        totals = adjusted @ membership
+        # Same float arithmetic and half-to-even rounding as scale_score().
+        scaled = np.clip(np.rint((totals - MIN_SCORE) / (MAX_SCORE - MIN_SCORE) * 100), 0, 100)
+        return totals.tolist(), scaled.astype(np.int64).tolist()
+
+    def score_many(
+        self,
+        submissions: Sequence[Mapping[str, object]],
+    ) -> list[ComputedScores | SurveyResponseError]:
+        """Score a batch of submissions, returning a score or an error per row."""
+
+        outcomes: list[ComputedScores | SurveyResponseError | None] = []
+        matrix: list[list[int]] = []
+        positions: list[int] = []
+        for position, responses in enumerate(submissions):
+            try:
+                matrix.append(self.coerce(responses))
+            except SurveyResponseError as exc:
+                outcomes.append(exc)
+            else:
+                outcomes.append(None)
+                positions.append(position)
+
+        sums, scaled = self.score_matrix(matrix)
+        for position, answers, row_sums, row_scaled in zip(positions, matrix, sums, scaled):
+            outcomes[position] = ComputedScores(
+                raw_scores=dict(zip(self.codes, answers)),
+                trait_sums=dict(zip(TRAIT_ORDER, row_sums)),
+                scaled_scores=dict(zip(TRAIT_ORDER, row_scaled)),
+            )
+        return outcomes
+
+    def _describe_errors(self, responses: Mapping[str, object]) -> SurveyResponseError:
+        # Slow path: walk the submission in its own order, like DRF would.
+        invalid: dict[str, str] = {}
+        for code, value in responses.items():
+            _, error = _coerce_response(value)
+            if error is not None:
+                invalid[str(code)] = error
+        missing = [code for code in self.codes if code not in responses]
+        extra = sorted(str(code) for code in responses if code not in self.slot_of)
+        return SurveyResponseError(invalid=invalid, missing=missing, extra=extra)
+
+
+def build_survey_result(computed: ComputedScores) -> SurveyResult:
+    """Return an unsaved ``SurveyResult`` populated from computed scores."""
 
-    computed = compute_trait_scores(items, responses)
     trait_sums = computed.trait_sums
     scaled = computed.scaled_scores
 
-    return SurveyResult.objects.create(
+    return SurveyResult(
         raw_scores=computed.raw_scores,
         sum_O=trait_sums["O"],
         sum_C=trait_sums["C"],
@@ -77,6 +260,67 @@ def create_survey_result(
     )
 
 
+def create_survey_result(
+    items: Iterable[PersonalityItem],
+    responses: Mapping[str, int | str],
+    *,
+    computed: ComputedScores | None = None,
+) -> SurveyResult:
+    """Persist a scored survey submission and return the saved model.
+
+    Callers that already scored the submission (the API serializer does) pass
+    ``computed`` so the responses are not scored a second time. The trait sums
+    are added to the norms histograms in the same transaction.
+    """
+
+    if computed is None:
+        computed = ScoringPlan.compile(items).score(responses)
+    result = build_survey_result(computed)
+    with server_timing.phase("insert"), transaction.atomic():
+        result.save(force_insert=True)
+        record_results([result])
+    return result
+
+
+def bulk_create_survey_results(
+    computed: Sequence[ComputedScores],
+    *,
+    chunk_size: int = 500,
+) -> list[SurveyResult]:
+    """Persist many scored submissions with one INSERT per chunk.
+
+    Each chunk commits in its own transaction so a large batch never holds a
+    single long write lock on the results table.
+    """
+
+    created: list[SurveyResult] = []
+    for start in range(0, len(computed), chunk_size):
+        chunk = [build_survey_result(scores) for scores in computed[start : start + chunk_size]]
+        with transaction.atomic():
+            chunk = SurveyResult.objects.bulk_create(chunk)
+            record_results(chunk)
+        created.extend(chunk)
+    return created
+
+
+def _coerce_response(value: object) -> tuple[int, str | None]:
+    if value is _MISSING:
+        return 0, "required"
+    if value is None:
+        return 0, "null"
+    if isinstance(value, str) and len(value) > _MAX_STRING_LENGTH:
+        return 0, "max_string_length"
+    try:
+        numeric = int(_DECIMAL_SUFFIX.sub("", str(value)))
+    except (TypeError, ValueError):
+        return 0, "invalid"
+    if numeric < MIN_ANSWER:
+        return numeric, "min_value"
+    if numeric > MAX_ANSWER:
+        return numeric, "max_value"
+    return numeric, None
+
+
 def _coerce_answer(value: int | str, *, code: str) -> int:
     try:
         numeric = int(value)
@@ -0,0 +1,116 @@
+"""Tests for the survey result admin changelist on large tables."""
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest import mock
+from urllib.parse import parse_qsl
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from config.admin_scaling import uuid_search_bounds
+from survey.admin import SurveyResultAdmin
+from survey.models import SurveyResult
+
+
+def _create_result(days_ago: int = 0, memo: str = "") -> SurveyResult:
+    result = SurveyResult.objects.create(
+        raw_scores={},
+        memo=memo,
+        sum_O=5,
+        sum_C=5,
+        sum_E=5,
+        sum_A=5,
+        sum_N=5,
+        scaled_O=100,
+        scaled_C=100,
+        scaled_E=100,
+        scaled_A=100,
+        scaled_N=100,
+    )
+    SurveyResult.objects.filter(pk=result.pk).update(created_at=timezone.now() - timedelta(days=days_ago))
+    return SurveyResult.objects.get(pk=result.pk)
+
+
+class SurveyResultAdminTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        user = get_user_model().objects.create_superuser("admin", "admin@example.com", "pass")
+        self.client.force_login(user)
+        self.url = reverse("admin:survey_surveyresult_changelist")
+
+    def test_keyset_pagination_walks_all_rows(self) -> None:
+        results = [_create_result(days_ago=index) for index in range(5)]
+
+        seen = []
+        params: dict[str, str] = {}
+        with mock.patch.object(SurveyResultAdmin, "list_per_page", 2):
+            for _ in range(5):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, 200)
+                cl = response.context["cl"]
+                seen.extend(obj.pk for obj in cl.result_list)
+                if not cl.keyset_next_url:
+                    break
+                params = dict(parse_qsl(cl.keyset_next_url.lstrip("?")))
+
+        self.assertEqual(seen, [result.pk for result in results])
+
+    def test_invalid_cursor_is_rejected(self) -> None:
+        response = self.client.get(self.url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 302)
+        self.assertIn("e=1", response["Location"])
+
+    @override_settings(ADMIN_COUNT_ESTIMATE_THRESHOLD=3)
+    def test_counts_are_capped_beyond_threshold(self) -> None:
+        for index in range(5):
+            _create_result(days_ago=index)
+
+        response = self.client.get(self.url)
+
+        cl = response.context["cl"]
+        self.assertEqual(cl.result_count, 4)
+        self.assertTrue(cl.paginator.approximate)
+        self.assertIsNone(cl.full_result_count)
+        self.assertContains(response, "約4")
+
+    def test_uuid_prefix_search_uses_primary_key_range(self) -> None:
+        target = _create_result(memo="target")
+        _create_result(memo="other")
+
+        for term in (str(target.pk), str(target.pk)[:8], str(target.pk).upper()[:13]):
+            response = self.client.get(self.url, {"q": term})
+            self.assertEqual([obj.pk for obj in response.context["cl"].result_list], [target.pk], term)
+
+        response = self.client.get(self.url, {"q": "other"})
+        self.assertEqual([obj.memo for obj in response.context["cl"].result_list], ["other"])
+
+    def test_month_filter_choices_and_lookup(self) -> None:
+        recent = _create_result()
+        old = _create_result(days_ago=70)
+
+        response = self.client.get(self.url)
+        month_filter = next(
+            spec for spec in response.context["cl"].filter_specs if getattr(spec, "parameter_name", None) == "created_at__month"
+        )
+        choices = [value for value, _ in month_filter.lookup_choices]
+        self.assertEqual(choices[0], f"{timezone.localdate(recent.created_at):%Y-%m}")
+        self.assertIn(f"{timezone.localdate(old.created_at):%Y-%m}", choices)
+
+        response = self.client.get(self.url, {"created_at__month": choices[-1]})
+        self.assertEqual([obj.pk for obj in response.context["cl"].result_list], [old.pk])
+
+
+class UuidSearchBoundsTests(TestCase):
+    def test_short_or_non_hex_terms_fall_through(self) -> None:
+        self.assertIsNone(uuid_search_bounds("abc"))
+        self.assertIsNone(uuid_search_bounds("メモ"))
+        self.assertIsNone(uuid_search_bounds("zzzzzzzzzz"))
+
+    def test_prefix_bounds(self) -> None:
+        low, high = uuid_search_bounds("1234abcd-ef")
+        self.assertEqual(str(low), "1234abcd-ef00-0000-0000-000000000000")
+        self.assertEqual(str(high), "1234abcd-efff-ffff-ffff-ffffffffffff")
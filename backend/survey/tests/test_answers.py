@@ -0,0 +1,65 @@
+"""Tests for bit-packed raw answer storage."""
+from __future__ import annotations
+
+from django.test import SimpleTestCase, TestCase
+
+from survey import answers
+from survey.models import AnswerLayout, SurveyResult
+
+CODES = tuple(f"{trait}{index}" for trait in "OCEAN" for index in range(1, 11))
+
+
+def _result(raw_scores: dict) -> SurveyResult:
+    return SurveyResult.objects.create(
+        raw_scores=raw_scores,
+        **{f"sum_{trait}": 30 for trait in "OCEAN"},
+        **{f"scaled_{trait}": 50 for trait in "OCEAN"},
+    )
+
+
+class PackingTests(SimpleTestCase):
+    def test_round_trip_uses_three_bits_per_answer(self) -> None:
+        values = [index % 5 + 1 for index in range(50)]
+        blob = answers.pack(values)
+
+        self.assertEqual(len(blob), 19)
+        self.assertEqual(answers.unpack(blob, 50), values)
+
+    def test_values_wider_than_three_bits_are_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            answers.pack([8])
+
+
+class PackedAnswersModelTests(TestCase):
+    def setUp(self) -> None:
+        answers.clear_layout_cache()
+
+    def test_accessor_returns_code_mapping(self) -> None:
+        raw = {code: index % 5 + 1 for index, code in enumerate(CODES)}
+        result = _result(raw)
+        result.refresh_from_db()
+
+        self.assertEqual(result.raw_scores, raw)
+        self.assertEqual(list(result.raw_scores), list(CODES))
+        self.assertEqual(len(bytes(result.packed_answers)), 19)
+
+    def test_results_with_the_same_items_share_a_layout(self) -> None:
+        first = _result({code: 3 for code in CODES})
+        second = _result({code: 4 for code in CODES})
+        partial = _result({"O1": 5})
+
+        self.assertEqual(first.answer_layout_id, second.answer_layout_id)
+        self.assertEqual(AnswerLayout.objects.count(), 2)
+        partial.refresh_from_db()
+        self.assertEqual(partial.raw_scores, {"O1": 5})
+
+    def test_scrub_clears_answers(self) -> None:
+        kept = _result({"O1": 3})
+        scrubbed = _result({"O1": 4})
+
+        self.assertEqual(SurveyResult.objects.filter(pk=scrubbed.pk).scrub_answers(), 1)
+
+        scrubbed.refresh_from_db()
+        self.assertEqual(scrubbed.raw_scores, {})
+        self.assertEqual(list(SurveyResult.objects.with_answers()), [kept])
+        self.assertEqual(_result({}).answer_layout_id, None)
@@ -3,10 +3,12 @@ from __future__ import annotations
 
 import json
 
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from django.core.signing import TimestampSigner
 
+from survey.catalog import invalidate_catalog
 from survey.models import PersonalityItem, SurveyResult
 
 
@@ -29,6 +31,10 @@ class SurveyAPITests(TestCase):
                 )
         PersonalityItem.objects.bulk_create(items)
 
+    def setUp(self) -> None:
+        # bulk_create bypasses the save signals that keep the catalog fresh.
+        invalidate_catalog()
+
     def test_items_endpoint_returns_all_questions(self) -> None:
         response = self.client.get(reverse("survey_api:items"))
         self.assertEqual(response.status_code, 200)
@@ -117,3 +123,79 @@ class SurveyAPITests(TestCase):
         )
         response = self.client.get(reverse("survey_api:result-detail", kwargs={"pk": result.pk}))
         self.assertEqual(response.status_code, 403)
+
+
+class SurveyBatchAPITests(TestCase):
+    """Ensure the batch endpoint scores rows independently and persists valid ones."""
+
+    fixtures = ["items.json"]
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.codes = list(PersonalityItem.objects.order_by("order").values_list("code", flat=True))
+        cls.staff = get_user_model().objects.create_user("importer", password="x", is_staff=True)
+
+    def setUp(self) -> None:
+        invalidate_catalog()
+        self.client.force_login(self.staff)
+
+    def _post(self, submissions):
+        return self.client.post(
+            reverse("survey_api:score-batch"),
+            data=json.dumps({"submissions": submissions}),
+            content_type="application/json",
+        )
+
+    def test_batch_persists_valid_rows_and_reports_invalid_ones(self) -> None:
+        valid = {code: 4 for code in self.codes}
+        missing = {"O1": 4}
+        response = self._post([valid, missing, "not-a-map", valid])
+
+        self.assertEqual(response.status_code, 201)
+        body = response.json()
+        self.assertEqual(body["created"], 2)
+        self.assertEqual(body["failed"], 2)
+        rows = body["results"]
+        self.assertIn("token", rows[0])
+        self.assertIn("responses", rows[1]["errors"])
+        self.assertIn("responses", rows[2]["errors"])
+        self.assertEqual(SurveyResult.objects.count(), 2)
+        self.assertTrue(SurveyResult.objects.filter(pk=rows[3]["id"]).exists())
+
+    def test_batch_scores_match_single_submission_endpoint(self) -> None:
+        submissions = [
+            {code: (index + offset) % 5 + 1 for offset, code in enumerate(self.codes)}
+            for index in range(40)
+        ]
+        with override_settings(SURVEY_BATCH_CREATE_CHUNK_SIZE=7):
+            response = self._post(submissions)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["created"], 40)
+
+        for row, responses in zip(response.json()["results"], submissions):
+            single = self.client.post(
+                reverse("survey_api:score"),
+                data=json.dumps({"responses": responses}),
+                content_type="application/json",
+            ).json()
+            batch_result = SurveyResult.objects.get(pk=row["id"])
+            self.assertEqual(
+                batch_result.trait_sum_map,
+                SurveyResult.objects.get(pk=single["id"]).trait_sum_map,
+            )
+
+    def test_batch_requires_staff(self) -> None:
+        valid = {code: 3 for code in self.codes}
+        self.client.logout()
+        self.assertEqual(self._post([valid]).status_code, 403)
+        self.client.force_login(get_user_model().objects.create_user("visitor", password="x"))
+        self.assertEqual(self._post([valid]).status_code, 403)
+        self.assertEqual(SurveyResult.objects.count(), 0)
+
+    @override_settings(SURVEY_BATCH_MAX_SUBMISSIONS=2)
+    def test_batch_rejects_oversized_payload(self) -> None:
+        valid = {code: 3 for code in self.codes}
+        response = self._post([valid, valid, valid])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("submissions", response.json())
+        self.assertEqual(SurveyResult.objects.count(), 0)
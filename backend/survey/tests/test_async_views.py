@@ -0,0 +1,84 @@
+"""Tests for the native async API views."""
+from __future__ import annotations
+
+import json
+from unittest import mock
+
+from django.test import AsyncRequestFactory, RequestFactory, TestCase, override_settings
+
+from config.caching import NamespacedCache
+
+from survey import result_cache
+from survey.api.async_views import AsyncPersonalityItemListView, AsyncSurveyResultDetailView, AsyncSurveyScoreView
+from survey.api.views import PersonalityItemListView, SurveyScoreView
+from survey.catalog import invalidate_catalog
+from survey.models import PersonalityItem, SurveyResult
+from survey.tokens import signer
+
+
+class AsyncApiViewTests(TestCase):
+    fixtures = ["items.json"]
+
+    def setUp(self) -> None:
+        invalidate_catalog()
+        result_cache.clear_result_cache()
+        self.factory = AsyncRequestFactory()
+
+    async def _score(self, body: dict):
+        request = self.factory.post("/api/score/", data=json.dumps(body), content_type="application/json")
+        response = await AsyncSurveyScoreView.as_view()(request)
+        return response, json.loads(response.content)
+
+    async def _detail(self, pk, token: str | None):
+        headers = {"X-Result-Token": token} if token else {}
+        request = self.factory.get(f"/api/results/{pk}/", headers=headers)
+        return await AsyncSurveyResultDetailView.as_view()(request, pk=pk)
+
+    async def test_score_then_read_result_from_database(self) -> None:
+        codes = [code async for code in PersonalityItem.objects.values_list("code", flat=True)]
+        response, created = await self._score({"responses": {code: 4 for code in codes}})
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(await SurveyResult.objects.filter(pk=created["id"]).aexists())
+
+        result_cache.clear_result_cache()
+        detail = await self._detail(created["id"], created["token"])
+
+        self.assertEqual(detail.status_code, 200)
+        self.assertIn("ETag", detail)
+        body = json.loads(detail.content)
+        self.assertEqual(body["trait_scores"], created["trait_scores"])
+        self.assertEqual(body["created_at"], created["created_at"])
+
+    @override_settings(SURVEY_RESULT_CACHE_SHARED=True, SURVEY_RESULT_COMPACT_TOKENS=True)
+    async def test_shared_cache_is_used_without_blocking_calls(self) -> None:
+        codes = [code async for code in PersonalityItem.objects.values_list("code", flat=True)]
+        blocking = AssertionError("sync cache call on the event loop")
+        with mock.patch.object(NamespacedCache, "get", side_effect=blocking), mock.patch.object(
+            NamespacedCache, "set", side_effect=blocking
+        ):
+            response, created = await self._score({"responses": {code: 2 for code in codes}})
+            self.assertEqual(response.status_code, 201)
+            result_cache._cache.clear()
+            detail = await self._detail(created["id"], created["token"])
+
+        self.assertEqual(detail.status_code, 200)
+        self.assertEqual(json.loads(detail.content)["trait_scores"], created["trait_scores"])
+
+    async def test_errors_match_sync_views(self) -> None:
+        response, body = await self._score({"responses": {"E1": 9}})
+        sync = SurveyScoreView.as_view()(
+            RequestFactory().post("/api/score/", data=json.dumps({"responses": {"E1": 9}}), content_type="application/json")
+        )
+        self.assertEqual((response.status_code, body), (sync.status_code, sync.data))
+
+        self.assertEqual((await self._detail("0" * 32, None)).status_code, 403)
+        missing = await self._detail("00000000-0000-0000-0000-000000000000", signer.sign("00000000-0000-0000-0000-000000000000"))
+        self.assertEqual(missing.status_code, 404)
+
+    async def test_items_match_sync_bytes(self) -> None:
+        response = await AsyncPersonalityItemListView.as_view()(self.factory.get("/api/items/"))
+        sync = PersonalityItemListView.as_view()(RequestFactory().get("/api/items/"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, sync.content)
+        self.assertEqual(response["ETag"], sync["ETag"])
@@ -0,0 +1,59 @@
+"""Tests for the in-process personality item catalog."""
+from __future__ import annotations
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from survey.catalog import catalog_stats, get_catalog, invalidate_catalog
+from survey.models import PersonalityItem
+
+
+class ItemCatalogTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        PersonalityItem.objects.bulk_create(
+            [
+                PersonalityItem(code="O1", text_ja="テキスト1", trait="O", is_reversed=False, order=1),
+                PersonalityItem(code="C1", text_ja="テキスト2", trait="C", is_reversed=True, order=2),
+            ]
+        )
+
+    def setUp(self) -> None:
+        invalidate_catalog()
+
+    def test_catalog_is_loaded_once_and_reused(self) -> None:
+        with self.assertNumQueries(1):
+            first = get_catalog()
+        before = catalog_stats()
+        with self.assertNumQueries(0):
+            second = get_catalog()
+        self.assertIs(first, second)
+        self.assertEqual(first.codes, ("O1", "C1"))
+        self.assertEqual(catalog_stats()["hits"], before["hits"] + 1)
+
+    def test_item_save_bumps_version_and_reloads(self) -> None:
+        first = get_catalog()
+        reloads = catalog_stats()["reloads"]
+
+        item = PersonalityItem.objects.get(code="C1")
+        item.is_reversed = False
+        item.save()
+
+        second = get_catalog()
+        self.assertGreater(second.version, first.version)
+        self.assertNotEqual(second.fingerprint, first.fingerprint)
+        self.assertFalse(second.items[1].is_reversed)
+        self.assertEqual(catalog_stats()["reloads"], reloads + 1)
+
+    def test_item_delete_removes_item_from_catalog(self) -> None:
+        get_catalog()
+        PersonalityItem.objects.get(code="O1").delete()
+        self.assertEqual(get_catalog().codes, ("C1",))
+
+    @override_settings(SURVEY_ITEM_CATALOG_TTL_SECONDS=0)
+    def test_items_endpoint_reads_from_catalog(self) -> None:
+        get_catalog()
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("survey_api:items"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["code"] for row in response.json()], ["O1", "C1"])
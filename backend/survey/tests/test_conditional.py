@@ -0,0 +1,120 @@
+"""Tests for ETag-based conditional GETs on the survey API."""
+from __future__ import annotations
+
+import gzip
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from survey import result_cache
+from survey.api import views
+from survey.api.serializers import PersonalityItemSerializer
+from survey.catalog import get_catalog, invalidate_catalog
+from survey.models import PersonalityItem, SurveyResult
+from survey.tokens import signer
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        PersonalityItem.objects.create(code="O1", text_ja="テキスト", trait="O", is_reversed=False, order=1)
+        cls.result = SurveyResult.objects.create(
+            raw_scores={},
+            sum_O=30,
+            sum_C=30,
+            sum_E=30,
+            sum_A=30,
+            sum_N=30,
+            scaled_O=50,
+            scaled_C=50,
+            scaled_E=50,
+            scaled_A=50,
+            scaled_N=50,
+        )
+
+    def setUp(self) -> None:
+        invalidate_catalog()
+        result_cache.clear_result_cache()
+
+    def test_items_return_304_for_matching_etag(self) -> None:
+        response = self.client.get(reverse("survey_api:items"))
+        etag = response["ETag"]
+        self.assertIn("max-age", response["Cache-Control"])
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(reverse("survey_api:items"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached["ETag"], etag)
+
+    def test_items_etag_changes_with_catalog(self) -> None:
+        etag = self.client.get(reverse("survey_api:items"))["ETag"]
+        item = PersonalityItem.objects.get(code="O1")
+        item.text_ja = "変更後"
+        item.save()
+
+        response = self.client.get(reverse("survey_api:items"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_result_returns_304_without_touching_database(self) -> None:
+        url = reverse("survey_api:result-detail", kwargs={"pk": self.result.pk})
+        token = signer.sign(str(self.result.pk))
+        etag = self.client.get(url, HTTP_X_RESULT_TOKEN=token)["ETag"]
+        result_cache.clear_result_cache()
+        get_catalog()
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_X_RESULT_TOKEN=token, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+
+    def test_result_etag_still_requires_token(self) -> None:
+        url = reverse("survey_api:result-detail", kwargs={"pk": self.result.pk})
+        etag = self.client.get(url, HTTP_X_RESULT_TOKEN=signer.sign(str(self.result.pk)))["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 403)
+
+
+class ItemsEncodingTests(TestCase):
+    fixtures = ["items.json"]
+
+    def setUp(self) -> None:
+        invalidate_catalog()
+        # The rendered body is shared per catalog fingerprint; start from nothing.
+        cache.clear()
+        views._items_body = None
+
+    def test_gzip_variant_matches_identity_body(self) -> None:
+        plain = self.client.get(reverse("survey_api:items"))
+        compressed = self.client.get(reverse("survey_api:items"), HTTP_ACCEPT_ENCODING="gzip, deflate")
+
+        self.assertNotIn("Content-Encoding", plain)
+        self.assertEqual(compressed["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(compressed.content), plain.content)
+        self.assertEqual(int(compressed["Content-Length"]), len(compressed.content))
+        self.assertEqual(int(plain["Content-Length"]), len(plain.content))
+        self.assertIn("Accept-Encoding", compressed["Vary"])
+        self.assertNotEqual(compressed["ETag"], plain["ETag"])
+        self.assertEqual(json.loads(plain.content)[0]["code"], "E1")
+
+    def test_refused_encodings_fall_back_to_identity(self) -> None:
+        response = self.client.get(reverse("survey_api:items"), HTTP_ACCEPT_ENCODING="gzip;q=0, br;q=0")
+        self.assertNotIn("Content-Encoding", response)
+
+    def test_body_is_rendered_once_per_catalog(self) -> None:
+        with mock.patch(
+            "survey.api.views.PersonalityItemSerializer", wraps=PersonalityItemSerializer
+        ) as serializer:
+            self.client.get(reverse("survey_api:items"))
+            self.client.get(reverse("survey_api:items"), HTTP_ACCEPT_ENCODING="gzip")
+            self.assertEqual(serializer.call_count, 1)
+
+            item = PersonalityItem.objects.get(code="E1")
+            item.text_ja = "変更後"
+            item.save()
+            body = self.client.get(reverse("survey_api:items")).json()
+            self.assertEqual(serializer.call_count, 2)
+        self.assertEqual(body[0]["text"], "変更後")
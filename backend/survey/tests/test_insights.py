@@ -1,10 +1,22 @@
 """Unit tests for the scoring insights helpers."""
 from __future__ import annotations
 
+import random
+
 from django.test import SimpleTestCase
 
-from survey.constants import TRAIT_ORDER
-from survey.insights import compute_highlights, compute_trait_displays
+from survey.constants import MAX_SCORE, MIN_SCORE, TRAIT_ORDER
+from survey.insights import (
+    _calculate_z_score,
+    _scale_to_percentage,
+    clear_insights_cache,
+    compute_highlights,
+    compute_trait_displays,
+    insights_cache_stats,
+    serialize_highlights,
+    serialize_insights,
+    serialize_trait_displays,
+)
 
 
 class InsightComputationTests(SimpleTestCase):
@@ -28,3 +40,37 @@ class InsightComputationTests(SimpleTestCase):
         self.assertEqual(highlights.signature_caution.trait, "N")
         strong_traits = {card.trait for card in highlights.strong_candidates}
         self.assertIn("C", strong_traits)
+
+
+class InsightMemoTests(SimpleTestCase):
+    def setUp(self) -> None:
+        clear_insights_cache()
+
+    def test_tables_match_direct_computation(self) -> None:
+        for total in range(MIN_SCORE, MAX_SCORE + 1):
+            display = compute_trait_displays({trait: total for trait in TRAIT_ORDER})[0]
+            raw_mean = _scale_to_percentage(total)
+            self.assertEqual(display.raw_mean, round(raw_mean, 2))
+            self.assertEqual(display.z_score, round(_calculate_z_score(raw_mean), 4))
+
+    def test_memoised_payload_matches_uncached(self) -> None:
+        rng = random.Random(7)
+        for _ in range(300):
+            trait_sums = {trait: rng.randint(MIN_SCORE, MAX_SCORE) for trait in TRAIT_ORDER}
+            rows, highlights = serialize_trait_displays(trait_sums)
+            self.assertEqual(serialize_insights(trait_sums), (rows, serialize_highlights(highlights)))
+
+    def test_repeated_profiles_hit_the_cache(self) -> None:
+        speeder = {trait: 30 for trait in TRAIT_ORDER}
+        before = insights_cache_stats()
+        first = serialize_insights(speeder)
+        second = serialize_insights(dict(speeder))
+
+        self.assertIs(first, second)
+        after = insights_cache_stats()
+        self.assertEqual((after["hits"] - before["hits"], after["misses"] - before["misses"]), (1, 1))
+
+    def test_display_rows_have_no_instance_dict(self) -> None:
+        display = compute_trait_displays({trait: 30 for trait in TRAIT_ORDER})[0]
+        self.assertFalse(hasattr(display, "__dict__"))
+        self.assertEqual(display.level, "neutral")
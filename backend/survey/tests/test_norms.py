@@ -0,0 +1,148 @@
+"""Tests for the empirical norms histograms and lookups."""
+from __future__ import annotations
+
+import json
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from survey import result_cache
+from survey.catalog import invalidate_catalog
+from survey.models import PersonalityItem, SurveyResult, TraitScoreBucket
+from survey.norms import BINS, TraitNorm, get_norms, invalidate_norms, load_histograms, rebuild_histograms
+from survey.services import ComputedScores, bulk_create_survey_results
+from survey.tokens import signer
+
+
+def _computed(total: int) -> ComputedScores:
+    return ComputedScores(
+        raw_scores={},
+        trait_sums={trait: total for trait in "OCEAN"},
+        scaled_scores={trait: 50 for trait in "OCEAN"},
+    )
+
+
+class TraitNormTests(SimpleTestCase):
+    def test_percentile_and_z_from_histogram(self) -> None:
+        counts = [0] * BINS
+        counts[20 - 10] = 1
+        counts[30 - 10] = 2
+        counts[40 - 10] = 1
+        norm = TraitNorm.from_counts("O", counts)
+
+        self.assertEqual(norm.mean, 30)
+        self.assertAlmostEqual(norm.sd, 50 ** 0.5)
+        self.assertEqual(norm.percentile(30), 50.0)
+        self.assertEqual(norm.percentile(20), 12.5)
+        self.assertEqual(norm.percentile(10), 0.0)
+        self.assertEqual(norm.percentile(50), 100.0)
+        self.assertEqual(norm.z_score(30), 0.0)
+
+
+class NormsHistogramTests(TestCase):
+    def setUp(self) -> None:
+        invalidate_norms()
+
+    def test_saved_results_increment_daily_buckets(self) -> None:
+        bulk_create_survey_results([_computed(30), _computed(30), _computed(42)], chunk_size=2)
+
+        today = timezone.localdate()
+        bucket = TraitScoreBucket.objects.get(day=today, trait="O", score=30)
+        self.assertEqual(bucket.count, 2)
+        histograms = load_histograms()
+        self.assertEqual(sum(histograms["N"]), 3)
+        self.assertEqual(histograms["E"][42 - 10], 1)
+
+    def test_rebuild_matches_incremental_counts(self) -> None:
+        bulk_create_survey_results([_computed(score) for score in (12, 25, 25, 49)])
+        incremental = load_histograms()
+        TraitScoreBucket.objects.update(count=0)
+
+        self.assertEqual(rebuild_histograms(), 15)
+        self.assertEqual(load_histograms(), incremental)
+
+    @override_settings(SURVEY_NORMS_WINDOW_DAYS=7)
+    def test_window_ignores_old_buckets(self) -> None:
+        bulk_create_survey_results([_computed(20)])
+        TraitScoreBucket.objects.create(
+            day=timezone.localdate() - timedelta(days=30), trait="O", score=45, count=10
+        )
+
+        self.assertEqual(sum(load_histograms()["O"]), 1)
+
+    @override_settings(SURVEY_NORMS_ENABLED=True, SURVEY_NORMS_MIN_SAMPLES=3)
+    def test_norms_require_minimum_samples(self) -> None:
+        bulk_create_survey_results([_computed(20), _computed(40)])
+        self.assertIsNone(get_norms())
+
+        bulk_create_survey_results([_computed(30)])
+        invalidate_norms()
+        norms = get_norms()
+        self.assertEqual(norms.samples, 3)
+        self.assertEqual(norms["C"].mean, 30)
+
+    def test_rebuild_command_reports_buckets(self) -> None:
+        bulk_create_survey_results([_computed(20)])
+        out = StringIO()
+        call_command("rebuild_trait_norms", stdout=out)
+        self.assertIn("Rebuilt 5 histogram buckets", out.getvalue())
+
+
+@override_settings(SURVEY_NORMS_ENABLED=True, SURVEY_NORMS_MIN_SAMPLES=2)
+class NormsPayloadTests(TestCase):
+    fixtures = ["items.json"]
+
+    def setUp(self) -> None:
+        invalidate_catalog()
+        invalidate_norms()
+        result_cache.clear_result_cache()
+
+    def _submit(self, answer: int) -> dict:
+        responses = {item.code: answer for item in PersonalityItem.objects.all()}
+        return self.client.post(
+            reverse("survey_api:score"),
+            data=json.dumps({"responses": responses}),
+            content_type="application/json",
+        ).json()
+
+    def test_payload_reports_percentiles_once_norms_are_active(self) -> None:
+        first = self._submit(2)
+        self.assertIsNone(first["trait_scores"][0]["percentile"])
+
+        self._submit(4)
+        invalidate_norms()
+        third = self._submit(4)
+
+        row = third["trait_scores"][0]
+        self.assertEqual(row["percentile"], round((1 + 2 / 2) / 3 * 100, 1))
+        self.assertGreater(row["z"], 0)
+
+    def test_result_etag_follows_norms_version(self) -> None:
+        created = self._submit(3)
+        url = reverse("survey_api:result-detail", kwargs={"pk": created["id"]})
+        token = signer.sign(created["id"])
+        etag = self.client.get(url, HTTP_X_RESULT_TOKEN=token)["ETag"]
+
+        SurveyResult.objects.create(
+            raw_scores={},
+            sum_O=10,
+            sum_C=10,
+            sum_E=10,
+            sum_A=10,
+            sum_N=10,
+            scaled_O=0,
+            scaled_C=0,
+            scaled_E=0,
+            scaled_A=0,
+            scaled_N=0,
+        )
+        rebuild_histograms()
+
+        response = self.client.get(url, HTTP_X_RESULT_TOKEN=token, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertIsNotNone(response.json()["trait_scores"][0]["percentile"])
@@ -0,0 +1,122 @@
+"""Tests for read-replica configuration, routing and primary pinning."""
+from __future__ import annotations
+
+import json
+import os
+from unittest import mock
+
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+
+from config.db_router import ReplicaRouter, pin_after_write, pin_to_primary, reads_use_replica, replica_reads
+from config.middleware import ReplicaPinMiddleware
+from config.settings import replica_configs_from_env
+from survey.catalog import invalidate_catalog
+from survey.models import PersonalityItem, SurveyResult
+
+REPLICAS = mock.patch("config.db_router.replica_aliases", return_value=("replica_1",))
+MIDDLEWARE_REPLICAS = mock.patch("config.middleware.replica_aliases", return_value=("replica_1",))
+
+
+class ReplicaSettingsTests(SimpleTestCase):
+    def test_replica_urls_become_mirrored_aliases(self) -> None:
+        env = {"DATABASE_REPLICA_URLS": "postgres://u:p@replica-a/app, postgres://u:p@replica-b:6432/app"}
+        with mock.patch.dict(os.environ, env, clear=True):
+            replicas = replica_configs_from_env()
+
+        self.assertEqual(list(replicas), ["replica_1", "replica_2"])
+        self.assertEqual(replicas["replica_1"]["HOST"], "replica-a")
+        self.assertEqual(replicas["replica_2"]["PORT"], 6432)
+        self.assertEqual(replicas["replica_2"]["TEST"], {"MIRROR": "default"})
+
+    def test_no_replicas_by_default(self) -> None:
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.assertEqual(replica_configs_from_env(), {})
+
+
+class ReplicaRouterTests(TestCase):
+    def setUp(self) -> None:
+        self.router = ReplicaRouter()
+        patcher = REPLICAS
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reads_use_replica_only_when_opted_in(self) -> None:
+        # TestCase wraps each test in a transaction, which keeps reads on the primary.
+        with mock.patch("config.db_router.connections") as connections:
+            connections.__getitem__.return_value.in_atomic_block = False
+            self.assertEqual(self.router.db_for_read(SurveyResult), "default")
+            with replica_reads():
+                self.assertEqual(self.router.db_for_read(SurveyResult), "replica_1")
+            with replica_reads(pinned=True):
+                self.assertEqual(self.router.db_for_read(SurveyResult), "default")
+            with pin_to_primary(), replica_reads():
+                self.assertEqual(self.router.db_for_read(SurveyResult), "default")
+
+    def test_writes_and_transactions_stay_on_primary(self) -> None:
+        with transaction.atomic(), replica_reads():
+            self.assertFalse(reads_use_replica())
+            self.assertEqual(self.router.db_for_read(SurveyResult), "default")
+        self.assertEqual(self.router.db_for_write(SurveyResult), "default")
+        self.assertFalse(self.router.allow_migrate("replica_1", "survey"))
+
+
+class ReplicaPinMiddlewareTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.factory = RequestFactory()
+        for patcher in (REPLICAS, MIDDLEWARE_REPLICAS):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _run(self, request, status: int = 201, *, writes: bool = False):
+        seen = {}
+
+        def view(request):
+            if writes:
+                pin_after_write(request)
+            with replica_reads(), mock.patch("config.db_router.connections") as connections:
+                connections.__getitem__.return_value.in_atomic_block = False
+                seen["replica"] = reads_use_replica()
+            return HttpResponse(status=status)
+
+        return ReplicaPinMiddleware(view)(request), seen["replica"]
+
+    def test_successful_write_pins_following_reads(self) -> None:
+        response, _ = self._run(self.factory.post("/api/score/"), writes=True)
+        cookie = response.cookies[ReplicaPinMiddleware.COOKIE_NAME]
+        self.assertTrue(cookie["httponly"])
+
+        request = self.factory.get("/api/items/")
+        request.COOKIES[ReplicaPinMiddleware.COOKIE_NAME] = cookie.value
+        _, used_replica = self._run(request, status=200)
+        self.assertFalse(used_replica)
+
+    def test_reads_without_pin_use_replica(self) -> None:
+        response, used_replica = self._run(self.factory.get("/api/items/"), status=200)
+        self.assertTrue(used_replica)
+        self.assertNotIn(ReplicaPinMiddleware.COOKIE_NAME, response.cookies)
+
+    def test_failed_write_does_not_pin(self) -> None:
+        response, _ = self._run(self.factory.post("/api/score/"), status=400, writes=True)
+        self.assertNotIn(ReplicaPinMiddleware.COOKIE_NAME, response.cookies)
+
+    def test_writes_without_opt_in_do_not_pin(self) -> None:
+        response, _ = self._run(self.factory.post("/api/events/batch"), status=202)
+        self.assertNotIn(ReplicaPinMiddleware.COOKIE_NAME, response.cookies)
+
+
+class ScoreViewPinTests(TestCase):
+    fixtures = ["items.json"]
+
+    def setUp(self) -> None:
+        invalidate_catalog()
+        MIDDLEWARE_REPLICAS.start()
+        self.addCleanup(MIDDLEWARE_REPLICAS.stop)
+
+    def test_scoring_pins_the_client(self) -> None:
+        body = {"responses": {code: 3 for code in PersonalityItem.objects.values_list("code", flat=True)}}
+        response = self.client.post("/api/score/", json.dumps(body), content_type="application/json")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertIn(ReplicaPinMiddleware.COOKIE_NAME, response.cookies)
@@ -0,0 +1,71 @@
+"""Tests for the bulk rescoring management command."""
+from __future__ import annotations
+
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from survey.catalog import invalidate_catalog
+from survey.models import PersonalityItem, SurveyResult
+from survey.services import ScoringPlan, create_survey_result
+
+
+class RescoreResultsCommandTests(TestCase):
+    fixtures = ["items.json"]
+
+    def setUp(self) -> None:
+        invalidate_catalog()
+        items = list(PersonalityItem.objects.all())
+        self.results = [
+            create_survey_result(items, {item.code: (offset + index) % 5 + 1 for index, item in enumerate(items)})
+            for offset in range(5)
+        ]
+        self.scrubbed = create_survey_result(items, {item.code: 5 for item in items})
+        SurveyResult.objects.filter(pk=self.scrubbed.pk).scrub_answers()
+        self.scrubbed_sum_O = self.scrubbed.sum_O
+        # Correct an item key after results were stored.
+        PersonalityItem.objects.filter(code__in=["O1", "E3"]).update(is_reversed=True)
+
+    def _expected(self, result: SurveyResult) -> dict[str, int]:
+        plan = ScoringPlan.compile(PersonalityItem.objects.order_by("order"))
+        return plan.score(result.raw_scores).trait_sums
+
+    def test_rescore_updates_stale_rows(self) -> None:
+        out = StringIO()
+        call_command("rescore_results", "--chunk-size", "2", stdout=out)
+
+        for result in self.results:
+            result.refresh_from_db()
+            self.assertEqual(result.trait_sum_map, self._expected(result))
+        self.assertIn("Updated 5 of 5", out.getvalue())
+
+        self.scrubbed.refresh_from_db()
+        self.assertEqual(self.scrubbed.sum_O, self.scrubbed_sum_O)
+
+    def test_dry_run_reports_without_writing(self) -> None:
+        before = {result.pk: result.trait_sum_map for result in self.results}
+        out = StringIO()
+        call_command("rescore_results", "--dry-run", stdout=out)
+
+        self.assertIn("Would update 5 of 5", out.getvalue())
+        self.assertIn("sum_O", out.getvalue())
+        for result in self.results:
+            result.refresh_from_db()
+            self.assertEqual(result.trait_sum_map, before[result.pk])
+
+    def test_start_after_resumes_from_checkpoint(self) -> None:
+        ordered = sorted(self.results, key=lambda result: result.pk)
+        call_command("rescore_results", "--start-after", str(ordered[2].pk), stdout=StringIO())
+
+        for result in ordered[:3]:
+            stale = result.trait_sum_map
+            result.refresh_from_db()
+            self.assertEqual(result.trait_sum_map, stale)
+        for result in ordered[3:]:
+            result.refresh_from_db()
+            self.assertEqual(result.trait_sum_map, self._expected(result))
+
+    def test_start_after_must_be_a_uuid(self) -> None:
+        with self.assertRaisesMessage(CommandError, "--start-after must be a result UUID."):
+            call_command("rescore_results", "--start-after", "not-a-uuid", stdout=StringIO())
@@ -0,0 +1,97 @@
+"""Tests for the result payload cache."""
+from __future__ import annotations
+
+import json
+from unittest import mock
+from uuid import uuid4
+
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from survey import result_cache
+from survey.caching import LRUCache
+from survey.catalog import get_catalog, invalidate_catalog
+from survey.models import PersonalityItem, SurveyResult
+from survey.tokens import signer
+
+
+class LRUCacheTests(SimpleTestCase):
+    def test_evicts_least_recently_used_entry(self) -> None:
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.set("c", 3)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_expired_entries_count_as_misses(self) -> None:
+        cache = LRUCache(maxsize=4, ttl=10)
+        with mock.patch("survey.caching.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+        with mock.patch("survey.caching.time.monotonic", return_value=111.0):
+            self.assertIsNone(cache.get("a"))
+        stats = cache.stats()
+        self.assertEqual(stats["expirations"], 1)
+        self.assertEqual(stats["hit_rate"], 0.0)
+
+
+class ResultDetailCacheTests(TestCase):
+    fixtures = ["items.json"]
+
+    def setUp(self) -> None:
+        invalidate_catalog()
+        result_cache.clear_result_cache()
+
+    def _get(self, pk):
+        return self.client.get(
+            reverse("survey_api:result-detail", kwargs={"pk": pk}),
+            HTTP_X_RESULT_TOKEN=signer.sign(str(pk)),
+        )
+
+    def test_created_result_is_served_without_queries(self) -> None:
+        responses = {item.code: 3 for item in PersonalityItem.objects.all()}
+        created = self.client.post(
+            reverse("survey_api:score"),
+            data=json.dumps({"responses": responses}),
+            content_type="application/json",
+        ).json()
+
+        with self.assertNumQueries(0):
+            response = self._get(created["id"])
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertNotIn("token", body)
+        self.assertEqual(body["trait_scores"], created["trait_scores"])
+
+    def test_unknown_ids_are_negatively_cached(self) -> None:
+        pk = uuid4()
+        get_catalog()
+        with self.assertNumQueries(1):
+            self.assertEqual(self._get(pk).status_code, 404)
+        with self.assertNumQueries(0):
+            self.assertEqual(self._get(pk).status_code, 404)
+        self.assertEqual(result_cache.result_cache_stats()["negative_hits"], 1)
+
+    def test_invalidate_drops_cached_payload(self) -> None:
+        result = SurveyResult.objects.create(
+            raw_scores={},
+            sum_O=30,
+            sum_C=30,
+            sum_E=30,
+            sum_A=30,
+            sum_N=30,
+            scaled_O=50,
+            scaled_C=50,
+            scaled_E=50,
+            scaled_A=50,
+            scaled_N=50,
+        )
+        self._get(result.pk)
+        SurveyResult.objects.filter(pk=result.pk).update(sum_O=50)
+        result_cache.invalidate_results([result.pk])
+
+        body = self._get(result.pk).json()
+        self.assertEqual(body["trait_scores"][0]["sum"], 50)
@@ -2,12 +2,15 @@
 from __future__ import annotations
 
 from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-from django.core.management import call_command
+from django.core.management import CommandError, call_command
 from django.test import TestCase, override_settings
 from django.utils import timezone
 
 from survey.models import SurveyResult
+from survey.result_cache import get_payload, store_payload
 
 
 def _create_result(raw_scores: dict, created_delta_days: int) -> SurveyResult:
@@ -36,7 +39,7 @@ class RetentionCommandTests(TestCase):
         scrub_candidate = _create_result({"O1": 4}, created_delta_days=6)
         delete_candidate = _create_result({"O1": 5}, created_delta_days=12)
 
-        call_command("purge_old_results")
+        call_command("purge_old_results", stdout=StringIO())
 
         self.assertTrue(SurveyResult.objects.filter(pk=recent.pk).exists())
         recent.refresh_from_db()
@@ -46,3 +49,56 @@ class RetentionCommandTests(TestCase):
         self.assertEqual(scrub_candidate.raw_scores, {})
 
         self.assertFalse(SurveyResult.objects.filter(pk=delete_candidate.pk).exists())
+
+    def test_purge_works_in_batches(self) -> None:
+        for _ in range(5):
+            _create_result({"O1": 4}, created_delta_days=6)
+        for _ in range(3):
+            _create_result({"O1": 5}, created_delta_days=12)
+
+        out = StringIO()
+        call_command("purge_old_results", batch_size=2, sleep=0, stdout=out)
+
+        output = out.getvalue()
+        self.assertIn("delete: batch=2 rows=1 total=3", output)
+        self.assertIn("scrub: batch=3 rows=1 total=5", output)
+        self.assertIn("scrubbed=5, deleted=3", output)
+        self.assertEqual(SurveyResult.objects.count(), 5)
+        self.assertFalse(SurveyResult.objects.with_answers().exists())
+
+    def test_zero_batch_size_is_rejected(self) -> None:
+        with self.assertRaisesMessage(CommandError, "--batch-size must be positive."):
+            call_command("purge_old_results", batch_size=0, stdout=StringIO())
+
+    def test_dry_run_leaves_rows_untouched(self) -> None:
+        _create_result({"O1": 4}, created_delta_days=6)
+        _create_result({"O1": 5}, created_delta_days=12)
+
+        out = StringIO()
+        call_command("purge_old_results", dry_run=True, stdout=out)
+
+        self.assertIn("Would purge survey results: scrubbed=1, deleted=1", out.getvalue())
+        self.assertEqual(SurveyResult.objects.count(), 2)
+        self.assertEqual(SurveyResult.objects.with_answers().count(), 2)
+
+    def test_max_runtime_stops_and_rerun_resumes(self) -> None:
+        for _ in range(3):
+            _create_result({"O1": 5}, created_delta_days=12)
+
+        out = StringIO()
+        with mock.patch("survey.management.commands.purge_old_results.time.monotonic", side_effect=[0, 0, 5, 5, 5]):
+            call_command("purge_old_results", batch_size=1, sleep=0, max_runtime=1, stdout=out)
+
+        self.assertIn("rerun to continue", out.getvalue())
+        self.assertEqual(SurveyResult.objects.count(), 2)
+
+        call_command("purge_old_results", batch_size=1, sleep=0, stdout=StringIO())
+        self.assertEqual(SurveyResult.objects.count(), 0)
+
+    def test_purged_results_are_evicted_from_result_cache(self) -> None:
+        expired = _create_result({"O1": 5}, created_delta_days=12)
+        store_payload(expired.pk, {"uuid": str(expired.pk)})
+
+        call_command("purge_old_results", sleep=0, stdout=StringIO())
+
+        self.assertIsNone(get_payload(expired.pk))
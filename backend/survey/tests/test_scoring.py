@@ -0,0 +1,88 @@
+"""Equivalence tests for the compiled scoring plan."""
+from __future__ import annotations
+
+import random
+
+from django.test import SimpleTestCase
+from rest_framework import serializers
+
+from survey.api.serializers import SurveyScoreRequestSerializer
+from survey.services import ScoringPlan, SurveyResponseError, compute_trait_scores
+
+from survey.tests.utils import fixture_items
+
+
+class ScoringPlanEquivalenceTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.items = fixture_items()
+        self.plan = ScoringPlan.compile(self.items)
+
+    def test_matches_compute_trait_scores_for_random_submissions(self) -> None:
+        rng = random.Random(20240501)
+        for _ in range(200):
+            responses = {item.code: rng.choice([1, 2, 3, 4, 5, "3", "5"]) for item in self.items}
+            self.assertEqual(self.plan.score(responses), compute_trait_scores(self.items, responses))
+
+    def test_reports_missing_extra_and_invalid_answers(self) -> None:
+        responses = {item.code: 3 for item in self.items}
+        del responses["O1"]
+        responses["X9"] = 3
+        responses["C2"] = 7
+        responses["C3"] = "abc"
+        with self.assertRaises(SurveyResponseError) as ctx:
+            self.plan.score(responses)
+        self.assertEqual(ctx.exception.invalid, {"C2": "max_value", "C3": "invalid"})
+        self.assertEqual(ctx.exception.missing, ["O1"])
+        self.assertEqual(ctx.exception.extra, ["X9"])
+
+
+class SerializerErrorEquivalenceTests(SimpleTestCase):
+    """The serializer must keep the messages produced by the DRF child fields."""
+
+    def setUp(self) -> None:
+        self.items = fixture_items()
+        self.reference = serializers.DictField(child=serializers.IntegerField(min_value=1, max_value=5))
+
+    def _errors(self, responses: dict) -> object:
+        serializer = SurveyScoreRequestSerializer(data={"responses": responses}, context={"items": self.items})
+        self.assertFalse(serializer.is_valid())
+        return serializer.errors["responses"]
+
+    def test_invalid_answers_use_integer_field_messages(self) -> None:
+        responses = {item.code: 3 for item in self.items}
+        responses.update({"O1": 0, "O2": 6, "O3": "x", "O4": None, "O5": True})
+        with self.assertRaises(serializers.ValidationError) as ctx:
+            self.reference.run_validation(responses)
+        self.assertEqual(self._errors(responses), ctx.exception.detail)
+
+    def test_missing_and_extra_messages(self) -> None:
+        responses = {item.code: 3 for item in self.items if item.code != "O1"}
+        self.assertEqual(self._errors(responses), ["回答が不足しています: O1"])
+
+        responses = {item.code: 3 for item in self.items}
+        responses.update({"Z2": 3, "Z1": 3})
+        self.assertEqual(self._errors(responses), ["不要な設問コードが含まれています: Z1, Z2"])
+
+    def test_valid_submission_carries_scores(self) -> None:
+        responses = {item.code: "5" for item in self.items}
+        serializer = SurveyScoreRequestSerializer(data={"responses": responses}, context={"items": self.items})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        expected = compute_trait_scores(self.items, responses)
+        self.assertEqual(serializer.validated_data["scores"], expected)
+        self.assertEqual(serializer.validated_data["responses"], expected.raw_scores)
+
+
+class ScoringPlanBatchTests(SimpleTestCase):
+    def test_score_many_matches_single_scoring(self) -> None:
+        items = fixture_items()
+        plan = ScoringPlan.compile(items)
+        rng = random.Random(7)
+        submissions = [{item.code: rng.randint(1, 5) for item in items} for _ in range(100)]
+        submissions[3] = {"O1": 9}
+
+        outcomes = plan.score_many(submissions)
+        self.assertIsInstance(outcomes[3], SurveyResponseError)
+        for responses, outcome in zip(submissions, outcomes):
+            if responses is submissions[3]:
+                continue
+            self.assertEqual(outcome, compute_trait_scores(items, responses))
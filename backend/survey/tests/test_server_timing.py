@@ -0,0 +1,60 @@
+"""Tests for the sampled Server-Timing breakdown."""
+from __future__ import annotations
+
+import json
+
+from django.test import TestCase, override_settings
+
+from config import server_timing
+from survey import result_cache
+from survey.catalog import invalidate_catalog
+from survey.models import PersonalityItem
+
+
+def _metrics(header: str) -> dict[str, str]:
+    return {part.split(";", 1)[0]: part for part in header.split(", ")}
+
+
+class ServerTimingTests(TestCase):
+    fixtures = ["items.json"]
+
+    def setUp(self) -> None:
+        invalidate_catalog()
+        result_cache.clear_result_cache()
+        codes = PersonalityItem.objects.values_list("code", flat=True)
+        self.body = json.dumps({"responses": {code: 3 for code in codes}})
+
+    def test_disabled_by_default(self) -> None:
+        response = self.client.post("/api/score/", self.body, content_type="application/json")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=1.0)
+    def test_score_request_reports_phases_and_queries(self) -> None:
+        with self.assertLogs("config.server_timing", "INFO") as logs:
+            response = self.client.post("/api/score/", self.body, content_type="application/json")
+
+        self.assertEqual(response.status_code, 201)
+        metrics = _metrics(response["Server-Timing"])
+        # The async score view renders its own bytes, so ``render`` is sync-only.
+        self.assertLessEqual({"validate", "score", "insert", "insights", "db", "total"}, set(metrics))
+
+        record = json.loads(logs.records[0].getMessage().split(" ", 1)[1])
+        self.assertEqual((record["method"], record["path"], record["status"]), ("POST", "/api/score/", 201))
+        self.assertGreater(record["db_queries"], 0)
+        self.assertIn(f'desc="{record["db_queries"]} queries"', metrics["db"])
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=1.0)
+    async def test_async_stack_counts_queries_on_the_sync_thread(self) -> None:
+        response = await self.async_client.post("/api/score/", self.body, content_type="application/json")
+
+        self.assertEqual(response.status_code, 201)
+        metrics = _metrics(response["Server-Timing"])
+        self.assertIn("insert", metrics)
+        self.assertNotIn('desc="0 queries"', metrics["db"])
+
+    def test_phase_outside_a_sampled_request_records_nothing(self) -> None:
+        with server_timing.phase("score"):
+            pass
+        self.assertIsNone(server_timing.current())
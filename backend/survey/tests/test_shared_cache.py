@@ -0,0 +1,123 @@
+"""Tests for the shared cache backend layer."""
+from __future__ import annotations
+
+import os
+import time
+from unittest import mock
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+
+from config.caching import NamespacedCache, cache_metrics, reset_cache_metrics
+from config.settings import cache_config_from_env
+from survey import result_cache
+
+
+class CacheConfigTests(SimpleTestCase):
+    def _config(self, url: str | None) -> dict:
+        env = {"CACHE_URL": url} if url is not None else {}
+        with mock.patch.dict(os.environ, env, clear=True):
+            return cache_config_from_env()
+
+    def test_defaults_to_local_memory(self) -> None:
+        config = self._config(None)
+        self.assertEqual(config["BACKEND"], "django.core.cache.backends.locmem.LocMemCache")
+        self.assertEqual(config["TIMEOUT"], 300)
+        self.assertEqual(config["KEY_PREFIX"], "bigfive")
+
+    def test_redis_url_is_passed_through(self) -> None:
+        config = self._config("rediss://:secret@cache.example.com:6380/1")
+        self.assertEqual(config["BACKEND"], "django.core.cache.backends.redis.RedisCache")
+        self.assertEqual(config["LOCATION"], "rediss://:secret@cache.example.com:6380/1")
+
+    def test_file_url_uses_path(self) -> None:
+        config = self._config("file:///var/tmp/bigfive-cache")
+        self.assertEqual(config["LOCATION"], "/var/tmp/bigfive-cache")
+
+    def test_unknown_scheme_is_rejected(self) -> None:
+        with self.assertRaises(ImproperlyConfigured):
+            self._config("memcached://localhost:11211")
+
+
+class NamespacedCacheTests(SimpleTestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        reset_cache_metrics()
+
+    def test_namespaces_do_not_collide(self) -> None:
+        first, second = NamespacedCache("first"), NamespacedCache("second")
+        first.set("key", 1)
+        second.set("key", 2)
+
+        self.assertEqual(first.get("key"), 1)
+        self.assertEqual(second.get("key"), 2)
+
+    def test_invalidate_drops_only_its_namespace(self) -> None:
+        first, second = NamespacedCache("first"), NamespacedCache("second")
+        first.set("key", 1)
+        second.set("key", 2)
+        first.invalidate()
+
+        self.assertIsNone(first.get("key"))
+        self.assertEqual(second.get("key"), 2)
+
+    def test_version_is_read_once_per_ttl(self) -> None:
+        namespace = NamespacedCache("versioned")
+        namespace.set("key", 1)
+        with mock.patch.object(cache, "get", wraps=cache.get) as get:
+            self.assertEqual(namespace.get("key"), 1)
+            self.assertEqual(namespace.get("key"), 1)
+        self.assertEqual(get.call_count, 2)
+
+    def test_invalidation_elsewhere_is_seen_after_the_ttl(self) -> None:
+        namespace = NamespacedCache("shared")
+        namespace.set("key", 1)
+        cache.incr("shared:__version__")  # another worker invalidates
+
+        self.assertEqual(namespace.get("key"), 1)
+        later = time.monotonic() + 60
+        with mock.patch("config.caching.time.monotonic", return_value=later):
+            self.assertIsNone(namespace.get("key"))
+
+    def test_metrics_count_hits_and_misses(self) -> None:
+        namespace = NamespacedCache("metrics")
+        self.assertEqual(namespace.get_or_set("key", lambda: "value"), "value")
+        self.assertEqual(namespace.get_or_set("key", lambda: "other"), "value")
+
+        stats = cache_metrics()["metrics"]
+        self.assertEqual((stats["hits"], stats["misses"], stats["sets"]), (1, 1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+
+@override_settings(SURVEY_RESULT_CACHE_SHARED=True)
+class SharedResultCacheTests(SimpleTestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        result_cache.clear_result_cache()
+
+    def test_payload_survives_local_eviction(self) -> None:
+        pk = uuid4()
+        result_cache.store_payload(pk, {"id": str(pk)}, version="v1")
+        # Simulate another worker: its local tier has never seen the payload.
+        result_cache._cache.clear()
+
+        self.assertEqual(result_cache.get_payload(pk, version="v1"), {"id": str(pk)})
+        self.assertIsNone(result_cache.get_payload(pk, version="v2"))
+
+    async def test_async_helpers_share_the_tier(self) -> None:
+        pk = uuid4()
+        await result_cache.astore_payload(pk, {"id": str(pk)}, version="v1")
+        result_cache._cache.clear()
+
+        self.assertEqual(await result_cache.aget_payload(pk, version="v1"), {"id": str(pk)})
+        self.assertEqual(result_cache.get_payload(pk, version="v1"), {"id": str(pk)})
+
+    def test_invalidate_reaches_shared_tier(self) -> None:
+        pk = uuid4()
+        result_cache.store_payload(pk, {"id": str(pk)})
+        result_cache.invalidate_results([pk])
+        result_cache._cache.clear()
+
+        self.assertIsNone(result_cache.get_payload(pk))
@@ -0,0 +1,77 @@
+"""Tests for compact, self-contained result tokens."""
+from __future__ import annotations
+
+import json
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from survey import result_cache
+from survey.catalog import get_catalog, invalidate_catalog
+from survey.models import PersonalityItem, SurveyResult
+from survey.tokens import TokenClaims, pack_result, read_token, signer, unpack_result
+
+
+@override_settings(SURVEY_RESULT_COMPACT_TOKENS=True)
+class CompactTokenTests(TestCase):
+    fixtures = ["items.json"]
+
+    def setUp(self) -> None:
+        cache.clear()
+        invalidate_catalog()
+        result_cache.clear_result_cache()
+
+    def _create(self) -> dict:
+        responses = {item.code: 1 + index % 5 for index, item in enumerate(PersonalityItem.objects.order_by("order"))}
+        return self.client.post(
+            reverse("survey_api:score"),
+            data=json.dumps({"responses": responses}),
+            content_type="application/json",
+        ).json()
+
+    def _get(self, pk, token):
+        return self.client.get(reverse("survey_api:result-detail", kwargs={"pk": pk}), HTTP_X_RESULT_TOKEN=token)
+
+    def test_round_trip_preserves_payload_fields(self) -> None:
+        result = SurveyResult.objects.create(
+            raw_scores={}, sum_O=10, sum_C=50, sum_E=33, sum_A=21, sum_N=47,
+            scaled_O=0, scaled_C=100, scaled_E=58, scaled_A=28, scaled_N=93,
+        )
+        claims = unpack_result(pack_result(result))
+
+        self.assertEqual(claims, TokenClaims(str(result.pk), result.created_at, result.trait_sum_map))
+
+    def test_detail_is_rebuilt_from_token_without_queries(self) -> None:
+        created = self._create()
+        # A worker that never rendered this result.
+        result_cache.clear_result_cache()
+        get_catalog()
+
+        with self.assertNumQueries(0):
+            response = self._get(created["id"], created["token"])
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["created_at"], created["created_at"])
+        self.assertEqual(body["trait_scores"], created["trait_scores"])
+        self.assertEqual(body["highlights"], created["highlights"])
+
+    def test_revoked_result_falls_back_to_database(self) -> None:
+        created = self._create()
+        SurveyResult.objects.filter(pk=created["id"]).delete()
+        result_cache.invalidate_results([created["id"]])
+        get_catalog()
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self._get(created["id"], created["token"]).status_code, 404)
+
+    def test_legacy_tokens_are_still_accepted(self) -> None:
+        created = self._create()
+        result_cache.clear_result_cache()
+
+        self.assertFalse(read_token(signer.sign(created["id"])).is_compact)
+        self.assertEqual(self._get(created["id"], signer.sign(created["id"])).status_code, 200)
+
+    def test_token_for_another_result_is_rejected(self) -> None:
+        first, second = self._create(), self._create()
+        self.assertEqual(self._get(second["id"], first["token"]).status_code, 403)
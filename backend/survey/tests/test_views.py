@@ -1,12 +1,25 @@
 """Regression tests for public-facing survey routes."""
 from __future__ import annotations
 
+import gzip
+import os
+import tempfile
+from pathlib import Path
+from unittest import mock
+
 from django.conf import settings
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from django.urls import reverse
 
+from analytics.models import PageView
+from survey import legal, views
+
 
 class SurveyRoutingTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
     def test_home_page_renders(self) -> None:
         response = self.client.get(reverse("survey:home"))
         self.assertEqual(response.status_code, 200)
@@ -25,8 +38,94 @@ class SurveyRoutingTests(TestCase):
         self.assertEqual(response.headers["Location"], expected)
 
 
+class HomePageCacheTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_second_hit_is_served_from_cache_and_still_logged(self) -> None:
+        first = self.client.get(reverse("survey:home"))
+        with mock.patch("survey.views.render", side_effect=AssertionError("rendered")):
+            second = self.client.get(reverse("survey:home"))
+
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(PageView.objects.filter(path="/").count(), 2)
+
+    @override_settings(ALLOWED_HOSTS=["testserver", "other.testserver"])
+    def test_cache_is_keyed_by_host_language_and_deploy(self) -> None:
+        self.client.get(reverse("survey:home"))
+        with mock.patch("survey.views.render", wraps=views.render) as rendered:
+            self.client.get(reverse("survey:home"), HTTP_HOST="other.testserver")
+            self.client.get(reverse("survey:home"), HTTP_ACCEPT_LANGUAGE="en")
+            with self.settings(DEPLOY_VERSION="next-release"):
+                self.client.get(reverse("survey:home"))
+        self.assertEqual(rendered.call_count, 3)
+
+    @override_settings(SURVEY_HOME_CACHE_SECONDS=0)
+    def test_cache_can_be_disabled(self) -> None:
+        self.client.get(reverse("survey:home"))
+        response = self.client.get(reverse("survey:home"))
+        self.assertTemplateUsed(response, "home.html")
+
+
 class LegalPageTests(TestCase):
+    def setUp(self) -> None:
+        legal.clear_legal_cache()
+
     def test_privacy_page_served(self) -> None:
         response = self.client.get(reverse("survey:legal-page", kwargs={"page": "privacy"}))
         self.assertEqual(response.status_code, 200)
         self.assertIn("プライバシーポリシー".encode("utf-8"), response.content)
+
+    def test_validators_allow_conditional_requests(self) -> None:
+        url = reverse("survey:legal-page", kwargs={"page": "terms"})
+        response = self.client.get(url)
+        self.assertIn("Last-Modified", response)
+
+        by_etag = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(by_etag.status_code, 304)
+        by_date = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+        self.assertEqual(by_date.status_code, 304)
+
+    def test_gzip_variant_served_when_accepted(self) -> None:
+        url = reverse("survey:legal-page", kwargs={"page": "privacy"})
+        plain = self.client.get(url)
+        compressed = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertEqual(compressed["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(compressed.content), plain.content)
+        self.assertIn("Accept-Encoding", compressed["Vary"])
+
+    def test_unknown_page_is_404(self) -> None:
+        response = self.client.get(reverse("survey:legal-page", kwargs={"page": "missing"}))
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(SURVEY_LEGAL_RELOAD_INTERVAL_SECONDS=60)
+class LegalDocumentCacheTests(TestCase):
+    def setUp(self) -> None:
+        legal.clear_legal_cache()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "terms.html"
+        self.path.write_text("<p>v1</p>", encoding="utf-8")
+        patcher = mock.patch.object(legal, "LEGAL_PUBLIC_DIR", Path(directory.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_repeat_requests_skip_the_filesystem(self) -> None:
+        self.assertEqual(legal.get_document("terms").variants["identity"], b"<p>v1</p>")
+        with mock.patch.object(Path, "stat", side_effect=AssertionError("stat")):
+            self.assertEqual(legal.get_document("terms").variants["identity"], b"<p>v1</p>")
+
+    def test_changed_file_is_reloaded_after_interval(self) -> None:
+        with mock.patch("survey.legal.time.monotonic", return_value=1000.0):
+            legal.get_document("terms")
+        self.path.write_text("<p>v2</p>", encoding="utf-8")
+        stat = self.path.stat()
+        os.utime(self.path, (stat.st_atime, stat.st_mtime + 10))
+
+        with mock.patch("survey.legal.time.monotonic", return_value=1030.0):
+            self.assertEqual(legal.get_document("terms").variants["identity"], b"<p>v1</p>")
+        with mock.patch("survey.legal.time.monotonic", return_value=1061.0):
+            self.assertEqual(legal.get_document("terms").variants["identity"], b"<p>v2</p>")
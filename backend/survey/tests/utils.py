@@ -0,0 +1,16 @@
+"""Shared helpers for the survey tests."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from survey.models import PersonalityItem
+
+ITEMS_FIXTURE = Path(__file__).resolve().parent.parent / "fixtures" / "items.json"
+
+
+def fixture_items() -> list[PersonalityItem]:
+    """Unsaved items from ``items.json``, for tests that do not touch the database."""
+
+    with ITEMS_FIXTURE.open(encoding="utf-8") as handle:
+        return [PersonalityItem(pk=row["pk"], **row["fields"]) for row in json.load(handle)]
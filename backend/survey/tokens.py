@@ -0,0 +1,121 @@
+"""Result access tokens.
+
+Two formats are accepted by the detail endpoint:
+
+* the original token, a ``TimestampSigner`` signature over the result UUID,
+  which authorises a database read;
+* the compact token (``SURVEY_RESULT_COMPACT_TOKENS``), which signs a 30-byte
+  blob holding the UUID, ``created_at`` and the five trait sums. Everything the
+  result payload shows can be rebuilt from it without a query.
+
+Compact tokens stop being trusted for their contents once the result is
+revoked, which ``result_cache.invalidate_results`` does for every scrub,
+delete, rescore and admin edit; the view then falls back to the database.
+Revocations live in the default cache, so the cache must be shared between
+workers and management commands (see ``CACHE_URL``) before enabling the
+compact format.
+"""
+from __future__ import annotations
+
+import base64
+import struct
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import NamedTuple
+from uuid import UUID
+
+from django.conf import settings
+from django.core.signing import BadSignature, TimestampSigner, b62_decode
+
+from config.caching import NamespacedCache
+
+from .constants import TRAIT_ORDER
+
+COMPACT_PREFIX = "c1."
+# version, UUID bytes, created_at in epoch microseconds, one byte per trait sum.
+_LAYOUT = struct.Struct(">B16sq5B")
+_FORMAT_VERSION = 1
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+signer = TimestampSigner(salt="survey.result")
+_revoked = NamespacedCache("revoked")
+
+
+class TokenClaims(NamedTuple):
+    """What a verified token says about a result."""
+
+    pk: str
+    created_at: datetime | None = None
+    trait_sums: dict[str, int] | None = None
+    issued_at: int | None = None
+
+    @property
+    def is_compact(self) -> bool:
+        return self.trait_sums is not None
+
+
+def compact_tokens_enabled() -> bool:
+    return getattr(settings, "SURVEY_RESULT_COMPACT_TOKENS", False)
+
+
+def _max_age() -> int:
+    return getattr(settings, "SURVEY_RESULT_TOKEN_MAX_AGE_SECONDS", 600)
+
+
+def pack_result(result) -> str:
+    delta = result.created_at - _EPOCH
+    micros = (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+    sums = result.trait_sum_map
+    blob = _LAYOUT.pack(_FORMAT_VERSION, UUID(str(result.pk)).bytes, micros, *(sums[trait] for trait in TRAIT_ORDER))
+    return COMPACT_PREFIX + base64.urlsafe_b64encode(blob).decode("ascii").rstrip("=")
+
+
+def unpack_result(value: str) -> TokenClaims:
+    try:
+        blob = base64.urlsafe_b64decode(value[len(COMPACT_PREFIX):] + "==")
+        version, uuid_bytes, micros, *sums = _LAYOUT.unpack(blob)
+    except (ValueError, struct.error) as exc:
+        raise BadSignature("Malformed compact token.") from exc
+    if version != _FORMAT_VERSION:
+        raise BadSignature(f"Unsupported compact token version {version}.")
+    return TokenClaims(
+        pk=str(UUID(bytes=uuid_bytes)),
+        created_at=_EPOCH + timedelta(microseconds=micros),
+        trait_sums=dict(zip(TRAIT_ORDER, sums)),
+    )
+
+
+def issue_token(result) -> str:
+    """Sign a token for ``result`` in the configured format."""
+
+    if compact_tokens_enabled():
+        return signer.sign(pack_result(result))
+    return signer.sign(str(result.pk))
+
+
+def read_token(token: str) -> TokenClaims:
+    """Verify ``token`` and return its claims.
+
+    Raises ``SignatureExpired`` or ``BadSignature`` like ``TimestampSigner``.
+    """
+
+    value = signer.unsign(token, max_age=_max_age())
+    issued_at = b62_decode(token.rsplit(signer.sep, 2)[1])
+    if value.startswith(COMPACT_PREFIX):
+        return unpack_result(value)._replace(issued_at=issued_at)
+    return TokenClaims(pk=value, issued_at=issued_at)
+
+
+def revoke(pks) -> None:
+    """Stop trusting the contents of outstanding compact tokens for ``pks``."""
+
+    for pk in pks:
+        # A token cannot outlive its max age, so neither needs the revocation.
+        _revoked.set(str(pk), True, timeout=_max_age())
+
+
+def is_revoked(pk) -> bool:
+    return bool(_revoked.get(str(pk)))
+
+
+async def ais_revoked(pk) -> bool:
+    return bool(await _revoked.aget(str(pk)))
@@ -1,27 +1,59 @@
 """View logic for the Big Five survey application."""
 from __future__ import annotations
 
-from pathlib import Path
+import time
 
 from django.conf import settings
 from django.http import Http404, HttpRequest, HttpResponse
 from django.shortcuts import redirect, render
+from django.utils.cache import patch_vary_headers
 
-LEGAL_PAGE_FILES = {
-    "privacy": "privacy.html",
-    "terms": "terms.html",
-    "disclaimer": "disclaimer.html",
-    "tokushoho": "tokushoho.html",
-}
+from config.caching import NamespacedCache
 
-LEGAL_PUBLIC_DIR = Path(settings.PROJECT_ROOT) / "frontend" / "public"
+from .http import (
+    encoded_response,
+    etag_matches,
+    last_modified_header,
+    make_etag,
+    negotiate_encoding,
+    not_modified,
+    unmodified_since,
+)
+from .legal import LEGAL_PAGE_FILES, get_document
+
+HOME_CONTENT_TYPE = "text/html; charset=utf-8"
+# Used when no DEPLOY_VERSION is configured, so a restart still starts cold.
+_BOOT_TOKEN = str(int(time.time()))
+
+home_cache = NamespacedCache("home")
+
+
+def _home_cache_key(request: HttpRequest) -> str:
+    version = getattr(settings, "DEPLOY_VERSION", "") or _BOOT_TOKEN
+    language = getattr(request, "LANGUAGE_CODE", settings.LANGUAGE_CODE)
+    return f"{version}:{request.scheme}:{request.get_host()}:{language}"
 
 
 def home(request: HttpRequest) -> HttpResponse:
-    """Render the landing page."""
+    """Render the landing page.
+
+    The page has no per-user content, so the rendered body is cached per
+    deploy, scheme, host and negotiated language. Page view logging happens in
+    middleware and therefore still sees every request.
+    """
+    timeout = getattr(settings, "SURVEY_HOME_CACHE_SECONDS", 300)
+    key = _home_cache_key(request) if timeout else None
+    if key is not None:
+        body = home_cache.get(key)
+        if body is not None:
+            return HttpResponse(body, content_type=HOME_CONTENT_TYPE)
+
     base_url = settings.SITE_BASE_URL or request.build_absolute_uri("/")
     context = {"site_base_url": base_url.rstrip("/")}
-    return render(request, "home.html", context)
+    response = render(request, "home.html", context)
+    if key is not None and response.status_code == 200:
+        home_cache.set(key, response.content, timeout)
+    return response
 
 
 def survey(request: HttpRequest) -> HttpResponse:
@@ -47,13 +79,27 @@ def spa_entry(request: HttpRequest) -> HttpResponse:
 def legal_page(request: HttpRequest, page: str) -> HttpResponse:
     """Serve the static legal documents from the shared public directory."""
 
-    filename = LEGAL_PAGE_FILES.get(page)
-    if not filename:
+    if page not in LEGAL_PAGE_FILES:
         raise Http404("Unknown legal document.")
 
-    file_path = LEGAL_PUBLIC_DIR / filename
-    if not file_path.exists():
+    document = get_document(page)
+    if document is None:
         raise Http404("Legal document is not available on this server.")
 
-    content = file_path.read_text(encoding="utf-8")
-    return HttpResponse(content, content_type="text/html; charset=utf-8")
+    encoding = negotiate_encoding(request, document.variants)
+    etag = make_etag("legal", page, document.digest, encoding)
+    last_modified = last_modified_header(document.mtime)
+    cache_control = f"public, max-age={getattr(settings, 'SURVEY_LEGAL_CACHE_MAX_AGE_SECONDS', 3600)}"
+    if etag_matches(request, etag) or unmodified_since(request, document.mtime):
+        response = not_modified(etag, cache_control)
+    else:
+        response = encoded_response(
+            document.variants,
+            encoding,
+            content_type="text/html; charset=utf-8",
+            etag=etag,
+            cache_control=cache_control,
+        )
+    response["Last-Modified"] = last_modified
+    patch_vary_headers(response, ("Accept-Encoding",))
+    return response
@@ -0,0 +1,36 @@
+import { apiBaseUrl } from './apiClient';
+
+// Must stay within ANALYTICS_BEACON_MAX_EVENTS on the backend.
+const MAX_EVENTS_PER_BEACON = 50;
+const endpoint = `${apiBaseUrl}/events/batch`;
+const queue = [];
+
+export const flushEvents = () => {
+  while (queue.length) {
+    const body = JSON.stringify({ events: queue.splice(0, MAX_EVENTS_PER_BEACON) });
+    const sent = typeof navigator !== 'undefined' && navigator.sendBeacon ? navigator.sendBeacon(endpoint, body) : false;
+    if (!sent) {
+      fetch(endpoint, { method: 'POST', body, keepalive: true, credentials: 'include' }).catch(() => {});
+    }
+  }
+};
+
+export const trackEvent = (type, data) => {
+  const event = { t: type, ts: Date.now() };
+  if (data) {
+    event.d = data;
+  }
+  queue.push(event);
+  if (queue.length >= MAX_EVENTS_PER_BEACON) {
+    flushEvents();
+  }
+};
+
+if (typeof window !== 'undefined') {
+  window.addEventListener('pagehide', flushEvents);
+  document.addEventListener('visibilitychange', () => {
+    if (document.visibilityState === 'hidden') {
+      flushEvents();
+    }
+  });
+}